@@ -0,0 +1,213 @@
+# assignees.py
+import logging
+import re
+import threading
+import unicodedata
+from typing import Dict, Iterable, List, Optional, Set, Tuple
+
+from sqlalchemy import bindparam, func, literal, select, text, union_all
+from sqlalchemy.dialects.postgresql import ARRAY
+from sqlalchemy.engine import Engine
+from sqlalchemy.orm import Session
+from sqlalchemy.types import Text
+
+from app import config, models
+
+logger = logging.getLogger(__name__)
+
+NAME_PUNCTUATION = re.compile(r"[^\w\s'-]")
+
+# Assignees created since the last refresh ("new" rows), and the nearest existing
+# assignee for each name by trigram distance ("match" rows), in one round trip.
+# The lateral ORDER BY ... LIMIT 1 is a KNN scan of the GiST index, so the cost
+# doesn't grow with the number of assignees
+TRIGRAM_MATCH_QUERY = text("""
+    SELECT 'new' AS kind, id, name, NULL::real AS score
+    FROM assignees
+    WHERE id > :since
+    UNION ALL
+    SELECT 'match' AS kind, a.id AS id, n.name AS name, similarity(lower(a.name), n.name) AS score
+    FROM unnest(:names) AS n(name)
+    CROSS JOIN LATERAL (
+        SELECT id, name FROM assignees ORDER BY lower(name) <-> n.name LIMIT 1
+    ) AS a
+    WHERE similarity(lower(a.name), n.name) >= :threshold
+""").bindparams(bindparam("names", type_=ARRAY(Text)))
+
+
+def normalize_name(name: str) -> str:
+    """Casefold, strip punctuation and collapse whitespace ("  Sam K. " -> "sam k")"""
+    name = unicodedata.normalize("NFKC", name).casefold()
+    return " ".join(NAME_PUNCTUATION.sub(" ", name).split())
+
+
+def _compatible(tokens: List[str], other: List[str]) -> bool:
+    """Same first name, and surnames that agree where both are given ("sam k" ~ "sam kim" ~ "sam")"""
+    if tokens[0] != other[0]:
+        return False
+    if len(tokens) == 1 or len(other) == 1:
+        return True
+    last, other_last = tokens[-1], other[-1]
+    return last == other_last or (len(last) == 1 and other_last.startswith(last)) or (len(other_last) == 1 and last.startswith(other_last))
+
+
+class AssigneeResolver:
+    """Maps the free-form names the LLM returns to existing assignee IDs
+
+    Names are resolved in memory first: an exact match on the normalized name,
+    then a unique match on first name plus a compatible surname or initial.
+    Whatever is left goes to the database in a single batched query, which
+    returns the assignees other workers created since the last refresh along
+    with the database's own matches (trigram similarity on Postgres, exact match
+    elsewhere). The new assignees are indexed and matched in memory first.
+    Matches are remembered as aliases, and assignees this process creates are
+    added as they are created.
+    """
+
+    def __init__(self, threshold: float = None):
+        self.threshold = threshold if threshold is not None else config.ASSIGNEE_MATCH_THRESHOLD
+        self._lock = threading.Lock()
+        self._ids: Dict[str, int] = {}
+        self._tokens: Dict[int, List[str]] = {}
+        self._by_first: Dict[str, Set[int]] = {}
+        # Highest assignee ID loaded by refresh; assignees remembered in between don't move it,
+        # so rows other workers inserted below their IDs are still loaded
+        self._refreshed_id = 0
+        self.counters = {"memory_hits": 0, "fuzzy_hits": 0, "misses": 0, "queries": 0}
+
+    def refresh(self, db: Session) -> int:
+        """Load assignees created since the last refresh; returns how many were added"""
+        with self._lock:
+            since = self._refreshed_id
+        rows = db.execute(
+            select(models.Assignee.id, models.Assignee.name).where(models.Assignee.id > since)
+        ).all()
+        with self._lock:
+            self._load(rows)
+        return len(rows)
+
+    def remember(self, rows: Iterable[Tuple[int, str]]) -> None:
+        """Add (id, name) pairs to the index"""
+        with self._lock:
+            for assignee_id, name in rows:
+                self._add(normalize_name(name), assignee_id, canonical=True)
+
+    def resolve(self, db: Session, names: Iterable[str]) -> Dict[str, int]:
+        """Existing assignee IDs for as many names as can be matched, keyed by the original name"""
+        resolved: Dict[str, int] = {}
+        unresolved: Dict[str, List[str]] = {}
+        with self._lock:
+            for name in dict.fromkeys(names):
+                key = normalize_name(name)
+                if not key:
+                    continue
+                assignee_id = self._match(key)
+                if assignee_id is not None:
+                    resolved[name] = assignee_id
+                    self.counters["memory_hits"] += 1
+                else:
+                    unresolved.setdefault(key, []).append(name)
+
+        if not unresolved:
+            return resolved
+
+        with self._lock:
+            since = self._refreshed_id
+        new_rows, matches = self._query(db, list(unresolved), since)
+        with self._lock:
+            self.counters["queries"] += 1
+            if new_rows:
+                # Other workers may have created some of these people since the last refresh
+                self._load(new_rows)
+                for key in list(unresolved):
+                    assignee_id = self._match(key)
+                    if assignee_id is not None:
+                        names = unresolved.pop(key)
+                        for name in names:
+                            resolved[name] = assignee_id
+                        self.counters["memory_hits"] += len(names)
+                        matches.pop(key, None)
+            for key, assignee_id in matches.items():
+                self._add(key, assignee_id)
+                for name in unresolved[key]:
+                    resolved[name] = assignee_id
+            self.counters["fuzzy_hits"] += sum(len(unresolved[key]) for key in matches)
+            self.counters["misses"] += sum(len(names) for key, names in unresolved.items() if key not in matches)
+        return resolved
+
+    def stats(self) -> Dict[str, int]:
+        with self._lock:
+            return {**self.counters, "names": len(self._ids), "assignees": len(self._tokens)}
+
+    def _query(self, db: Session, keys: List[str], since: int) -> Tuple[List[Tuple[int, str]], Dict[str, int]]:
+        """Assignees created after ID `since`, and the database's matches for `keys`, in one statement"""
+        if db.bind.dialect.name == "postgresql":
+            rows = db.execute(TRIGRAM_MATCH_QUERY, {"since": since, "names": keys, "threshold": self.threshold}).all()
+            for row in rows:
+                if row.kind == "match":
+                    logger.debug("Matched assignee %r to %s (similarity %.2f)", row.name, row.id, row.score)
+        else:
+            rows = db.execute(union_all(
+                select(literal("new").label("kind"), models.Assignee.id, models.Assignee.name)
+                .where(models.Assignee.id > since),
+                select(literal("match").label("kind"), models.Assignee.id, func.lower(models.Assignee.name))
+                .where(func.lower(models.Assignee.name).in_(keys)),
+            )).all()
+        new_rows = [(row.id, row.name) for row in rows if row.kind == "new"]
+        matches = {row.name: row.id for row in rows if row.kind == "match"}
+        return new_rows, matches
+
+    def _match(self, key: str) -> Optional[int]:
+        if key in self._ids:
+            return self._ids[key]
+        tokens = key.split()
+        candidates = {
+            assignee_id
+            for assignee_id in self._by_first.get(tokens[0], ())
+            if _compatible(tokens, self._tokens[assignee_id])
+        }
+        # Only a single compatible person counts; "sam" is ambiguous once there are two Sams
+        if len(candidates) == 1:
+            assignee_id = candidates.pop()
+            self._ids[key] = assignee_id
+            return assignee_id
+        return None
+
+    def _load(self, rows: List[Tuple[int, str]]) -> None:
+        """Index assignee rows read from the database and advance the refresh watermark"""
+        for assignee_id, name in rows:
+            self._add(normalize_name(name), assignee_id, canonical=True)
+        if rows:
+            self._refreshed_id = max(self._refreshed_id, max(assignee_id for assignee_id, _ in rows))
+
+    def _add(self, key: str, assignee_id: int, canonical: bool = False) -> None:
+        if not key:
+            return
+        self._ids.setdefault(key, assignee_id)
+        if canonical or assignee_id not in self._tokens:
+            tokens = key.split()
+            self._tokens[assignee_id] = tokens
+            self._by_first.setdefault(tokens[0], set()).add(assignee_id)
+
+
+# Shared by every extraction this process persists
+assignee_resolver = AssigneeResolver()
+
+
+def refresh_assignees_sync() -> int:
+    """Warm the shared resolver with its own session (blocking; call through asyncio.to_thread)"""
+    from app.database import SessionLocal
+
+    with SessionLocal() as db:
+        return assignee_resolver.refresh(db)
+
+
+def ensure_trigram_index(engine: Engine) -> None:
+    """Enable pg_trgm and build the GiST index the fuzzy match query scans"""
+    with engine.connect().execution_options(isolation_level="AUTOCOMMIT") as conn:
+        conn.execute(text("CREATE EXTENSION IF NOT EXISTS pg_trgm"))
+        conn.execute(text(
+            "CREATE INDEX CONCURRENTLY IF NOT EXISTS ix_assignees_name_trgm "
+            "ON assignees USING gist (lower(name) gist_trgm_ops)"
+        ))
+    logger.info("Assignee trigram index is up to date.")
@@ -0,0 +1,181 @@
+# cache.py
+import asyncio
+import hashlib
+import logging
+import re
+import time
+import unicodedata
+from collections import OrderedDict
+from datetime import datetime, timedelta
+from typing import Any, Dict, Optional
+
+import pytz
+from fastapi import Request
+
+from app import config
+from app.routing import policy_key
+
+logger = logging.getLogger(__name__)
+
+
+def normalize_transcript(transcript: str) -> str:
+    """Normalize a transcript so trivially different submissions share a cache key"""
+    transcript = unicodedata.normalize("NFC", transcript).replace("\r\n", "\n").replace("\r", "\n")
+    lines = (re.sub(r"[ \t]+", " ", line).strip() for line in transcript.split("\n"))
+    return "\n".join(line for line in lines if line)
+
+
+def cache_key(transcript: str, model: str = None, prompt_version: str = None) -> str:
+    """Content-addressed key for an extraction: normalized transcript, model routing and prompt version"""
+    model = model or policy_key()
+    prompt_version = prompt_version or config.PROMPT_VERSION
+    digest = hashlib.sha256()
+    for part in (model, prompt_version, normalize_transcript(transcript)):
+        digest.update(part.encode("utf-8"))
+        digest.update(b"\0")
+    return digest.hexdigest()
+
+
+class ExtractionCache:
+    """Two-tier cache of extraction results: in-memory LRU/TTL, optionally backed by Postgres"""
+
+    def __init__(self, max_entries: int = None, ttl: float = None, persist: bool = None):
+        self.max_entries = max_entries if max_entries is not None else config.EXTRACTION_CACHE_MAX_ENTRIES
+        self.ttl = ttl if ttl is not None else config.EXTRACTION_CACHE_TTL
+        self.persist = persist if persist is not None else config.EXTRACTION_CACHE_PERSIST
+        self._entries: "OrderedDict[str, tuple]" = OrderedDict()
+        self.counters = {"hits": 0, "persistent_hits": 0, "misses": 0, "evictions": 0, "expirations": 0, "invalidations": 0}
+
+    async def get(self, key: str) -> Optional[Dict[str, Any]]:
+        """Return the cached payload for a key, or None on a miss"""
+        entry = self._entries.get(key)
+        if entry is not None:
+            expires_at, payload = entry
+            if expires_at > time.monotonic():
+                self._entries.move_to_end(key)
+                self.counters["hits"] += 1
+                return payload
+            del self._entries[key]
+            self.counters["expirations"] += 1
+
+        if self.persist:
+            try:
+                payload = await asyncio.to_thread(_load_entry, key)
+            except Exception as e:
+                logger.warning("Error reading persistent extraction cache: %s", e)
+                payload = None
+            if payload is not None:
+                self.counters["persistent_hits"] += 1
+                self._store(key, payload)
+                return payload
+
+        self.counters["misses"] += 1
+        return None
+
+    async def set(self, key: str, payload: Dict[str, Any]) -> None:
+        """Store a payload in memory and, if enabled, in the persistent tier"""
+        self._store(key, payload)
+        if self.persist:
+            try:
+                await asyncio.to_thread(_save_entry, key, payload, self.ttl)
+            except Exception as e:
+                logger.warning("Error writing persistent extraction cache: %s", e)
+
+    async def invalidate(self, key: str) -> bool:
+        """Remove a key from both tiers; returns True if it was cached anywhere"""
+        removed = self._entries.pop(key, None) is not None
+        if self.persist:
+            try:
+                removed = await asyncio.to_thread(_delete_entries, key) or removed
+            except Exception as e:
+                logger.warning("Error invalidating persistent extraction cache: %s", e)
+        if removed:
+            self.counters["invalidations"] += 1
+        return removed
+
+    async def clear(self) -> int:
+        """Remove every entry from both tiers and return how many were removed"""
+        removed = len(self._entries)
+        self._entries.clear()
+        if self.persist:
+            try:
+                removed = max(removed, await asyncio.to_thread(_delete_entries, None))
+            except Exception as e:
+                logger.warning("Error clearing persistent extraction cache: %s", e)
+        self.counters["invalidations"] += removed
+        return removed
+
+    def stats(self) -> Dict[str, Any]:
+        """Counters and sizes for monitoring"""
+        return {
+            **self.counters,
+            "entries": len(self._entries),
+            "max_entries": self.max_entries,
+            "ttl": self.ttl,
+            "persist": self.persist,
+        }
+
+    def _store(self, key: str, payload: Dict[str, Any]) -> None:
+        self._entries[key] = (time.monotonic() + self.ttl, payload)
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+            self.counters["evictions"] += 1
+
+
+# Persistent tier (blocking; always called through asyncio.to_thread)
+def _load_entry(key: str) -> Optional[Dict[str, Any]]:
+    from app.database import SessionLocal
+    from app.models import ExtractionCacheEntry
+
+    with SessionLocal() as db:
+        entry = db.get(ExtractionCacheEntry, key)
+        if entry is None:
+            return None
+        if entry.expires_at is not None and entry.expires_at <= datetime.now(pytz.utc):
+            db.delete(entry)
+            db.commit()
+            return None
+        return entry.payload
+
+
+def _save_entry(key: str, payload: Dict[str, Any], ttl: float) -> None:
+    from sqlalchemy.dialects.postgresql import insert
+    from app.database import SessionLocal
+    from app.models import ExtractionCacheEntry
+
+    values = {
+        "key": key,
+        # The routing policy the key was built from, i.e. what produced the entry
+        "model": policy_key()[:100],
+        "prompt_version": config.PROMPT_VERSION,
+        "payload": payload,
+        "created_at": datetime.now(pytz.utc),
+        "expires_at": datetime.now(pytz.utc) + timedelta(seconds=ttl),
+    }
+    statement = insert(ExtractionCacheEntry).values(**values)
+    statement = statement.on_conflict_do_update(
+        index_elements=[ExtractionCacheEntry.key],
+        set_={"payload": statement.excluded.payload, "expires_at": statement.excluded.expires_at},
+    )
+    with SessionLocal() as db:
+        db.execute(statement)
+        db.commit()
+
+
+def _delete_entries(key: Optional[str]) -> int:
+    from app.database import SessionLocal
+    from app.models import ExtractionCacheEntry
+
+    with SessionLocal() as db:
+        query = db.query(ExtractionCacheEntry)
+        if key is not None:
+            query = query.filter(ExtractionCacheEntry.key == key)
+        removed = query.delete(synchronize_session=False)
+        db.commit()
+        return removed
+
+
+# Dependency to get the shared extraction cache
+def get_extraction_cache(request: Request) -> Optional[ExtractionCache]:
+    return getattr(request.app.state, "extraction_cache", None)
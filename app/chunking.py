@@ -0,0 +1,149 @@
+# chunking.py
+import re
+from typing import Dict, List, Sequence, Tuple
+
+from app import config
+
+# A line starting a new speaker turn, e.g. "Sam: ...", "[00:01:02] Sam Kim: ..." or "@S1: ..."
+SPEAKER_PATTERN = re.compile(r"^\s*(?:\[[^\]]*\]\s*)?(?:@S\d+|[A-Za-z][\w .'\-]{0,40}):\s")
+
+PRIORITY_RANK = {"High": 0, "Medium": 1, "Low": 2}
+
+
+def estimate_tokens(text: str) -> int:
+    """Cheap token estimate (roughly four characters per token for English text)"""
+    return (len(text) + 3) // 4
+
+
+def split_turns(transcript: str) -> List[str]:
+    """Split a transcript into speaker turns, falling back to paragraphs"""
+    turns: List[str] = []
+    current: List[str] = []
+    for line in transcript.splitlines():
+        if not line.strip() or SPEAKER_PATTERN.match(line):
+            if current:
+                turns.append("\n".join(current))
+                current = []
+            if not line.strip():
+                continue
+        current.append(line)
+    if current:
+        turns.append("\n".join(current))
+    return turns
+
+
+def _split_long_turn(turn: str, max_tokens: int) -> List[str]:
+    """Split a single turn that exceeds the budget on sentence, then word boundaries"""
+    pieces: List[str] = []
+    current = ""
+    for sentence in re.split(r"(?<=[.!?])\s+", turn):
+        words = [sentence]
+        if estimate_tokens(sentence) > max_tokens:
+            words = sentence.split(" ")
+        for word in words:
+            candidate = f"{current} {word}" if current else word
+            if current and estimate_tokens(candidate) > max_tokens:
+                pieces.append(current)
+                current = word
+            else:
+                current = candidate
+    if current:
+        pieces.append(current)
+    return pieces
+
+
+def chunk_transcript(transcript: str, max_tokens: int = None, overlap_tokens: int = None) -> List[str]:
+    """Pack speaker turns into chunks within a token budget, overlapping consecutive chunks"""
+    max_tokens = max_tokens or config.CHUNK_MAX_TOKENS
+    overlap_tokens = config.CHUNK_OVERLAP_TOKENS if overlap_tokens is None else overlap_tokens
+
+    turns: List[str] = []
+    for turn in split_turns(transcript):
+        turns.extend(_split_long_turn(turn, max_tokens) if estimate_tokens(turn) > max_tokens else [turn])
+
+    chunks: List[str] = []
+    current: List[str] = []
+    current_tokens = 0
+    for turn in turns:
+        turn_tokens = estimate_tokens(turn) + 1
+        if current and current_tokens + turn_tokens > max_tokens:
+            chunks.append("\n".join(current))
+            # Carry the trailing turns into the next chunk as overlap
+            overlap: List[str] = []
+            overlap_size = 0
+            for previous in reversed(current):
+                size = estimate_tokens(previous) + 1
+                if overlap_size + size > overlap_tokens or overlap_size + size + turn_tokens > max_tokens:
+                    break
+                overlap.insert(0, previous)
+                overlap_size += size
+            current, current_tokens = overlap, overlap_size
+        current.append(turn)
+        current_tokens += turn_tokens
+    if current:
+        chunks.append("\n".join(current))
+    return chunks
+
+
+def goal_key(name: str) -> str:
+    """Normalized goal name used to detect the same goal extracted from overlapping chunks"""
+    return " ".join(re.sub(r"[^\w\s]", " ", name.lower()).split())
+
+
+def combine_goals(existing, goal):
+    """Fold a second extraction of the same goal into the first (longest description, highest priority)"""
+    existing_subtasks = {goal_key(subtask.name) for subtask in existing.subtasks or []}
+    return existing.model_copy(update={
+        "description": max(existing.description, goal.description, key=len),
+        "priority": min(existing.priority, goal.priority, key=lambda p: PRIORITY_RANK.get(getattr(p, "value", p), 1)),
+        "assignees": existing.assignees + [a for a in goal.assignees if a not in existing.assignees],
+        "subtasks": (existing.subtasks or []) + [
+            subtask for subtask in goal.subtasks or [] if goal_key(subtask.name) not in existing_subtasks
+        ],
+    })
+
+
+def merge_goals(chunk_goals: Sequence[Sequence]) -> List:
+    """Merge and deduplicate goals extracted per chunk
+
+    Goals are renumbered 1..n in order of first appearance; each chunk's local
+    `dependencies` are remapped to the merged IDs and subtasks are renumbered
+    per goal.
+    """
+    merged: List = []
+    merged_by_key: Dict[str, int] = {}
+    id_map: Dict[Tuple[int, int], int] = {}
+    local_dependencies: List[Tuple[int, int, List[int]]] = []
+
+    for chunk_index, goals in enumerate(chunk_goals):
+        for goal in goals:
+            key = goal_key(goal.name)
+            if key in merged_by_key:
+                index = merged_by_key[key]
+                merged[index] = combine_goals(merged[index], goal)
+            else:
+                index = len(merged)
+                merged_by_key[key] = index
+                merged.append(goal)
+            id_map[(chunk_index, goal.id)] = index + 1
+            local_dependencies.append((index, chunk_index, list(goal.dependencies or [])))
+
+    # Remap each chunk's local dependency IDs to the merged IDs
+    dependencies: Dict[int, List[int]] = {index: [] for index in range(len(merged))}
+    for index, chunk_index, local_ids in local_dependencies:
+        for local_id in local_ids:
+            merged_id = id_map.get((chunk_index, local_id))
+            if merged_id is not None and merged_id != index + 1 and merged_id not in dependencies[index]:
+                dependencies[index].append(merged_id)
+
+    return [
+        goal.model_copy(update={
+            "id": index + 1,
+            "dependencies": dependencies[index],
+            "subtasks": [
+                subtask.model_copy(update={"id": subtask_index + 1})
+                for subtask_index, subtask in enumerate(goal.subtasks or [])
+            ],
+        })
+        for index, goal in enumerate(merged)
+    ]
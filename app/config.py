@@ -0,0 +1,171 @@
+# config.py
+import json
+import os
+from dotenv import load_dotenv
+
+# Load environment variables
+load_dotenv()
+
+# Extraction pipeline mode used by /process:
+#   sequential  - extract meeting info, then goals (two round trips back to back)
+#   concurrent  - assign the meeting ID up front and run both extractions at once
+#   single_pass - extract meeting info and goals in one structured call
+PIPELINE_MODES = ("sequential", "concurrent", "single_pass")
+PIPELINE_MODE = os.getenv("PIPELINE_MODE", "concurrent")
+
+# OpenAI client settings (one pooled client is shared by the whole process)
+OPENAI_API_KEY = os.getenv("OPENAI_API_KEY")
+OPENAI_BASE_URL = os.getenv("OPENAI_BASE_URL")  # point at a local fake server in tests
+OPENAI_MAX_CONNECTIONS = int(os.getenv("OPENAI_MAX_CONNECTIONS", "100"))
+OPENAI_MAX_KEEPALIVE_CONNECTIONS = int(os.getenv("OPENAI_MAX_KEEPALIVE_CONNECTIONS", "20"))
+OPENAI_KEEPALIVE_EXPIRY = float(os.getenv("OPENAI_KEEPALIVE_EXPIRY", "30"))
+OPENAI_CONNECT_TIMEOUT = float(os.getenv("OPENAI_CONNECT_TIMEOUT", "10"))
+OPENAI_TIMEOUT = float(os.getenv("OPENAI_TIMEOUT", "120"))
+
+# Model and prompt version used for extraction; bump PROMPT_VERSION whenever the
+# prompts change so cached extractions from the old prompts are not reused
+EXTRACTION_MODEL = os.getenv("EXTRACTION_MODEL", "gpt-4o")
+PROMPT_VERSION = "4"
+
+# Model routing: meeting title/summary extraction goes to the cheaper MEETING_MODEL;
+# goal extraction uses ROUTING_SMALL_MODEL for transcripts of at most ROUTING_SHORT_TOKENS
+# (after preprocessing) with at most ROUTING_MAX_SPEAKERS speakers, EXTRACTION_MODEL
+# for the rest, and ROUTING_LONG_MODEL past ROUTING_LONG_TOKENS. With routing disabled
+# every call uses EXTRACTION_MODEL
+ROUTING_ENABLED = os.getenv("ROUTING_ENABLED", "true").lower() == "true"
+MEETING_MODEL = os.getenv("MEETING_MODEL", "gpt-4o-mini")
+ROUTING_SMALL_MODEL = os.getenv("ROUTING_SMALL_MODEL", "gpt-4o-mini")
+ROUTING_LONG_MODEL = os.getenv("ROUTING_LONG_MODEL", EXTRACTION_MODEL)
+ROUTING_SHORT_TOKENS = int(os.getenv("ROUTING_SHORT_TOKENS", "1500"))
+ROUTING_LONG_TOKENS = int(os.getenv("ROUTING_LONG_TOKENS", "12000"))
+ROUTING_MAX_SPEAKERS = int(os.getenv("ROUTING_MAX_SPEAKERS", "4"))
+
+# Extraction cache: a bounded in-memory LRU/TTL tier, plus an optional
+# persistent tier in Postgres shared across workers and restarts
+EXTRACTION_CACHE_ENABLED = os.getenv("EXTRACTION_CACHE_ENABLED", "true").lower() == "true"
+EXTRACTION_CACHE_MAX_ENTRIES = int(os.getenv("EXTRACTION_CACHE_MAX_ENTRIES", "256"))
+EXTRACTION_CACHE_TTL = float(os.getenv("EXTRACTION_CACHE_TTL", "86400"))
+EXTRACTION_CACHE_PERSIST = os.getenv("EXTRACTION_CACHE_PERSIST", "false").lower() == "true"
+
+# Map-reduce extraction for long transcripts: transcripts over CHUNK_MAX_TOKENS are
+# split on speaker turns into overlapping chunks extracted in parallel
+CHUNK_MAX_TOKENS = int(os.getenv("CHUNK_MAX_TOKENS", "6000"))
+CHUNK_OVERLAP_TOKENS = int(os.getenv("CHUNK_OVERLAP_TOKENS", "200"))
+CHUNK_CONCURRENCY = int(os.getenv("CHUNK_CONCURRENCY", "4"))
+
+# Transcript preprocessing before extraction: drops caption timing and filler words,
+# dedupes repeated lines and aliases long speaker names (@S1, @S2, ...) with a legend.
+# PREPROCESS_TIMESTAMPS is "strip" (drop them) or "compact" (keep an [m:ss] marker).
+# Tokens are counted with tiktoken; set TIKTOKEN_CACHE_DIR to a pre-downloaded
+# encoding on hosts without network access, or counts fall back to the estimate
+PREPROCESS_ENABLED = os.getenv("PREPROCESS_ENABLED", "true").lower() == "true"
+PREPROCESS_TIMESTAMPS = os.getenv("PREPROCESS_TIMESTAMPS", "strip")
+
+# Live meetings (/process/live WebSocket): the pending transcript is extracted once it
+# reaches LIVE_WINDOW_TOKENS or LIVE_INTERVAL seconds after the last extraction, with
+# LIVE_OVERLAP_TOKENS of the previous window and the last LIVE_CONTEXT_GOALS goals as context
+LIVE_WINDOW_TOKENS = int(os.getenv("LIVE_WINDOW_TOKENS", "800"))
+LIVE_INTERVAL = float(os.getenv("LIVE_INTERVAL", "30"))
+LIVE_OVERLAP_TOKENS = int(os.getenv("LIVE_OVERLAP_TOKENS", "150"))
+LIVE_CONTEXT_GOALS = int(os.getenv("LIVE_CONTEXT_GOALS", "20"))
+# After a failed extraction the window is retried no sooner than LIVE_RETRY_DELAY seconds
+# later, doubling up to LIVE_INTERVAL. Once failures let the pending transcript grow past
+# LIVE_MAX_PENDING_TOKENS, the failed window is dropped and reported as lost
+LIVE_RETRY_DELAY = float(os.getenv("LIVE_RETRY_DELAY", "2"))
+LIVE_MAX_PENDING_TOKENS = int(os.getenv("LIVE_MAX_PENDING_TOKENS", "4000"))
+# When the meeting ends, a failed final window is retried LIVE_FINAL_RETRIES times,
+# LIVE_FINAL_RETRY_DELAY seconds apart and doubling, before the summary reports it as lost
+LIVE_FINAL_RETRIES = int(os.getenv("LIVE_FINAL_RETRIES", "2"))
+LIVE_FINAL_RETRY_DELAY = float(os.getenv("LIVE_FINAL_RETRY_DELAY", "1"))
+
+# Startup: with FAST_STARTUP the app serves requests (/healthz first) while the LLM
+# client, tokenizer and assignee index load in the background; requests that need
+# the LLM wait for it. WARMUP_ENABLED also opens an OpenAI connection and
+# WARMUP_DB_CONNECTIONS connections per database engine, and compiles the templates,
+# so the first real request doesn't pay for them. /readyz turns 200 once all of it is done
+FAST_STARTUP = os.getenv("FAST_STARTUP", "false").lower() == "true"
+WARMUP_ENABLED = os.getenv("WARMUP_ENABLED", "false").lower() == "true"
+WARMUP_DB_CONNECTIONS = int(os.getenv("WARMUP_DB_CONNECTIONS", "2"))
+
+# Background job queue for /jobs: bounded worker pool and queue depth (429 when full).
+# With JOBS_PERSIST, a worker claims each job with a lease of JOB_LEASE_SECONDS that it
+# renews while the job runs; jobs whose lease expired (their worker died) are queued again
+JOB_WORKERS = int(os.getenv("JOB_WORKERS", "4"))
+JOB_QUEUE_MAX_DEPTH = int(os.getenv("JOB_QUEUE_MAX_DEPTH", "100"))
+JOB_RETENTION = int(os.getenv("JOB_RETENTION", "1000"))  # finished jobs kept in memory
+JOBS_PERSIST = os.getenv("JOBS_PERSIST", "false").lower() == "true"
+JOB_LEASE_SECONDS = float(os.getenv("JOB_LEASE_SECONDS", "60"))
+
+# LLM scheduler: token-bucket admission control against the OpenAI quota. Budgets
+# start from these limits and follow the x-ratelimit-* response headers afterwards
+SCHEDULER_ENABLED = os.getenv("SCHEDULER_ENABLED", "true").lower() == "true"
+OPENAI_RPM_LIMIT = int(os.getenv("OPENAI_RPM_LIMIT", "500"))
+OPENAI_TPM_LIMIT = int(os.getenv("OPENAI_TPM_LIMIT", "30000"))
+SCHEDULER_MAX_WAIT = float(os.getenv("SCHEDULER_MAX_WAIT", "30"))
+SCHEDULER_MAX_QUEUE = int(os.getenv("SCHEDULER_MAX_QUEUE", "100"))
+SCHEDULER_COMPLETION_TOKENS = int(os.getenv("SCHEDULER_COMPLETION_TOKENS", "1000"))
+
+# LLM call resilience: each request gets LLM_ATTEMPT_TIMEOUT seconds (streamed ones, until
+# their first item) and each call LLM_DEADLINE seconds in all. Timeouts, connection
+# errors, 429s and 5xx are retried up to LLM_MAX_RETRIES times after a random delay of up to
+# LLM_RETRY_BASE_DELAY * 2^retry (capped at LLM_RETRY_MAX_DELAY). With LLM_HEDGE_ENABLED, a
+# request still running after the p95 of the last LLM_LATENCY_WINDOW calls of its kind (at
+# least LLM_HEDGE_MIN_DELAY, once LLM_HEDGE_MIN_SAMPLES are known) is sent again and the first
+# answer wins. After LLM_BREAKER_FAILURES consecutive upstream failures a model's circuit opens:
+# its calls fail fast with a 503 for LLM_BREAKER_RESET seconds, then one probe call decides
+RESILIENCE_ENABLED = os.getenv("RESILIENCE_ENABLED", "true").lower() == "true"
+LLM_ATTEMPT_TIMEOUT = float(os.getenv("LLM_ATTEMPT_TIMEOUT", "90"))
+LLM_DEADLINE = float(os.getenv("LLM_DEADLINE", "180"))
+LLM_MAX_RETRIES = int(os.getenv("LLM_MAX_RETRIES", "2"))
+LLM_RETRY_BASE_DELAY = float(os.getenv("LLM_RETRY_BASE_DELAY", "0.5"))
+LLM_RETRY_MAX_DELAY = float(os.getenv("LLM_RETRY_MAX_DELAY", "8"))
+LLM_HEDGE_ENABLED = os.getenv("LLM_HEDGE_ENABLED", "false").lower() == "true"
+LLM_HEDGE_MIN_DELAY = float(os.getenv("LLM_HEDGE_MIN_DELAY", "1"))
+LLM_HEDGE_MIN_SAMPLES = int(os.getenv("LLM_HEDGE_MIN_SAMPLES", "20"))
+LLM_LATENCY_WINDOW = int(os.getenv("LLM_LATENCY_WINDOW", "200"))
+LLM_BREAKER_FAILURES = int(os.getenv("LLM_BREAKER_FAILURES", "5"))
+LLM_BREAKER_RESET = float(os.getenv("LLM_BREAKER_RESET", "30"))
+
+# Store every extraction in the meetings/goals tables (one bulk transaction per meeting)
+PERSIST_RESULTS = os.getenv("PERSIST_RESULTS", "false").lower() == "true"
+
+# Dependency graph index: per-process cache of each meeting's goal graph, rebuilt
+# after the TTL so edges written by other workers are picked up
+GRAPH_CACHE_TTL = float(os.getenv("GRAPH_CACHE_TTL", "30"))
+GRAPH_CACHE_MAX_MEETINGS = int(os.getenv("GRAPH_CACHE_MAX_MEETINGS", "256"))
+
+# Full-text search: text search configuration baked into the generated search_vector
+# columns (run `python -m app.search reindex --rebuild` after changing it) and the
+# number of index matches ranked per type before the top results are returned
+SEARCH_LANGUAGE = os.getenv("SEARCH_LANGUAGE", "english")
+SEARCH_MAX_CANDIDATES = int(os.getenv("SEARCH_MAX_CANDIDATES", "1000"))
+
+# Assignee resolution: minimum pg_trgm similarity for matching a new name to an existing assignee
+ASSIGNEE_MATCH_THRESHOLD = float(os.getenv("ASSIGNEE_MATCH_THRESHOLD", "0.6"))
+
+# Metrics: per-request stage timings in a Server-Timing response header, and USD
+# prices per million (prompt, completion, cached prompt) tokens for the llm_cost_usd_total
+# counter (override with LLM_PRICES as JSON, e.g. {"gpt-4o": [2.5, 10, 1.25]}; without a
+# cached price, cached tokens are charged as prompt tokens)
+SERVER_TIMING_ENABLED = os.getenv("SERVER_TIMING_ENABLED", "false").lower() == "true"
+LLM_PRICES = {
+    "gpt-4o": (2.50, 10.00, 1.25),
+    "gpt-4o-mini": (0.15, 0.60, 0.075),
+    **{model: tuple(price) for model, price in json.loads(os.getenv("LLM_PRICES", "{}")).items()},
+}
+
+# Logging: level, "json" or "text" lines, the bounded queue between callers and the
+# writer thread (records are dropped when it's full), and sampling of DEBUG payload
+# logs (fraction of requests whose extraction payloads are logged, truncated to the
+# given number of characters)
+LOG_LEVEL = os.getenv("LOG_LEVEL", "INFO")
+LOG_FORMAT = os.getenv("LOG_FORMAT", "json")
+LOG_QUEUE_SIZE = int(os.getenv("LOG_QUEUE_SIZE", "10000"))
+LOG_PAYLOAD_SAMPLE_RATE = float(os.getenv("LOG_PAYLOAD_SAMPLE_RATE", "0.01"))
+LOG_PAYLOAD_MAX_CHARS = int(os.getenv("LOG_PAYLOAD_MAX_CHARS", "2000"))
+
+# Transcript uploads (/process/upload): request bodies over UPLOAD_MAX_BYTES are refused
+# while they stream in (uploads spool to a temp file on disk past 1 MB), and parsed
+# transcripts are capped at UPLOAD_MAX_CHARACTERS
+UPLOAD_MAX_BYTES = int(os.getenv("UPLOAD_MAX_BYTES", str(25 * 1024 * 1024)))
+UPLOAD_MAX_CHARACTERS = int(os.getenv("UPLOAD_MAX_CHARACTERS", "2000000"))
@@ -0,0 +1,123 @@
+# crud.py
+from datetime import datetime
+from typing import List, Optional, Tuple
+
+from sqlalchemy import Select, select
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import configure_mappers, raiseload, selectinload, subqueryload
+
+from app import models
+from app.pagination import keyset_page, page_items
+
+# Goal.dependencies is a backref, which only exists once the mappers are configured
+configure_mappers()
+
+
+# Read paths load the whole object graph up front with one eager query per
+# relationship, so the number of queries stays constant however many goals there are.
+# Collections under a meeting's goals use subqueryload, which joins against the parent
+# query instead of listing parent IDs (selectinload splits those into batches of 500).
+# raiseload("*") turns any relationship that slipped through into an error instead of
+# a silent lazy load per row.
+def _goal_details(path, loader: str = "selectinload"):
+    return (
+        getattr(path, loader)(models.Goal.subtasks),
+        getattr(path, loader)(models.Goal.assignees),
+    )
+
+
+def meeting_with_goals_query(meeting_id: int) -> Select:
+    """Meeting with its goals, their subtasks and assignees (4 queries)"""
+    goals = subqueryload(models.Meeting.goals)
+    return (
+        select(models.Meeting)
+        .where(models.Meeting.id == meeting_id)
+        .options(goals, *_goal_details(goals, "subqueryload"), raiseload("*"))
+    )
+
+
+def goal_with_dependencies_query(goal_id: int) -> Select:
+    """Goal with its subtasks, assignees, dependencies and dependents, each with their own details (9 queries)"""
+    dependencies = selectinload(models.Goal.dependencies)
+    dependents = selectinload(models.Goal.dependents)
+    return (
+        select(models.Goal)
+        .where(models.Goal.id == goal_id)
+        .options(
+            selectinload(models.Goal.subtasks),
+            selectinload(models.Goal.assignees),
+            dependencies,
+            *_goal_details(dependencies),
+            dependents,
+            *_goal_details(dependents),
+            raiseload("*"),
+        )
+    )
+
+
+async def get_meeting_with_goals(db: AsyncSession, meeting_id: int) -> Optional[models.Meeting]:
+    return (await db.execute(meeting_with_goals_query(meeting_id))).scalar_one_or_none()
+
+
+async def get_goal_with_dependencies(db: AsyncSession, goal_id: int) -> Optional[models.Goal]:
+    return (await db.execute(goal_with_dependencies_query(goal_id))).scalar_one_or_none()
+
+
+def _created_between(query: Select, model, created_after: Optional[datetime], created_before: Optional[datetime]) -> Select:
+    if created_after is not None:
+        query = query.where(model.created_at >= created_after)
+    if created_before is not None:
+        query = query.where(model.created_at < created_before)
+    return query
+
+
+async def list_meetings(
+    db: AsyncSession,
+    cursor: Optional[str] = None,
+    limit: int = 50,
+    created_after: Optional[datetime] = None,
+    created_before: Optional[datetime] = None,
+) -> Tuple[List[models.Meeting], Optional[str]]:
+    """Page through meetings, newest first"""
+    query = _created_between(select(models.Meeting), models.Meeting, created_after, created_before)
+    rows = (await db.execute(keyset_page(query, models.Meeting, cursor, limit))).scalars().all()
+    return page_items(rows, limit)
+
+
+async def list_goals(
+    db: AsyncSession,
+    cursor: Optional[str] = None,
+    limit: int = 50,
+    meeting_id: Optional[int] = None,
+    priority: Optional[models.PriorityLevel] = None,
+    assignee_id: Optional[int] = None,
+    created_after: Optional[datetime] = None,
+    created_before: Optional[datetime] = None,
+) -> Tuple[List[models.Goal], Optional[str]]:
+    """Page through goals, newest first, with their subtasks and assignees (3 queries)"""
+    query = select(models.Goal).options(
+        selectinload(models.Goal.subtasks),
+        selectinload(models.Goal.assignees),
+        raiseload("*"),
+    )
+    if meeting_id is not None:
+        query = query.where(models.Goal.meeting_id == meeting_id)
+    if priority is not None:
+        query = query.where(models.Goal.priority == priority)
+    if assignee_id is not None:
+        query = query.join(models.goal_assignees, models.goal_assignees.c.goal_id == models.Goal.id).where(
+            models.goal_assignees.c.assignee_id == assignee_id
+        )
+    query = _created_between(query, models.Goal, created_after, created_before)
+    rows = (await db.execute(keyset_page(query, models.Goal, cursor, limit))).scalars().all()
+    return page_items(rows, limit)
+
+
+async def list_assignees(
+    db: AsyncSession,
+    cursor: Optional[str] = None,
+    limit: int = 50,
+) -> Tuple[List[models.Assignee], Optional[str]]:
+    """Page through assignees, newest first"""
+    rows = (await db.execute(keyset_page(select(models.Assignee), models.Assignee, cursor, limit))).scalars().all()
+    return page_items(rows, limit)
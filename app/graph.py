@@ -0,0 +1,319 @@
+# graph.py
+import logging
+import time
+from collections import OrderedDict
+from datetime import datetime
+from typing import Dict, Iterable, List, Optional, Set, Tuple
+
+import pytz
+from fastapi import HTTPException, Request
+from sqlalchemy import delete, insert, select, update
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app import config, models
+
+logger = logging.getLogger(__name__)
+
+
+class CycleError(Exception):
+    """Raised when adding a dependency would create a cycle"""
+
+    def __init__(self, path: List[int]):
+        self.path = path
+        super().__init__(f"Dependency would create a cycle: {' -> '.join(str(goal_id) for goal_id in path)}")
+
+
+class DependencyGraph:
+    """Goal dependency graph with incremental cycle detection
+
+    Edges run from a dependency to the goals that depend on it. The graph keeps
+    a topological order at all times (Pearce-Kelly dynamic topological sort), so
+    inserting an edge that already agrees with the order is O(1), and otherwise
+    only the goals between its two ends in the order are searched and reordered.
+    """
+
+    def __init__(self, goal_ids: Iterable[int] = (), edges: Iterable[Tuple[int, int]] = ()):
+        self.dependents: Dict[int, Set[int]] = {}
+        self.dependencies: Dict[int, Set[int]] = {}
+        self.order: Dict[int, int] = {}
+        for goal_id in goal_ids:
+            self.add_goal(goal_id)
+        edges = list(edges)
+        for dependent_id, dependency_id in edges:
+            self.add_goal(dependent_id)
+            self.add_goal(dependency_id)
+            self.dependents[dependency_id].add(dependent_id)
+            self.dependencies[dependent_id].add(dependency_id)
+        if not self._sort():
+            # Rows written before cycles were rejected; fall back to inserting one
+            # edge at a time and drop the ones that close a cycle
+            for goal_id in self.order:
+                self.dependents[goal_id].clear()
+                self.dependencies[goal_id].clear()
+            for dependent_id, dependency_id in edges:
+                try:
+                    self.add_dependency(dependent_id, dependency_id)
+                except CycleError as e:
+                    logger.warning("Ignoring stored dependency %s -> %s: %s", dependent_id, dependency_id, e)
+
+    def __len__(self) -> int:
+        return len(self.order)
+
+    def add_goal(self, goal_id: int) -> None:
+        if goal_id not in self.order:
+            self.order[goal_id] = len(self.order)
+            self.dependents[goal_id] = set()
+            self.dependencies[goal_id] = set()
+
+    def remove_dependency(self, dependent_id: int, dependency_id: int) -> None:
+        # Removing an edge never invalidates the topological order
+        self.dependents.get(dependency_id, set()).discard(dependent_id)
+        self.dependencies.get(dependent_id, set()).discard(dependency_id)
+
+    def add_dependency(self, dependent_id: int, dependency_id: int) -> None:
+        """Make `dependent_id` depend on `dependency_id`, raising CycleError if that creates a cycle"""
+        self.add_goal(dependent_id)
+        self.add_goal(dependency_id)
+        if dependent_id in self.dependents[dependency_id]:
+            return
+        if dependent_id == dependency_id:
+            raise CycleError([dependent_id, dependent_id])
+
+        lower, upper = self.order[dependent_id], self.order[dependency_id]
+        if lower < upper:
+            # The dependent currently comes first; search only the affected region
+            forward = self._reach(dependent_id, self.dependents, lambda goal_id: self.order[goal_id] <= upper)
+            if dependency_id in forward:
+                raise CycleError(self._find_path(dependent_id, dependency_id, upper))
+            backward = self._reach(dependency_id, self.dependencies, lambda goal_id: self.order[goal_id] > lower)
+            self._reorder(backward, forward)
+
+        self.dependents[dependency_id].add(dependent_id)
+        self.dependencies[dependent_id].add(dependency_id)
+
+    def topological_order(self) -> List[int]:
+        """Goals ordered so that every goal comes after all of its dependencies"""
+        return sorted(self.order, key=self.order.__getitem__)
+
+    def depths(self) -> Dict[int, int]:
+        """Length of the longest chain of dependencies leading to each goal (0 for goals with none)"""
+        depths: Dict[int, int] = {}
+        for goal_id in self.topological_order():
+            depths[goal_id] = max((depths[dependency_id] + 1 for dependency_id in self.dependencies[goal_id]), default=0)
+        return depths
+
+    def critical_path(self) -> List[int]:
+        """Longest chain of dependent goals, from the first goal to start to the last to finish"""
+        depths = self.depths()
+        if not depths:
+            return []
+        goal_id = max(depths, key=depths.__getitem__)
+        path = [goal_id]
+        while self.dependencies[goal_id]:
+            goal_id = max(self.dependencies[goal_id], key=depths.__getitem__)
+            path.append(goal_id)
+        return path[::-1]
+
+    def statuses(self, completed: Iterable[int] = ()) -> Dict[int, Dict[str, object]]:
+        """Completed, blocked (with the goals blocking it) or ready, for every goal"""
+        completed = set(completed)
+        statuses = {}
+        for goal_id in self.topological_order():
+            blocked_by = sorted(self.dependencies[goal_id] - completed)
+            if goal_id in completed:
+                status = "completed"
+            elif blocked_by:
+                status = "blocked"
+            else:
+                status = "ready"
+            statuses[goal_id] = {"status": status, "blocked_by": blocked_by}
+        return statuses
+
+    def _sort(self) -> bool:
+        """Assign a topological order to the whole graph in O(V + E); False if it has a cycle"""
+        remaining = {goal_id: len(dependencies) for goal_id, dependencies in self.dependencies.items()}
+        ready = [goal_id for goal_id in self.order if not remaining[goal_id]]
+        order: Dict[int, int] = {}
+        while ready:
+            goal_id = ready.pop()
+            order[goal_id] = len(order)
+            for dependent_id in self.dependents[goal_id]:
+                remaining[dependent_id] -= 1
+                if not remaining[dependent_id]:
+                    ready.append(dependent_id)
+        if len(order) < len(self.order):
+            return False
+        self.order = order
+        return True
+
+    def _reach(self, start: int, adjacency: Dict[int, Set[int]], within) -> Set[int]:
+        seen = {start}
+        stack = [start]
+        while stack:
+            for goal_id in adjacency[stack.pop()]:
+                if goal_id not in seen and within(goal_id):
+                    seen.add(goal_id)
+                    stack.append(goal_id)
+        return seen
+
+    def _find_path(self, start: int, target: int, upper: int) -> Optional[List[int]]:
+        """Path of dependents from `start` to `target`, searching goals ordered at or before `upper`"""
+        parents: Dict[int, Optional[int]] = {start: None}
+        stack = [start]
+        while stack:
+            goal_id = stack.pop()
+            if goal_id == target:
+                path = []
+                while goal_id is not None:
+                    path.append(goal_id)
+                    goal_id = parents[goal_id]
+                # start ... target, closed by the new edge back to start
+                return path[::-1] + [start]
+            for dependent_id in self.dependents[goal_id]:
+                if dependent_id not in parents and self.order[dependent_id] <= upper:
+                    parents[dependent_id] = goal_id
+                    stack.append(dependent_id)
+        return None
+
+    def _reorder(self, backward: Set[int], forward: Set[int]) -> None:
+        # Reuse the affected positions: everything the dependency needs first, then the dependent's descendants
+        goals = sorted(backward, key=self.order.__getitem__) + sorted(forward, key=self.order.__getitem__)
+        positions = sorted(self.order[goal_id] for goal_id in goals)
+        for goal_id, position in zip(goals, positions):
+            self.order[goal_id] = position
+
+
+async def load_graph(db: AsyncSession, meeting_id: int) -> DependencyGraph:
+    """Build a meeting's dependency graph from the goals and dependencies tables (2 queries)"""
+    goal_ids = (await db.execute(
+        select(models.Goal.id).where(models.Goal.meeting_id == meeting_id).order_by(models.Goal.id)
+    )).scalars().all()
+    edges = (await db.execute(
+        select(models.Dependency.dependent_goal_id, models.Dependency.dependency_goal_id)
+        .join(models.Goal, models.Goal.id == models.Dependency.dependent_goal_id)
+        .where(models.Goal.meeting_id == meeting_id)
+    )).all()
+    return DependencyGraph(goal_ids, edges)
+
+
+async def touch_meeting(db: AsyncSession, meeting_id: int) -> datetime:
+    """Bump the meeting's updated_at, which versions cached views of its goals and dependencies"""
+    # Returned as stored, so it compares equal to the version read back later
+    return (await db.execute(
+        update(models.Meeting)
+        .where(models.Meeting.id == meeting_id)
+        .values(updated_at=datetime.now(pytz.utc))
+        .returning(models.Meeting.updated_at)
+    )).scalar()
+
+
+async def _goal_meeting(db: AsyncSession, dependent_id: int, dependency_id: int) -> Tuple[int, datetime]:
+    """Meeting both goals belong to and its version, locked so concurrent edge writes to it are serialized"""
+    if dependent_id == dependency_id:
+        raise HTTPException(status_code=400, detail="A goal cannot depend on itself")
+    meetings = dict((await db.execute(
+        select(models.Goal.id, models.Goal.meeting_id).where(models.Goal.id.in_((dependent_id, dependency_id)))
+    )).all())
+    if len(meetings) != 2:
+        raise HTTPException(status_code=404, detail="Goal not found")
+    if meetings[dependent_id] != meetings[dependency_id]:
+        raise HTTPException(status_code=400, detail="Dependencies must be between goals of the same meeting")
+    meeting_id = meetings[dependent_id]
+    version = (await db.execute(
+        select(models.Meeting.updated_at).where(models.Meeting.id == meeting_id).with_for_update()
+    )).scalar()
+    return meeting_id, version
+
+
+async def add_dependency(db: AsyncSession, index: "GraphIndex", dependent_id: int, dependency_id: int) -> bool:
+    """Insert a dependency after checking it against the meeting's graph; returns False if it already exists
+
+    The cached graph is checked and updated in place (one incremental
+    topological-order update) as long as its version matches the meeting row
+    read under the lock; otherwise another worker changed the meeting and the
+    graph is loaded again first.
+    """
+    meeting_id = None
+    try:
+        async with db.begin():
+            meeting_id, version = await _goal_meeting(db, dependent_id, dependency_id)
+            graph = index.current(meeting_id, version)
+            if graph is None:
+                graph = await load_graph(db, meeting_id)
+                index.put(meeting_id, graph, version)
+            if dependent_id in graph.dependents.get(dependency_id, ()):
+                return False
+            try:
+                graph.add_dependency(dependent_id, dependency_id)
+            except CycleError as e:
+                raise HTTPException(status_code=409, detail={"message": str(e), "cycle": e.path})
+            await db.execute(insert(models.Dependency).values(dependent_goal_id=dependent_id, dependency_goal_id=dependency_id))
+            version = await touch_meeting(db, meeting_id)
+    except HTTPException:
+        raise
+    except Exception:
+        # The edge may already be in the cached graph; don't let it outlive the rollback
+        if meeting_id is not None:
+            index.invalidate(meeting_id)
+        raise
+    index.put(meeting_id, graph, version)
+    return True
+
+
+async def remove_dependency(db: AsyncSession, index: "GraphIndex", dependent_id: int, dependency_id: int) -> bool:
+    """Delete a dependency; returns False if it didn't exist"""
+    async with db.begin():
+        deleted = (await db.execute(
+            delete(models.Dependency)
+            .where(models.Dependency.dependent_goal_id == dependent_id)
+            .where(models.Dependency.dependency_goal_id == dependency_id)
+        )).rowcount
+        meeting_id = (await db.execute(select(models.Goal.meeting_id).where(models.Goal.id == dependent_id))).scalar()
+        if deleted and meeting_id is not None:
+            await touch_meeting(db, meeting_id)
+    if meeting_id is not None:
+        index.invalidate(meeting_id)
+    return bool(deleted)
+
+
+class GraphIndex:
+    """Per-process cache of meeting dependency graphs, refreshed after a TTL or on local writes
+
+    Graphs written through add_dependency also carry the meeting's updated_at,
+    so the next write can tell whether the cached graph is still current.
+    """
+
+    def __init__(self, ttl: float = None, max_meetings: int = None):
+        self.ttl = ttl if ttl is not None else config.GRAPH_CACHE_TTL
+        self.max_meetings = max_meetings or config.GRAPH_CACHE_MAX_MEETINGS
+        self._graphs: "OrderedDict[int, Tuple[float, DependencyGraph, Optional[datetime]]]" = OrderedDict()
+
+    async def get(self, db: AsyncSession, meeting_id: int) -> DependencyGraph:
+        entry = self._graphs.get(meeting_id)
+        if entry is not None and entry[0] > time.monotonic():
+            self._graphs.move_to_end(meeting_id)
+            return entry[1]
+        graph = await load_graph(db, meeting_id)
+        self.put(meeting_id, graph)
+        return graph
+
+    def current(self, meeting_id: int, version: datetime) -> Optional[DependencyGraph]:
+        """The cached graph if it was built at exactly this meeting version"""
+        entry = self._graphs.get(meeting_id)
+        if entry is None or entry[2] is None or entry[2] != version:
+            return None
+        return entry[1]
+
+    def put(self, meeting_id: int, graph: DependencyGraph, version: Optional[datetime] = None) -> None:
+        self._graphs[meeting_id] = (time.monotonic() + self.ttl, graph, version)
+        self._graphs.move_to_end(meeting_id)
+        while len(self._graphs) > self.max_meetings:
+            self._graphs.popitem(last=False)
+
+    def invalidate(self, meeting_id: int) -> None:
+        self._graphs.pop(meeting_id, None)
+
+
+# Dependency to get the shared graph index
+def get_graph_index(request: Request) -> GraphIndex:
+    return request.app.state.graph_index
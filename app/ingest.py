@@ -0,0 +1,210 @@
+# ingest.py
+import io
+import os
+import re
+import zipfile
+from typing import BinaryIO, Iterable, Iterator, List, NamedTuple, Optional, Tuple
+from xml.etree import ElementTree
+
+from fastapi import HTTPException
+
+from app import config
+
+TRANSCRIPT_FORMATS = ("vtt", "srt", "docx", "text")
+EXTENSIONS = {".vtt": "vtt", ".srt": "srt", ".docx": "docx", ".txt": "text", ".md": "text"}
+
+TIMING_LINE = re.compile(r"^\s*(\d{1,2}:)?\d{1,2}:\d{2}[.,]\d{1,3}\s*-->")
+SRT_INDEX_LINE = re.compile(r"^\s*\d+\s*$")
+VOICE_TAG = re.compile(r"<v(?:\.[^\s>]*)?\s+([^>]+)>")
+MARKUP_TAG = re.compile(r"<[^>]+>")
+# "Sam Kim: ..." at the start of a caption or paragraph
+SPEAKER_PREFIX = re.compile(r"^\s*([A-Za-z][\w .'\-]{0,40}):\s+(.*)$")
+
+WORD_NAMESPACE = "{http://schemas.openxmlformats.org/wordprocessingml/2006/main}"
+
+
+class Turn(NamedTuple):
+    speaker: Optional[str]
+    text: str
+
+
+def detect_format(filename: Optional[str], head: bytes) -> str:
+    """Transcript format from the file extension, falling back to the first bytes of the file"""
+    extension = os.path.splitext(filename or "")[1].lower()
+    if extension in EXTENSIONS:
+        return EXTENSIONS[extension]
+    if head.startswith(b"PK\x03\x04"):
+        return "docx"
+    text = head.decode("utf-8", errors="ignore").lstrip("\ufeff")
+    if text.startswith("WEBVTT"):
+        return "vtt"
+    lines = text.lstrip().splitlines()
+    if len(lines) > 1 and SRT_INDEX_LINE.match(lines[0]) and TIMING_LINE.match(lines[1]):
+        return "srt"
+    return "text"
+
+
+def _speaker_turn(text: str, speaker: Optional[str] = None) -> Turn:
+    match = SPEAKER_PREFIX.match(text)
+    if speaker is None and match:
+        return Turn(match.group(1).strip(), match.group(2).strip())
+    return Turn(speaker, text.strip())
+
+
+def _cues(lines: Iterable[str]) -> Iterator[List[str]]:
+    """Blank-line separated blocks, stripped of their trailing newlines"""
+    block: List[str] = []
+    for line in lines:
+        line = line.rstrip("\r\n")
+        if line.strip():
+            block.append(line)
+        elif block:
+            yield block
+            block = []
+    if block:
+        yield block
+
+
+def parse_vtt(lines: Iterable[str]) -> Iterator[Turn]:
+    for block in _cues(lines):
+        timing = next((i for i, line in enumerate(block) if "-->" in line), None)
+        # The header, NOTE, STYLE and REGION blocks have no timing line
+        if timing is None:
+            continue
+        payload = " ".join(block[timing + 1:])
+        voice = VOICE_TAG.search(payload)
+        text = MARKUP_TAG.sub("", payload)
+        if text.strip():
+            yield _speaker_turn(text, voice.group(1).strip() if voice else None)
+
+
+def parse_srt(lines: Iterable[str]) -> Iterator[Turn]:
+    for block in _cues(lines):
+        timing = next((i for i, line in enumerate(block) if TIMING_LINE.match(line)), None)
+        if timing is None:
+            continue
+        text = MARKUP_TAG.sub("", " ".join(block[timing + 1:]))
+        if text.strip():
+            yield _speaker_turn(text)
+
+
+def parse_text(lines: Iterable[str]) -> Iterator[Turn]:
+    for line in lines:
+        if line.strip():
+            yield _speaker_turn(line)
+
+
+def parse_docx(file: BinaryIO) -> Iterator[Turn]:
+    """Paragraphs of word/document.xml, read with iterparse so the XML is never fully in memory"""
+    try:
+        archive = zipfile.ZipFile(file)
+        document = archive.open("word/document.xml")
+    except (zipfile.BadZipFile, KeyError):
+        raise HTTPException(status_code=400, detail="Not a valid DOCX file")
+    with archive, document:
+        for _, element in ElementTree.iterparse(document, events=("end",)):
+            if element.tag != f"{WORD_NAMESPACE}p":
+                continue
+            text = "".join(node.text or "" for node in element.iter(f"{WORD_NAMESPACE}t"))
+            element.clear()
+            if text.strip():
+                yield _speaker_turn(text)
+
+
+def _merge_turns(turns: Iterable[Turn]) -> Iterator[Turn]:
+    """Join consecutive captions by the same named speaker (captions split sentences across cues)"""
+    current: Optional[Turn] = None
+    for turn in turns:
+        if current is not None and turn.speaker is not None and turn.speaker == current.speaker:
+            current = Turn(current.speaker, f"{current.text} {turn.text}")
+            continue
+        if current is not None:
+            yield current
+        current = turn
+    if current is not None:
+        yield current
+
+
+def iter_turns(file: BinaryIO, transcript_format: str) -> Iterator[Turn]:
+    """Speaker turns from a transcript file, read incrementally"""
+    if transcript_format == "docx":
+        yield from _merge_turns(parse_docx(file))
+        return
+
+    lines = io.TextIOWrapper(file, encoding="utf-8-sig", errors="replace")
+    try:
+        if transcript_format == "text":
+            # Plain text lines are kept as they are
+            yield from parse_text(lines)
+        else:
+            yield from _merge_turns((parse_vtt if transcript_format == "vtt" else parse_srt)(lines))
+    finally:
+        # Closing the wrapper would close the upload's file too
+        lines.detach()
+
+
+def read_transcript(file: BinaryIO, filename: Optional[str] = None, transcript_format: Optional[str] = None) -> Tuple[str, str, int]:
+    """Parse an uploaded transcript into "Speaker: text" lines (blocking; call through asyncio.to_thread)
+
+    Returns the transcript text, the detected format and the number of turns.
+    The text is capped at UPLOAD_MAX_CHARACTERS.
+    """
+    file.seek(0)
+    transcript_format = transcript_format or detect_format(filename, file.read(512))
+    file.seek(0)
+
+    lines: List[str] = []
+    size = 0
+    for turn in iter_turns(file, transcript_format):
+        line = f"{turn.speaker}: {turn.text}" if turn.speaker else turn.text
+        size += len(line) + 1
+        if size > config.UPLOAD_MAX_CHARACTERS:
+            raise HTTPException(status_code=413, detail=f"Transcript is longer than {config.UPLOAD_MAX_CHARACTERS} characters")
+        lines.append(line)
+    return "\n".join(lines), transcript_format, len(lines)
+
+
+class UploadLimitMiddleware:
+    """ASGI middleware rejecting request bodies over UPLOAD_MAX_BYTES on the upload routes
+
+    Bodies that declare a larger Content-Length are refused before any of
+    them is read; bodies without one are counted as they stream in and cut
+    off with a 413 as soon as they pass the limit.
+    """
+
+    def __init__(self, app, paths: Iterable[str] = ("/process/upload",), max_bytes: int = None):
+        self.app = app
+        self.paths = tuple(paths)
+        self.max_bytes = max_bytes or config.UPLOAD_MAX_BYTES
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http" or scope["path"] not in self.paths:
+            await self.app(scope, receive, send)
+            return
+
+        content_length = next((value for name, value in scope["headers"] if name == b"content-length"), None)
+        if content_length is not None and content_length.isdigit() and int(content_length) > self.max_bytes:
+            await self._reject(send)
+            return
+
+        received = 0
+
+        async def limited_receive():
+            nonlocal received
+            message = await receive()
+            if message["type"] == "http.request":
+                received += len(message.get("body", b""))
+                if received > self.max_bytes:
+                    raise HTTPException(status_code=413, detail=f"Upload is larger than {self.max_bytes} bytes")
+            return message
+
+        await self.app(scope, limited_receive, send)
+
+    async def _reject(self, send) -> None:
+        body = f'{{"detail":"Upload is larger than {self.max_bytes} bytes"}}'.encode()
+        await send({
+            "type": "http.response.start",
+            "status": 413,
+            "headers": [(b"content-type", b"application/json"), (b"content-length", str(len(body)).encode())],
+        })
+        await send({"type": "http.response.body", "body": body})
@@ -0,0 +1,399 @@
+# jobs.py
+import asyncio
+import logging
+import os
+import socket
+import traceback
+import uuid
+from collections import OrderedDict
+from datetime import datetime, timedelta
+from typing import Any, Awaitable, Callable, Dict, List, Optional, Set
+
+import pytz
+from fastapi import HTTPException, Request
+from sqlalchemy import select, text, update
+from sqlalchemy.engine import Engine
+
+from app import config
+from app.logs import request_id
+from app.models import JobStatus
+
+logger = logging.getLogger(__name__)
+
+FINISHED_STATUSES = (JobStatus.succeeded, JobStatus.failed, JobStatus.cancelled)
+
+
+class QueueFullError(Exception):
+    """Raised when the job queue is at its maximum depth"""
+
+
+class JobQueue:
+    """Bounded asyncio worker pool processing transcripts in the background
+
+    Jobs are tracked in memory and, when persistence is enabled, in the `jobs`
+    table. A worker claims a job with a lease that it renews while the job runs,
+    so several processes can share the table: only jobs whose lease expired
+    (their worker died) are queued again, at startup or while running.
+    """
+
+    def __init__(
+        self,
+        runner: Callable[[str], Awaitable[Dict[str, Any]]],
+        workers: int = None,
+        max_depth: int = None,
+        persist: bool = None,
+    ):
+        self.runner = runner
+        self.workers = workers or config.JOB_WORKERS
+        self.max_depth = max_depth or config.JOB_QUEUE_MAX_DEPTH
+        self.persist = persist if persist is not None else config.JOBS_PERSIST
+        self.lease = config.JOB_LEASE_SECONDS
+        self.owner = f"{socket.gethostname()}:{os.getpid()}:{uuid.uuid4().hex[:8]}"
+        self._jobs: "OrderedDict[str, Dict[str, Any]]" = OrderedDict()
+        self._queue: asyncio.Queue = asyncio.Queue()
+        # Jobs waiting in the queue; cancelled jobs leave it right away, not when dequeued
+        self._waiting: Set[str] = set()
+        self._running: Dict[str, asyncio.Task] = {}
+        # Resolved by the worker once it has recorded a running job's outcome
+        self._outcomes: Dict[str, asyncio.Future] = {}
+        self._workers: List[asyncio.Task] = []
+
+    async def start(self) -> None:
+        """Recover unfinished jobs and start the worker pool"""
+        if self.persist:
+            await self._recover()
+            self._workers.append(asyncio.ensure_future(self._heartbeat()))
+        self._workers += [asyncio.ensure_future(self._work(n)) for n in range(self.workers)]
+        logger.info("Started %s job workers (max queue depth: %s)", self.workers, self.max_depth)
+
+    async def stop(self) -> None:
+        """Stop the worker pool; running jobs keep their lease and are retried once it expires"""
+        for worker in self._workers:
+            worker.cancel()
+        for task in self._running.values():
+            task.cancel()
+        await asyncio.gather(*self._workers, *self._running.values(), return_exceptions=True)
+        self._workers = []
+        logger.info("Stopped job workers")
+
+    async def submit(self, transcript: str) -> Dict[str, Any]:
+        """Enqueue a transcript and return the new job"""
+        if len(self._waiting) >= self.max_depth:
+            raise QueueFullError(f"Job queue is full ({self.max_depth} jobs waiting)")
+        job = {
+            "id": str(uuid.uuid4()),
+            "status": JobStatus.queued,
+            "transcript": transcript,
+            "result": None,
+            "error": None,
+            "created_at": datetime.now(pytz.utc),
+            "started_at": None,
+            "finished_at": None,
+        }
+        if self.persist:
+            await asyncio.to_thread(_save_job, job)
+        self._remember(job)
+        self._enqueue(job["id"])
+        logger.info("Queued job %s (%s waiting)", job["id"], len(self._waiting))
+        return job
+
+    async def get(self, job_id: str) -> Optional[Dict[str, Any]]:
+        """Look up a job in memory, falling back to the database"""
+        job = self._jobs.get(job_id)
+        if job is None and self.persist:
+            job = await asyncio.to_thread(_load_job, job_id)
+        return job
+
+    async def cancel(self, job_id: str) -> Optional[Dict[str, Any]]:
+        """Cancel a queued or running job; finished jobs are returned unchanged
+
+        A job running here is cancelled and its worker records the outcome. Any
+        other unfinished job is marked cancelled directly: a queued one is skipped
+        by the worker that dequeues it, and one running in another process is
+        stopped by that process's heartbeat.
+        """
+        job = await self.get(job_id)
+        if job is None or job["status"] in FINISHED_STATUSES:
+            return job
+        task = self._running.get(job_id)
+        if task is not None:
+            outcome = self._outcomes[job_id]
+            task.cancel()
+            await asyncio.shield(outcome)
+            return await self.get(job_id)
+        self._waiting.discard(job_id)
+        job.update(status=JobStatus.cancelled, finished_at=datetime.now(pytz.utc), transcript=None)
+        if self.persist:
+            try:
+                cancelled = await asyncio.to_thread(_cancel_job, job_id, job["finished_at"])
+            except Exception as e:
+                logger.error("Error cancelling job %s: %s", job_id, e)
+                cancelled = True
+            if not cancelled:
+                # It finished in the meantime; report what was recorded
+                self._jobs.pop(job_id, None)
+                return await asyncio.to_thread(_load_job, job_id)
+        return job
+
+    def stats(self) -> Dict[str, Any]:
+        """Queue depth and worker utilisation"""
+        return {
+            "queued": len(self._waiting),
+            "running": len(self._running),
+            "workers": self.workers,
+            "max_depth": self.max_depth,
+        }
+
+    async def _work(self, n: int) -> None:
+        while True:
+            job_id = await self._queue.get()
+            job = self._jobs.get(job_id)
+            if job_id not in self._waiting or job is None or job["status"] != JobStatus.queued:
+                continue
+            self._waiting.discard(job_id)
+
+            # Everything logged for this job carries its ID as the correlation ID
+            request_id.set(job_id)
+            job["status"] = JobStatus.running
+            job["started_at"] = datetime.now(pytz.utc)
+            if self.persist:
+                try:
+                    # Recovered jobs are listed without their transcript; the claim loads it
+                    transcript = await asyncio.to_thread(_claim_job, job_id, self.owner, self.lease)
+                except Exception as e:
+                    logger.error("Error claiming job %s: %s", job_id, e)
+                    transcript = None
+                if transcript is None or job["status"] != JobStatus.running:
+                    # Another worker has it, or it was cancelled; lookups fall back to the database
+                    logger.info("Job %s was claimed or cancelled elsewhere; skipping", job_id)
+                    self._jobs.pop(job_id, None)
+                    continue
+                job["transcript"] = transcript
+            logger.info("Worker %s running job %s", n, job_id)
+
+            task = asyncio.ensure_future(self.runner(job["transcript"]))
+            self._running[job_id] = task
+            self._outcomes[job_id] = asyncio.get_running_loop().create_future()
+            try:
+                await asyncio.wait({task})
+                # This worker alone records the outcome, cancellations included
+                if task.cancelled():
+                    logger.info("Job %s cancelled", job_id)
+                    await self._finish(job, JobStatus.cancelled)
+                elif task.exception() is not None:
+                    e = task.exception()
+                    detail = e.detail if isinstance(e, HTTPException) else str(e)
+                    logger.error("Job %s failed: %s", job_id, detail)
+                    logger.error("".join(traceback.format_exception(e)))
+                    await self._finish(job, JobStatus.failed, error=detail)
+                else:
+                    logger.info("Job %s succeeded", job_id)
+                    await self._finish(job, JobStatus.succeeded, result=task.result())
+            finally:
+                self._running.pop(job_id, None)
+                self._outcomes.pop(job_id).set_result(None)
+
+    async def _finish(self, job: Dict[str, Any], status: JobStatus, result=None, error=None) -> None:
+        """Record the outcome of a job this worker ran"""
+        job.update(status=status, result=result, error=error, finished_at=datetime.now(pytz.utc))
+        # The transcript is no longer needed once the job has finished
+        job["transcript"] = None
+        if not self.persist:
+            return
+        try:
+            recorded = await asyncio.to_thread(_finish_job, job, self.owner)
+        except Exception as e:
+            logger.error("Error saving job %s: %s", job["id"], e)
+            return
+        if not recorded:
+            # Cancelled, or taken over after the lease lapsed; the stored outcome stands
+            logger.warning("Job %s is no longer owned by this worker; discarding its %s outcome", job["id"], status.value)
+            self._jobs.pop(job["id"], None)
+
+    def _enqueue(self, job_id: str) -> None:
+        self._waiting.add(job_id)
+        self._queue.put_nowait(job_id)
+
+    async def _recover(self) -> None:
+        """Queue jobs nobody holds a lease on: queued ones, and running ones whose worker died
+
+        Only jobs this process doesn't know yet are listed, as many as the queue
+        has room for, and without their transcripts.
+        """
+        room = self.max_depth - len(self._waiting)
+        if room <= 0:
+            return
+        known = [job_id for job_id, job in self._jobs.items() if job["status"] not in FINISHED_STATUSES]
+        try:
+            jobs = await asyncio.to_thread(_recover_jobs, known, room)
+        except Exception as e:
+            logger.error("Error recovering jobs: %s", e)
+            return
+        recovered = 0
+        for job in jobs:
+            if job["id"] not in self._jobs:
+                self._jobs[job["id"]] = job
+                self._enqueue(job["id"])
+                recovered += 1
+        if recovered:
+            logger.info("Recovered %s unfinished jobs", recovered)
+
+    async def _heartbeat(self) -> None:
+        """Renew the leases of running jobs, stop the ones cancelled or taken over elsewhere, and pick up expired ones"""
+        while True:
+            await asyncio.sleep(self.lease / 3)
+            running = list(self._running)
+            if running:
+                try:
+                    owned = await asyncio.to_thread(_renew_leases, running, self.owner, self.lease)
+                except Exception as e:
+                    logger.error("Error renewing job leases: %s", e)
+                    owned = set(running)
+                for job_id in set(running) - owned:
+                    task = self._running.get(job_id)
+                    if task is not None:
+                        logger.info("Job %s is no longer owned by this worker; stopping it", job_id)
+                        task.cancel()
+            await self._recover()
+
+    def _remember(self, job: Dict[str, Any]) -> None:
+        self._jobs[job["id"]] = job
+        # Forget the oldest finished jobs beyond the retention limit
+        if len(self._jobs) > config.JOB_RETENTION:
+            for job_id in [job_id for job_id, old in self._jobs.items() if old["status"] in FINISHED_STATUSES]:
+                del self._jobs[job_id]
+                if len(self._jobs) <= config.JOB_RETENTION:
+                    break
+
+
+# Persistence (blocking; always called through asyncio.to_thread)
+JOB_FIELDS = ("id", "status", "transcript", "result", "error", "created_at", "started_at", "finished_at")
+
+
+def _job_dict(db_job) -> Dict[str, Any]:
+    return {field: getattr(db_job, field) for field in JOB_FIELDS}
+
+
+def _save_job(job: Dict[str, Any]) -> None:
+    from app.database import SessionLocal
+    from app.models import Job
+
+    fields = {field: job[field] for field in JOB_FIELDS}
+    if fields["transcript"] is None:
+        # Finished jobs keep the transcript stored at submission time
+        del fields["transcript"]
+    with SessionLocal() as db:
+        db.merge(Job(**fields))
+        db.commit()
+
+
+def _load_job(job_id: str) -> Optional[Dict[str, Any]]:
+    from app.database import SessionLocal
+    from app.models import Job
+
+    with SessionLocal() as db:
+        db_job = db.get(Job, job_id)
+        return _job_dict(db_job) if db_job is not None else None
+
+
+def _claim_job(job_id: str, owner: str, lease: float) -> Optional[str]:
+    """Atomically take a queued job for `owner`; returns its transcript, or None if another worker got it first"""
+    from app.database import SessionLocal
+    from app.models import Job
+
+    now = datetime.now(pytz.utc)
+    with SessionLocal() as db:
+        transcript = db.execute(
+            update(Job)
+            .where(Job.id == job_id, Job.status == JobStatus.queued)
+            .values(status=JobStatus.running, started_at=now, owner=owner, lease_expires_at=now + timedelta(seconds=lease))
+            .returning(Job.transcript)
+        ).scalar()
+        db.commit()
+        return transcript
+
+
+def _finish_job(job: Dict[str, Any], owner: str) -> bool:
+    """Store a job's outcome if `owner` still holds it; False if it was cancelled or taken over"""
+    from app.database import SessionLocal
+    from app.models import Job
+
+    with SessionLocal() as db:
+        recorded = db.execute(
+            update(Job)
+            .where(Job.id == job["id"], Job.status == JobStatus.running, Job.owner == owner)
+            .values(status=job["status"], result=job["result"], error=job["error"], finished_at=job["finished_at"], lease_expires_at=None)
+        ).rowcount
+        db.commit()
+        return recorded == 1
+
+
+def _cancel_job(job_id: str, finished_at: datetime) -> bool:
+    """Mark an unfinished job cancelled, wherever it runs; False if it had already finished"""
+    from app.database import SessionLocal
+    from app.models import Job
+
+    with SessionLocal() as db:
+        cancelled = db.execute(
+            update(Job)
+            .where(Job.id == job_id, Job.status.in_((JobStatus.queued, JobStatus.running)))
+            .values(status=JobStatus.cancelled, finished_at=finished_at, lease_expires_at=None)
+        ).rowcount
+        db.commit()
+        return cancelled == 1
+
+
+def _renew_leases(job_ids: List[str], owner: str, lease: float) -> Set[str]:
+    """Extend `owner`'s leases; returns the IDs it still holds"""
+    from app.database import SessionLocal
+    from app.models import Job
+
+    with SessionLocal() as db:
+        owned = db.execute(
+            update(Job)
+            .where(Job.id.in_(job_ids), Job.owner == owner, Job.status == JobStatus.running)
+            .values(lease_expires_at=datetime.now(pytz.utc) + timedelta(seconds=lease))
+            .returning(Job.id)
+        ).scalars().all()
+        db.commit()
+        return set(owned)
+
+
+def _recover_jobs(known: List[str], limit: int) -> List[Dict[str, Any]]:
+    """Requeue running jobs whose lease expired and return up to `limit` queued jobs not in `known`, oldest first
+
+    Jobs still running under a live lease belong to another worker and are left
+    alone. Running jobs without a lease predate leases and are treated as expired.
+    Transcripts aren't loaded; _claim_job returns them.
+    """
+    from app.database import SessionLocal
+    from app.models import Job
+
+    with SessionLocal() as db:
+        expired = (Job.lease_expires_at.is_(None)) | (Job.lease_expires_at < datetime.now(pytz.utc))
+        db.query(Job).filter(Job.status == JobStatus.running, expired).update(
+            {Job.status: JobStatus.queued, Job.started_at: None, Job.owner: None, Job.lease_expires_at: None},
+            synchronize_session=False,
+        )
+        db.commit()
+        query = select(*(getattr(Job, field) for field in JOB_FIELDS if field != "transcript")).where(Job.status == JobStatus.queued)
+        if known:
+            query = query.where(Job.id.notin_(known))
+        rows = db.execute(query.order_by(Job.created_at).limit(limit)).all()
+        return [{**row._asdict(), "transcript": None} for row in rows]
+
+
+def ensure_lease_columns(engine: Engine) -> None:
+    """Add the jobs lease columns to tables created before they existed"""
+    with engine.begin() as conn:
+        conn.execute(text("ALTER TABLE jobs ADD COLUMN IF NOT EXISTS owner VARCHAR(128)"))
+        conn.execute(text("ALTER TABLE jobs ADD COLUMN IF NOT EXISTS lease_expires_at TIMESTAMP WITH TIME ZONE"))
+    logger.info("Job lease columns are up to date.")
+
+
+# Dependency to get the shared job queue
+def get_job_queue(request: Request) -> JobQueue:
+    queue = getattr(request.app.state, "job_queue", None)
+    if queue is None:
+        raise HTTPException(status_code=503, detail="Job queue is not running")
+    return queue
@@ -0,0 +1,166 @@
+# knowledge_graph.py
+import hashlib
+import logging
+from collections import OrderedDict
+from datetime import datetime
+from typing import Any, Dict, List, Optional, Tuple
+
+import orjson
+from fastapi import HTTPException, Request
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app import config, crud, models
+from app.graph import DependencyGraph
+
+logger = logging.getLogger(__name__)
+
+# Node and edge kinds are sent as indexes into these lists
+NODE_KINDS = ["goal", "subtask", "assignee"]
+EDGE_KINDS = ["subtask", "assignment", "dependency"]
+
+# Layered layout spacing in pixels
+LAYER_SPACING = 260
+ROW_SPACING = 90
+SUBTASK_OFFSET = (40, 45)
+
+
+def build_payload(meeting: models.Meeting, edges: List[Tuple[int, int]], layout: bool = True) -> Dict[str, Any]:
+    """Compact node/edge arrays for a meeting's knowledge graph
+
+    Nodes are `[kind, id, label, priority, description]` and edges are
+    `[source, target, kind]`, where source and target index into `nodes`.
+    With `layout`, `positions` holds an `[x, y]` per node: goals are laid out
+    left to right by dependency depth, subtasks under their goal and assignees
+    in a column on the right.
+    """
+    nodes: List[list] = []
+    graph_edges: List[list] = []
+    goal_index: Dict[int, int] = {}
+    assignee_index: Dict[int, int] = {}
+    subtasks: Dict[int, List[int]] = {}
+
+    goals = sorted(meeting.goals, key=lambda goal: goal.id)
+    for goal in goals:
+        goal_index[goal.id] = len(nodes)
+        nodes.append([0, goal.id, goal.name, goal.priority.value, goal.description])
+    for goal in goals:
+        for subtask in sorted(goal.subtasks, key=lambda subtask: subtask.id):
+            subtasks.setdefault(goal_index[goal.id], []).append(len(nodes))
+            graph_edges.append([goal_index[goal.id], len(nodes), 0])
+            nodes.append([1, subtask.id, subtask.name, None, None])
+        for assignee in sorted(goal.assignees, key=lambda assignee: assignee.id):
+            if assignee.id not in assignee_index:
+                assignee_index[assignee.id] = len(nodes)
+                nodes.append([2, assignee.id, assignee.name, None, None])
+            graph_edges.append([goal_index[goal.id], assignee_index[assignee.id], 1])
+    # Dependency edges point from the prerequisite to the goal that needs it
+    edges = [edge for edge in sorted(edges) if edge[0] in goal_index and edge[1] in goal_index]
+    for dependent_id, dependency_id in edges:
+        graph_edges.append([goal_index[dependency_id], goal_index[dependent_id], 2])
+
+    payload = {
+        "meeting_id": meeting.id,
+        "node_kinds": NODE_KINDS,
+        "edge_kinds": EDGE_KINDS,
+        "nodes": nodes,
+        "edges": graph_edges,
+    }
+    if layout:
+        payload["positions"] = _layout(nodes, goal_index, subtasks, DependencyGraph(goal_index, edges))
+    return payload
+
+
+def _layout(
+    nodes: List[list],
+    goal_index: Dict[int, int],
+    subtasks: Dict[int, List[int]],
+    graph: DependencyGraph,
+) -> List[List[int]]:
+    positions: List[Optional[List[int]]] = [None] * len(nodes)
+    depths = graph.depths()
+    rows: Dict[int, int] = {}
+    for goal_id in graph.topological_order():
+        node = goal_index[goal_id]
+        x, y = depths[goal_id] * LAYER_SPACING, rows.get(depths[goal_id], 0)
+        positions[node] = [x, y]
+        # Subtasks hang under their goal; the next goal in the layer goes below them
+        for count, subtask in enumerate(subtasks.get(node, []), start=1):
+            positions[subtask] = [x + SUBTASK_OFFSET[0], y + count * SUBTASK_OFFSET[1]]
+        rows[depths[goal_id]] = y + len(subtasks.get(node, [])) * SUBTASK_OFFSET[1] + ROW_SPACING
+    assignee_x = (max(depths.values(), default=-1) + 1) * LAYER_SPACING + LAYER_SPACING // 2
+    assignee_y = 0
+    for node, row in enumerate(nodes):
+        if row[0] == 2:
+            positions[node] = [assignee_x, assignee_y]
+            assignee_y += ROW_SPACING
+    return positions
+
+
+def make_etag(body: bytes) -> str:
+    return f'"{hashlib.sha256(body).hexdigest()[:32]}"'
+
+
+def etag_matches(if_none_match: Optional[str], etag: str) -> bool:
+    """Whether an If-None-Match header matches the ETag (weak comparison, as RFC 9110 specifies for it)"""
+    if not if_none_match:
+        return False
+    candidates = [candidate.strip() for candidate in if_none_match.split(",")]
+    return "*" in candidates or etag in (candidate.removeprefix("W/") for candidate in candidates)
+
+
+class GraphPayloadCache:
+    """Per-process cache of serialized knowledge-graph payloads
+
+    Entries are keyed on the meeting and layout flag and remember the meeting's
+    `updated_at`, which every goal or dependency write bumps; a request only
+    rebuilds the payload when that version has moved.
+    """
+
+    def __init__(self, max_entries: int = None):
+        self.max_entries = max_entries or config.GRAPH_CACHE_MAX_MEETINGS
+        self._entries: "OrderedDict[Tuple[int, bool], Tuple[datetime, bytes, str]]" = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+
+    async def get(self, db: AsyncSession, meeting_id: int, layout: bool = True) -> Tuple[bytes, str]:
+        """Serialized payload and strong ETag for a meeting, rebuilt only when it changed"""
+        row = (await db.execute(
+            select(models.Meeting.updated_at).where(models.Meeting.id == meeting_id)
+        )).first()
+        if row is None:
+            raise HTTPException(status_code=404, detail="Meeting not found")
+        version = row.updated_at
+
+        key = (meeting_id, layout)
+        entry = self._entries.get(key)
+        if entry is not None and entry[0] == version:
+            self.hits += 1
+            self._entries.move_to_end(key)
+            return entry[1], entry[2]
+
+        self.misses += 1
+        meeting = await crud.get_meeting_with_goals(db, meeting_id)
+        if meeting is None:
+            raise HTTPException(status_code=404, detail="Meeting not found")
+        edges = (await db.execute(
+            select(models.Dependency.dependent_goal_id, models.Dependency.dependency_goal_id)
+            .join(models.Goal, models.Goal.id == models.Dependency.dependent_goal_id)
+            .where(models.Goal.meeting_id == meeting_id)
+        )).all()
+        body = orjson.dumps(build_payload(meeting, edges, layout))
+        etag = make_etag(body)
+        self._entries[key] = (version, body, etag)
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+        logger.debug("Built graph payload for meeting %s: %s bytes", meeting_id, len(body))
+        return body, etag
+
+    def stats(self) -> Dict[str, int]:
+        return {"entries": len(self._entries), "hits": self.hits, "misses": self.misses}
+
+
+# Dependency to get the shared graph payload cache
+def get_graph_payload_cache(request: Request) -> GraphPayloadCache:
+    return request.app.state.graph_payload_cache
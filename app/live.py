@@ -0,0 +1,188 @@
+# live.py
+import time
+from typing import Any, Dict, List, Optional, Tuple
+
+from app import config
+from app.chunking import combine_goals, estimate_tokens, goal_key
+
+
+class LiveSession:
+    """Running goal set of a meeting whose transcript arrives in segments
+
+    Segments collect in a pending window. Each extraction sees only that window,
+    headed by the last few lines of the previous one and the most recent goals
+    found so far, so its cost stays flat however long the meeting runs. Extracted
+    goals are merged into the running set: goals matching an existing one (by
+    name, or by an existing ID the model reused) update it in place, new goals
+    get the next ID, and dependencies are remapped to the running IDs.
+
+    A failed extraction leaves its window pending and backs off before the next
+    attempt. If the window keeps failing while the pending transcript outgrows
+    LIVE_MAX_PENDING_TOKENS, it is dropped (keeping its tail as the overlap) and
+    reported as lost.
+    """
+
+    def __init__(
+        self,
+        window_tokens: int = None,
+        overlap_tokens: int = None,
+        interval: float = None,
+        context_goals: int = None,
+        max_pending_tokens: int = None,
+    ):
+        self.window_tokens = window_tokens or config.LIVE_WINDOW_TOKENS
+        self.max_pending_tokens = max_pending_tokens or config.LIVE_MAX_PENDING_TOKENS
+        self.overlap_tokens = config.LIVE_OVERLAP_TOKENS if overlap_tokens is None else overlap_tokens
+        self.interval = interval or config.LIVE_INTERVAL
+        self.context_goals = config.LIVE_CONTEXT_GOALS if context_goals is None else context_goals
+        self.goals: Dict[int, Any] = {}  # running ID -> goal, in order of discovery
+        self._ids_by_key: Dict[str, int] = {}
+        self._pending: List[str] = []
+        self._pending_tokens = 0
+        self._overlap: List[str] = []
+        self._last_extraction = time.monotonic()
+        self._failures = 0
+        self._retry_at = 0.0
+        self.counters = {"segments": 0, "extractions": 0, "failures": 0, "lost_windows": 0}
+
+    @property
+    def next_id(self) -> int:
+        return max(self.goals, default=0) + 1
+
+    def add_segment(self, text: str) -> None:
+        for line in text.splitlines():
+            if line.strip():
+                self._pending.append(line)
+                self._pending_tokens += estimate_tokens(line) + 1
+        self.counters["segments"] += 1
+
+    def due(self, force: bool = False) -> bool:
+        """Whether the pending window should be extracted now"""
+        if not self._pending:
+            return False
+        if force:
+            return True
+        now = time.monotonic()
+        if now < self._retry_at:
+            return False
+        return self._pending_tokens >= self.window_tokens or now - self._last_extraction >= self.interval
+
+    def window(self) -> Tuple[str, int]:
+        """The text to extract (overlap plus pending lines) and the number of pending lines it covers"""
+        return "\n".join(self._overlap + self._pending), len(self._pending)
+
+    def context(self) -> str:
+        """The most recent goals, listed for the model so it can update them and depend on them"""
+        recent = list(self.goals.values())[-self.context_goals:] if self.context_goals else []
+        lines = [f"[{goal.id}] {goal.name}" + (f" ({', '.join(goal.assignees)})" if goal.assignees else "") for goal in recent]
+        listing = "\n".join(lines) if lines else "(none yet)"
+        return f"Goals so far:\n{listing}\nNumber new goals from {self.next_id}."
+
+    def advance(self, lines: int) -> None:
+        """Drop the first `lines` pending lines once extracted, keeping their tail as the next overlap"""
+        self._consume(lines)
+        self._last_extraction = time.monotonic()
+        self._failures = 0
+        self._retry_at = 0.0
+        self.counters["extractions"] += 1
+
+    def fail(self, lines: int) -> Optional[Dict[str, Any]]:
+        """Record a failed extraction of the first `lines` pending lines and back off
+
+        Returns the lost window (as pending_window describes it) if the pending
+        transcript has outgrown max_pending_tokens and those lines were dropped.
+        """
+        self._failures += 1
+        self.counters["failures"] += 1
+        self._retry_at = time.monotonic() + min(config.LIVE_RETRY_DELAY * 2 ** (self._failures - 1), self.interval)
+        if self._pending_tokens <= self.max_pending_tokens:
+            return None
+        lost = self.pending_window(lines)
+        self._consume(lines)
+        self.counters["lost_windows"] += 1
+        return lost
+
+    def _consume(self, lines: int) -> None:
+        extracted, self._pending = self._pending[:lines], self._pending[lines:]
+        self._pending_tokens = sum(estimate_tokens(line) + 1 for line in self._pending)
+        overlap: List[str] = []
+        size = 0
+        for line in reversed(self._overlap + extracted):
+            size += estimate_tokens(line) + 1
+            if size > self.overlap_tokens:
+                break
+            overlap.insert(0, line)
+        self._overlap = overlap
+
+    def merge(self, extracted: List[Any]) -> Dict[str, List[Any]]:
+        """Merge a window's goals into the running set; returns the goals added and updated"""
+        id_map: Dict[int, int] = {}
+        added: List[int] = []
+        updated: List[int] = []
+        before = {goal_id: goal.model_dump() for goal_id, goal in self.goals.items()}
+
+        for goal in extracted:
+            key = goal_key(goal.name)
+            running_id = self._ids_by_key.get(key)
+            if running_id is None and goal.id in self.goals and goal.id not in id_map.values():
+                # The model repeated an existing goal under its ID, with a reworded name
+                running_id = goal.id
+            if running_id is None:
+                running_id = self.next_id
+                self.goals[running_id] = goal.model_copy(update={"id": running_id, "dependencies": []})
+                added.append(running_id)
+            else:
+                self.goals[running_id] = combine_goals(self.goals[running_id], goal)
+                if running_id not in added and running_id not in updated:
+                    updated.append(running_id)
+            self._ids_by_key.setdefault(key, running_id)
+            id_map[goal.id] = running_id
+
+        # Dependencies name window IDs, or running IDs of goals from earlier windows
+        for goal in extracted:
+            running_id = id_map[goal.id]
+            current = self.goals[running_id]
+            dependencies = list(current.dependencies or [])
+            for dependency in goal.dependencies or []:
+                target = id_map.get(dependency, dependency if dependency in self.goals else None)
+                if target is None or target == running_id or target in dependencies:
+                    continue
+                # Windows can disagree on the order of goals; never close a cycle
+                if not self._depends_on(target, running_id):
+                    dependencies.append(target)
+            self.goals[running_id] = current.model_copy(update={
+                "dependencies": dependencies,
+                "subtasks": [subtask.model_copy(update={"id": index + 1}) for index, subtask in enumerate(current.subtasks or [])],
+            })
+
+        # Only goals that actually changed go back to the client
+        updated = [goal_id for goal_id in updated if self.goals[goal_id].model_dump() != before.get(goal_id)]
+        return {
+            "added": [self.goals[goal_id] for goal_id in added],
+            "updated": [self.goals[goal_id] for goal_id in updated],
+        }
+
+    def _depends_on(self, goal_id: int, other_id: int) -> bool:
+        """Whether `goal_id` depends on `other_id`, directly or through other goals"""
+        stack, seen = [goal_id], set()
+        while stack:
+            current = stack.pop()
+            if current == other_id:
+                return True
+            if current not in seen:
+                seen.add(current)
+                stack.extend(self.goals[current].dependencies or [] if current in self.goals else [])
+        return False
+
+    def pending_window(self, lines: int = None) -> Dict[str, Any]:
+        """The window that would be extracted next (or its first `lines` lines): its number, size and first line"""
+        pending = self._pending if lines is None else self._pending[:lines]
+        return {
+            "window": self.counters["extractions"] + self.counters["lost_windows"] + 1,
+            "lines": len(pending),
+            "tokens": sum(estimate_tokens(line) + 1 for line in pending),
+            "starts_with": pending[0][:80] if pending else "",
+        }
+
+    def stats(self) -> Dict[str, Any]:
+        return {**self.counters, "goals": len(self.goals), "pending_tokens": self._pending_tokens}
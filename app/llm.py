@@ -0,0 +1,190 @@
+# llm.py
+import asyncio
+import logging
+from types import SimpleNamespace
+from typing import TYPE_CHECKING, Any, AsyncIterator, Optional
+
+from fastapi import FastAPI, HTTPException, Request
+
+from app import config
+from app.metrics import record_completion, record_error, record_stream_usage
+from app.resilience import LLMResilience
+from app.scheduler import LLMScheduler
+
+if TYPE_CHECKING:
+    from instructor import AsyncInstructor as LLMClient
+else:
+    # instructor and openai are most of the app's import time, so they are only
+    # imported when the client is created; annotations use this alias instead
+    LLMClient = Any
+
+logger = logging.getLogger(__name__)
+
+_END = object()
+
+
+class ScheduledClient:
+    """Instructor client whose completions are admitted through an LLMScheduler and run under an LLMResilience policy"""
+
+    def __init__(self, client: LLMClient, scheduler: Optional[LLMScheduler] = None, resilience: Optional[LLMResilience] = None):
+        self.instructor_client = client
+        self.client = client.client
+        self.scheduler = scheduler
+        self.resilience = resilience
+        self.chat = SimpleNamespace(completions=SimpleNamespace(create=self.create))
+
+    async def create(self, messages: list, **kwargs: Any) -> Any:
+        async def admit() -> None:
+            await self.scheduler.admit(self.scheduler.estimate(messages))
+
+        async def send() -> Any:
+            response = await self.instructor_client.chat.completions.create(messages=messages, **kwargs)
+            if self.resilience is not None and kwargs.get("stream"):
+                # Streamed requests are only sent on first iteration; make them fail (or answer) inside the attempt
+                response = await prefetch(response)
+            return response
+
+        if self.resilience is None:
+            await admit()
+            return await send()
+        kwargs.setdefault("max_retries", parse_retries())
+        # Every attempt and hedge is admitted separately, so retries draw on the same budgets
+        model = kwargs.get("model") or config.EXTRACTION_MODEL
+        response_model = kwargs.get("response_model")
+        key = f"{model}:{getattr(response_model, '__name__', response_model)}"
+        return await self.resilience.call(send, model, key, admit=admit if self.scheduler is not None else None)
+
+
+async def prefetch(stream: AsyncIterator[Any]) -> AsyncIterator[Any]:
+    """Wait for a stream's first item; returns an iterator over all of its items"""
+    iterator = stream.__aiter__()
+    first = await anext(iterator, _END)
+
+    async def items() -> AsyncIterator[Any]:
+        if first is _END:
+            return
+        yield first
+        async for item in iterator:
+            yield item
+
+    return items()
+
+
+def track_stream_usage(openai_client: Any) -> None:
+    """Have streamed completions report their usage, and record it as the stream ends
+
+    OpenAI only sends usage for a stream when asked, in an extra final chunk
+    without choices (which instructor skips). Wraps the client's create method,
+    before instructor patches it, so streamed calls count toward the token and
+    cost metrics and track_usage like non-streamed ones.
+    """
+    create = openai_client.chat.completions.create
+
+    async def create_with_usage(*args: Any, **kwargs: Any) -> Any:
+        if not kwargs.get("stream"):
+            return await create(*args, **kwargs)
+        kwargs.setdefault("stream_options", {"include_usage": True})
+        return record_stream_usage(await create(*args, **kwargs))
+
+    openai_client.chat.completions.create = create_with_usage
+
+
+def parse_retries() -> Any:
+    """instructor retrying that only re-asks after an invalid response
+
+    instructor otherwise retries every error, API errors included, immediately
+    and without backoff. A new object per call, since tenacity keeps its state on it.
+    """
+    from json import JSONDecodeError
+
+    from instructor.validators import AsyncValidationError
+    from pydantic import ValidationError
+    from tenacity import AsyncRetrying, retry_if_exception_type, stop_after_attempt
+
+    return AsyncRetrying(
+        stop=stop_after_attempt(3),
+        retry=retry_if_exception_type((ValidationError, JSONDecodeError, AsyncValidationError)),
+    )
+
+
+def create_client(
+    api_key: Optional[str] = None,
+    base_url: Optional[str] = None,
+    scheduler: Optional[LLMScheduler] = None,
+    resilience: Optional[LLMResilience] = None,
+) -> Optional[LLMClient]:
+    """Create the pooled AsyncOpenAI client wrapped with instructor
+    
+    With a scheduler, every completion waits for rate-limit budget first and
+    every response's rate-limit headers update the scheduler's budgets. With a
+    resilience policy, completions get deadlines, retries, hedging and a
+    circuit breaker, and the SDK's own retries are turned off.
+    Imports the LLM stack on first use (blocking; see start_client).
+    """
+    api_key = api_key or config.OPENAI_API_KEY
+    if not api_key:
+        logger.warning("OpenAI API key not found in environment variables; extraction is disabled")
+        return None
+    
+    import httpx
+    import instructor
+    from openai import AsyncOpenAI, DefaultAsyncHttpxClient
+    
+    http_client = DefaultAsyncHttpxClient(
+        limits=httpx.Limits(
+            max_connections=config.OPENAI_MAX_CONNECTIONS,
+            max_keepalive_connections=config.OPENAI_MAX_KEEPALIVE_CONNECTIONS,
+            keepalive_expiry=config.OPENAI_KEEPALIVE_EXPIRY,
+        ),
+        timeout=httpx.Timeout(config.OPENAI_TIMEOUT, connect=config.OPENAI_CONNECT_TIMEOUT),
+        event_hooks={"response": [scheduler.observe_response]} if scheduler is not None else None,
+    )
+    openai_client = AsyncOpenAI(
+        api_key=api_key,
+        base_url=base_url or config.OPENAI_BASE_URL,
+        http_client=http_client,
+        # Retries are left to the resilience policy, so that they are jittered and counted
+        **({"max_retries": 0} if resilience is not None else {}),
+    )
+    logger.info("Created pooled AsyncOpenAI client (max connections: %s)", config.OPENAI_MAX_CONNECTIONS)
+    track_stream_usage(openai_client)
+    client = instructor.from_openai(openai_client)
+    client.on("completion:response", record_completion)
+    client.on("completion:error", record_error)
+    client.on("parse:error", record_error)
+    if scheduler is None and resilience is None:
+        return client
+    return ScheduledClient(client, scheduler, resilience)
+
+
+def start_client(app: FastAPI, scheduler: Optional[LLMScheduler] = None, resilience: Optional[LLMResilience] = None) -> asyncio.Future:
+    """Create the client on a worker thread, so the app serves requests while the LLM stack imports"""
+    app.state.llm_client = None
+    app.state.llm_client_task = asyncio.ensure_future(asyncio.to_thread(create_client, scheduler=scheduler, resilience=resilience))
+    return app.state.llm_client_task
+
+
+async def resolve_client(app: FastAPI) -> Optional[LLMClient]:
+    """The shared client, waiting for start_client to finish creating it if needed"""
+    task = getattr(app.state, "llm_client_task", None)
+    if task is not None:
+        # Shielded: a cancelled request must not cancel the client's creation
+        app.state.llm_client = await asyncio.shield(task)
+        app.state.llm_client_task = None
+    return getattr(app.state, "llm_client", None)
+
+
+async def close_client(client: Optional[LLMClient]) -> None:
+    """Close the client's connection pool"""
+    if client is None:
+        return
+    await client.client.close()
+    logger.info("Closed pooled AsyncOpenAI client")
+
+
+# Dependency to get the shared LLM client
+async def get_llm_client(request: Request) -> LLMClient:
+    client = await resolve_client(request.app)
+    if client is None:
+        raise HTTPException(status_code=500, detail="OpenAI API key not found. Please set OPENAI_API_KEY environment variable.")
+    return client
@@ -0,0 +1,173 @@
+# logs.py
+import atexit
+import json
+import logging
+import queue
+import random
+import re
+import sys
+import uuid
+from contextvars import ContextVar
+from datetime import datetime, timezone
+from logging.handlers import QueueHandler, QueueListener
+from typing import Any, Optional
+
+from app import config
+from app.metrics import LOG_RECORDS_DROPPED
+
+# Correlation ID of the request (or job) being handled, attached to every record logged while handling it
+request_id: ContextVar[Optional[str]] = ContextVar("request_id", default=None)
+
+REQUEST_ID_HEADER = "x-request-id"
+VALID_REQUEST_ID = re.compile(r"^[\w.:-]{1,128}$")
+
+# Attributes every LogRecord has; anything else was passed through `extra`
+_RECORD_ATTRIBUTES = set(vars(logging.LogRecord("", 0, "", 0, "", None, None))) | {"message", "asctime", "request_id"}
+
+_listener: Optional[QueueListener] = None
+
+
+def _truncate(text: str) -> str:
+    limit = config.LOG_PAYLOAD_MAX_CHARS
+    return text if len(text) <= limit else f"{text[:limit]}... ({len(text) - limit} more characters)"
+
+
+def _payload_json(payload: Any) -> str:
+    return _truncate(json.dumps(payload, default=str))
+
+
+class RequestIdFilter(logging.Filter):
+    """Stamps records with the current correlation ID, in the calling thread before they are queued"""
+
+    def filter(self, record: logging.LogRecord) -> bool:
+        record.request_id = request_id.get()
+        return True
+
+
+class JsonFormatter(logging.Formatter):
+    """One JSON object per line, with `extra` fields and the correlation ID as keys"""
+
+    def format(self, record: logging.LogRecord) -> str:
+        entry = {
+            "ts": datetime.fromtimestamp(record.created, timezone.utc).isoformat(timespec="milliseconds"),
+            "level": record.levelname,
+            "logger": record.name,
+            "message": record.getMessage(),
+        }
+        if getattr(record, "request_id", None):
+            entry["request_id"] = record.request_id
+        for key, value in vars(record).items():
+            if key not in _RECORD_ATTRIBUTES and key != "payload":
+                entry[key] = value
+        if hasattr(record, "payload"):
+            entry["payload"] = _payload_json(record.payload)
+        if record.exc_info:
+            entry["exception"] = self.formatException(record.exc_info)
+        return json.dumps(entry, default=str)
+
+
+class TextFormatter(logging.Formatter):
+    """The plain-text format, with the correlation ID and any payload appended"""
+
+    def __init__(self):
+        super().__init__("%(asctime)s - %(name)s - %(levelname)s - [%(request_id)s] %(message)s")
+
+    def format(self, record: logging.LogRecord) -> str:
+        if getattr(record, "request_id", None) is None:
+            record.request_id = "-"
+        text = super().format(record)
+        if hasattr(record, "payload"):
+            text += f" payload={_payload_json(record.payload)}"
+        return text
+
+
+class NonBlockingQueueHandler(QueueHandler):
+    """Hands records to the listener thread as they are, and drops them when the queue is full
+
+    The stock QueueHandler formats each record in the caller before queueing it;
+    here message formatting, payload serialization and the write all happen on
+    the listener thread. Records are logged after the fact, so arguments and
+    payloads must not be mutated once logged.
+    """
+
+    def prepare(self, record: logging.LogRecord) -> logging.LogRecord:
+        return record
+
+    def enqueue(self, record: logging.LogRecord) -> None:
+        try:
+            self.queue.put_nowait(record)
+        except queue.Full:
+            LOG_RECORDS_DROPPED.inc()
+
+
+def configure_logging(level: str = None, log_format: str = None) -> None:
+    """Route the root logger through a bounded queue to a stdout handler on a background thread"""
+    global _listener
+    _stop_listener()
+
+    stream = logging.StreamHandler(sys.stdout)
+    stream.setFormatter(JsonFormatter() if (log_format or config.LOG_FORMAT) == "json" else TextFormatter())
+    handler = NonBlockingQueueHandler(queue.Queue(maxsize=config.LOG_QUEUE_SIZE))
+    handler.addFilter(RequestIdFilter())
+
+    root = logging.getLogger()
+    for existing in root.handlers[:]:
+        root.removeHandler(existing)
+    root.addHandler(handler)
+    root.setLevel((level or config.LOG_LEVEL).upper())
+
+    _listener = QueueListener(handler.queue, stream)
+    _listener.start()
+
+
+@atexit.register
+def _stop_listener() -> None:
+    """Flush queued records and stop the listener thread"""
+    global _listener
+    if _listener is not None:
+        _listener.stop()
+        _listener = None
+
+
+def log_payload(logger: logging.Logger, message: str, payload: Any) -> None:
+    """Log a (large) payload at DEBUG for a LOG_PAYLOAD_SAMPLE_RATE fraction of calls
+
+    The payload is serialized and truncated to LOG_PAYLOAD_MAX_CHARS on the
+    logging thread, and only when the record is actually emitted.
+    """
+    if not logger.isEnabledFor(logging.DEBUG) or random.random() >= config.LOG_PAYLOAD_SAMPLE_RATE:
+        return
+    logger.debug(message, extra={"payload": payload})
+
+
+def new_request_id(incoming: Optional[str] = None) -> str:
+    """Keep a well-formed incoming ID so calls can be traced across services, else make one"""
+    if incoming and VALID_REQUEST_ID.match(incoming):
+        return incoming
+    return uuid.uuid4().hex
+
+
+class RequestIdMiddleware:
+    """ASGI middleware that sets the correlation ID for each request and echoes it in X-Request-ID"""
+
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] not in ("http", "websocket"):
+            await self.app(scope, receive, send)
+            return
+
+        incoming = next((value.decode("latin-1") for name, value in scope["headers"] if name == REQUEST_ID_HEADER.encode()), None)
+        current = new_request_id(incoming)
+        token = request_id.set(current)
+
+        async def send_with_request_id(message):
+            if message["type"] == "http.response.start":
+                message = {**message, "headers": [*message.get("headers", []), (REQUEST_ID_HEADER.encode(), current.encode())]}
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_with_request_id)
+        finally:
+            request_id.reset(token)
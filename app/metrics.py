@@ -0,0 +1,305 @@
+# metrics.py
+import bisect
+import functools
+import math
+import threading
+import time
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import Any, AsyncIterator, Dict, Iterator, List, Optional, Sequence, Tuple
+
+from app import config
+
+# Latency buckets in seconds, from fast DB queries up to long LLM calls
+DEFAULT_BUCKETS = (0.001, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0, 60.0, 120.0)
+
+REGISTRY: List["Metric"] = []
+
+# Durations recorded while handling the current request, reported in its Server-Timing header
+_request_timing: ContextVar[Optional[Dict[str, float]]] = ContextVar("request_timing", default=None)
+
+
+# Token usage of the LLM calls made for the current extraction, see track_usage
+_request_usage: ContextVar[Optional[Dict[str, int]]] = ContextVar("request_usage", default=None)
+
+
+def record_timing(name: str, seconds: float) -> None:
+    """Add a duration to the current request's Server-Timing entry `name` (no-op outside a request)"""
+    timing = _request_timing.get()
+    if timing is not None:
+        timing[name] = timing.get(name, 0.0) + seconds
+
+
+@contextmanager
+def track_usage() -> Iterator[Dict[str, int]]:
+    """Sum the reported token usage of LLM calls made in the block, including tasks started in it
+
+    Streamed calls are included once their stream has been read to the end.
+    """
+    usage = {"prompt_tokens": 0, "cached_tokens": 0, "completion_tokens": 0}
+    token = _request_usage.set(usage)
+    try:
+        yield usage
+    finally:
+        _request_usage.reset(token)
+
+
+def _escape(value: Any) -> str:
+    return str(value).replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+
+def _format_labels(labelnames: Sequence[str], values: Sequence[str], extra: str = "") -> str:
+    pairs = [f'{name}="{_escape(value)}"' for name, value in zip(labelnames, values)]
+    if extra:
+        pairs.append(extra)
+    return "{" + ",".join(pairs) + "}" if pairs else ""
+
+
+def _format_value(value: float) -> str:
+    if math.isinf(value):
+        return "+Inf"
+    return repr(float(value)) if value != int(value) else str(int(value))
+
+
+class Metric:
+    """Base for metrics with a fixed set of label names, kept in-process and rendered on scrape"""
+
+    type = "untyped"
+
+    def __init__(self, name: str, documentation: str, labelnames: Sequence[str] = ()):
+        self.name = name
+        self.documentation = documentation
+        self.labelnames = tuple(labelnames)
+        self._lock = threading.Lock()
+        REGISTRY.append(self)
+
+    def _key(self, labels: Dict[str, Any]) -> Tuple[str, ...]:
+        return tuple(str(labels.get(name, "")) for name in self.labelnames)
+
+    def render(self) -> List[str]:
+        lines = [f"# HELP {self.name} {self.documentation}", f"# TYPE {self.name} {self.type}"]
+        return lines + self.samples()
+
+    def samples(self) -> List[str]:
+        raise NotImplementedError
+
+
+class Counter(Metric):
+    type = "counter"
+
+    def __init__(self, name: str, documentation: str, labelnames: Sequence[str] = ()):
+        super().__init__(name, documentation, labelnames)
+        self._values: Dict[Tuple[str, ...], float] = {}
+
+    def inc(self, amount: float = 1.0, **labels: Any) -> None:
+        key = self._key(labels)
+        with self._lock:
+            self._values[key] = self._values.get(key, 0.0) + amount
+
+    def samples(self) -> List[str]:
+        with self._lock:
+            values = list(self._values.items())
+        return [f"{self.name}{_format_labels(self.labelnames, key)} {_format_value(value)}" for key, value in values]
+
+
+class Histogram(Metric):
+    type = "histogram"
+
+    def __init__(self, name: str, documentation: str, labelnames: Sequence[str] = (), buckets: Sequence[float] = DEFAULT_BUCKETS):
+        super().__init__(name, documentation, labelnames)
+        self.buckets = tuple(sorted(buckets))
+        # Per label set: a count per bucket (plus +Inf), the sum and the count
+        self._values: Dict[Tuple[str, ...], list] = {}
+
+    def observe(self, value: float, **labels: Any) -> None:
+        key = self._key(labels)
+        index = bisect.bisect_left(self.buckets, value)
+        with self._lock:
+            state = self._values.get(key)
+            if state is None:
+                state = self._values[key] = [[0] * (len(self.buckets) + 1), 0.0, 0]
+            state[0][index] += 1
+            state[1] += value
+            state[2] += 1
+
+    def time(self, server_timing: Optional[str] = None, **labels: Any) -> "Timer":
+        """Time a block (`with`) or a coroutine function (decorator) into this histogram"""
+        return Timer(self, server_timing, labels)
+
+    def samples(self) -> List[str]:
+        with self._lock:
+            values = [(key, list(state[0]), state[1], state[2]) for key, state in self._values.items()]
+        lines = []
+        for key, counts, total, count in values:
+            cumulative = 0
+            for bound, bucket_count in zip(self.buckets + (math.inf,), counts):
+                cumulative += bucket_count
+                le = f'le="{_format_value(bound)}"'
+                lines.append(f"{self.name}_bucket{_format_labels(self.labelnames, key, le)} {cumulative}")
+            lines.append(f"{self.name}_sum{_format_labels(self.labelnames, key)} {_format_value(total)}")
+            lines.append(f"{self.name}_count{_format_labels(self.labelnames, key)} {count}")
+        return lines
+
+
+class Timer:
+    """Observes elapsed time into a histogram and, optionally, the request's Server-Timing"""
+
+    def __init__(self, histogram: Histogram, server_timing: Optional[str], labels: Dict[str, Any]):
+        self.histogram = histogram
+        self.server_timing = server_timing
+        self.labels = labels
+        self.start = 0.0
+
+    def __enter__(self) -> "Timer":
+        self.start = time.perf_counter()
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        elapsed = time.perf_counter() - self.start
+        self.histogram.observe(elapsed, **self.labels)
+        if self.server_timing:
+            record_timing(self.server_timing, elapsed)
+
+    def __call__(self, func):
+        @functools.wraps(func)
+        async def wrapper(*args, **kwargs):
+            with Timer(self.histogram, self.server_timing, self.labels):
+                return await func(*args, **kwargs)
+        return wrapper
+
+
+def render() -> str:
+    """Every registered metric in the Prometheus text exposition format"""
+    lines = []
+    for metric in REGISTRY:
+        lines.extend(metric.render())
+    return "\n".join(lines) + "\n"
+
+
+REQUEST_SECONDS = Histogram("http_request_duration_seconds", "HTTP request latency, to the end of the response body", ("method", "route", "status"))
+LLM_CALL_SECONDS = Histogram("llm_call_duration_seconds", "Latency of each extraction LLM call", ("call",))
+STREAM_FIRST_GOAL_SECONDS = Histogram("stream_first_goal_seconds", "Time from the start of /process/stream to its first goal event")
+SERIALIZATION_SECONDS = Histogram(
+    "serialization_duration_seconds",
+    "Time spent serializing extraction results",
+    ("kind",),
+    buckets=(0.00001, 0.0001, 0.0005, 0.001, 0.005, 0.01, 0.05, 0.1, 0.5),
+)
+DB_QUERY_SECONDS = Histogram("db_query_duration_seconds", "Database statement execution time", ("engine",))
+LLM_TOKENS = Counter("llm_tokens_total", "Tokens reported in LLM responses", ("model", "kind"))
+LLM_COST = Counter("llm_cost_usd_total", "Estimated LLM spend from reported tokens and LLM_PRICES", ("model",))
+ERRORS = Counter("errors_total", "Errors by type", ("type",))
+CACHE_REQUESTS = Counter("extraction_cache_requests_total", "Extraction cache lookups", ("result",))
+MODEL_ROUTES = Counter("model_routes_total", "Extraction model routing decisions", ("reason",))
+LLM_RETRIES = Counter("llm_retries_total", "LLM requests retried after a retryable error", ("model", "reason"))
+LLM_HEDGES = Counter("llm_hedged_requests_total", "Hedged duplicate LLM requests sent, and those that answered first", ("call", "result"))
+LLM_CIRCUIT_TRANSITIONS = Counter("llm_circuit_transitions_total", "LLM circuit breaker state changes", ("model", "state"))
+TRANSCRIPT_TOKENS = Counter("transcript_tokens_total", "Transcript tokens before and after preprocessing", ("stage",))
+LOG_RECORDS_DROPPED = Counter("log_records_dropped_total", "Log records dropped because the logging queue was full")
+
+
+def _price(model: str) -> Optional[Tuple[float, ...]]:
+    # Responses name dated snapshots ("gpt-4o-2024-08-06"); use the longest matching prefix
+    matches = [name for name in config.LLM_PRICES if model.startswith(name)]
+    return config.LLM_PRICES[max(matches, key=len)] if matches else None
+
+
+def record_completion(response: Any) -> None:
+    """instructor completion:response hook: count tokens and cost from the response's usage"""
+    usage = getattr(response, "usage", None)
+    if usage is None:
+        # Streamed responses report usage in their last chunk instead, see record_stream_usage
+        return
+    record_usage(getattr(response, "model", None) or config.EXTRACTION_MODEL, usage)
+
+
+async def record_stream_usage(chunks: AsyncIterator[Any]) -> AsyncIterator[Any]:
+    """Pass a streamed completion's chunks through, recording the usage its final chunk reports"""
+    async for chunk in chunks:
+        usage = getattr(chunk, "usage", None)
+        if usage is not None:
+            record_usage(getattr(chunk, "model", None) or config.EXTRACTION_MODEL, usage)
+        yield chunk
+
+
+def record_usage(model: str, usage: Any) -> None:
+    """Count a completion's tokens and cost, and add them to the current extraction's usage"""
+    prompt_tokens = usage.prompt_tokens or 0
+    completion_tokens = usage.completion_tokens or 0
+    # Prompt tokens served from the provider's prompt cache (a subset of prompt_tokens)
+    cached_tokens = getattr(getattr(usage, "prompt_tokens_details", None), "cached_tokens", None) or 0
+    LLM_TOKENS.inc(prompt_tokens, model=model, kind="prompt")
+    LLM_TOKENS.inc(cached_tokens, model=model, kind="cached")
+    LLM_TOKENS.inc(completion_tokens, model=model, kind="completion")
+    request_usage = _request_usage.get()
+    if request_usage is not None:
+        request_usage["prompt_tokens"] += prompt_tokens
+        request_usage["cached_tokens"] += cached_tokens
+        request_usage["completion_tokens"] += completion_tokens
+    price = _price(model)
+    if price is not None:
+        cached_price = price[2] if len(price) > 2 else price[0]
+        cost = (prompt_tokens - cached_tokens) * price[0] + cached_tokens * cached_price + completion_tokens * price[1]
+        LLM_COST.inc(cost / 1_000_000, model=model)
+
+
+def record_error(error: Exception) -> None:
+    """instructor completion:error and parse:error hook"""
+    ERRORS.inc(type=type(error).__name__)
+
+
+def instrument_engine(engine, name: str) -> None:
+    """Time every statement an engine executes into DB_QUERY_SECONDS and the request's `db` timing"""
+    from sqlalchemy import event
+
+    @event.listens_for(engine, "before_cursor_execute")
+    def before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+        conn.info.setdefault("query_start", []).append(time.perf_counter())
+
+    @event.listens_for(engine, "after_cursor_execute")
+    def after_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+        elapsed = time.perf_counter() - conn.info["query_start"].pop()
+        DB_QUERY_SECONDS.observe(elapsed, engine=name)
+        record_timing("db", elapsed)
+
+
+class MetricsMiddleware:
+    """ASGI middleware recording request latency, and adding a Server-Timing header when enabled
+
+    Latency is labelled with the route template rather than the raw path, so
+    path parameters don't create a new series per ID.
+    """
+
+    def __init__(self, app, server_timing: bool = None):
+        self.app = app
+        self.server_timing = config.SERVER_TIMING_ENABLED if server_timing is None else server_timing
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        start = time.perf_counter()
+        timing: Dict[str, float] = {}
+        token = _request_timing.set(timing)
+        status = 500
+
+        async def send_with_timing(message):
+            nonlocal status
+            if message["type"] == "http.response.start":
+                status = message["status"]
+                if self.server_timing:
+                    timing["total"] = time.perf_counter() - start
+                    header = ", ".join(f"{name};dur={seconds * 1000:.1f}" for name, seconds in timing.items())
+                    message = {**message, "headers": [*message.get("headers", []), (b"server-timing", header.encode())]}
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_with_timing)
+        except Exception as e:
+            ERRORS.inc(type=type(e).__name__)
+            raise
+        finally:
+            _request_timing.reset(token)
+            route = getattr(scope.get("route"), "path", None) or "unmatched"
+            REQUEST_SECONDS.observe(time.perf_counter() - start, method=scope["method"], route=route, status=status)
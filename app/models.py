@@ -1,5 +1,5 @@
 # models.py
-from sqlalchemy import Column, Integer, String, Text, DateTime, ForeignKey, Table, Enum, CheckConstraint, func
+from sqlalchemy import Column, Integer, String, Text, DateTime, ForeignKey, Table, Enum, CheckConstraint, Index, JSON, func
 from sqlalchemy.ext.declarative import declarative_base
 from sqlalchemy.orm import relationship
 import enum
@@ -14,15 +14,27 @@ goal_assignees = Table(
     Base.metadata,
     Column('goal_id', Integer, ForeignKey('goals.id', ondelete='CASCADE'), primary_key=True),
     Column('assignee_id', Integer, ForeignKey('assignees.id', ondelete='CASCADE'), primary_key=True),
-    Column('created_at', DateTime(timezone=True), default=lambda: datetime.now(pytz.utc))
+    Column('created_at', DateTime(timezone=True), default=lambda: datetime.now(pytz.utc)),
+    # Goals by assignee (the primary key only covers lookups by goal)
+    Index('ix_goal_assignees_assignee_id_goal_id', 'assignee_id', 'goal_id'),
 )
 
+# Define JobStatus enum for queued transcript processing jobs
+class JobStatus(str, enum.Enum):
+    queued = "queued"
+    running = "running"
+    succeeded = "succeeded"
+    failed = "failed"
+    cancelled = "cancelled"
+
 # Define PriorityLevel enum to match the database type
 class PriorityLevel(str, enum.Enum):
     high = "High"
     medium = "Medium"
     low = "Low"
 
+# meetings, goals and subtasks also have a generated search_vector column with a GIN
+# index, managed by app/search.py rather than mapped here
 class Meeting(Base):
     __tablename__ = 'meetings'
     
@@ -36,6 +48,11 @@ class Meeting(Base):
     # Relationships
     goals = relationship("Goal", back_populates="meeting", cascade="all, delete-orphan")
     
+    # Keyset pagination and date-range filters on (created_at, id)
+    __table_args__ = (
+        Index('ix_meetings_created_at_id', 'created_at', 'id'),
+    )
+    
     def __repr__(self):
         return f"<Meeting(id={self.id}, title='{self.title}')>"
 
@@ -64,6 +81,13 @@ class Goal(Base):
         backref="dependencies"
     )
     
+    # Keyset pagination on (created_at, id), alone and behind the meeting and priority filters
+    __table_args__ = (
+        Index('ix_goals_created_at_id', 'created_at', 'id'),
+        Index('ix_goals_meeting_id_created_at_id', 'meeting_id', 'created_at', 'id'),
+        Index('ix_goals_priority_created_at_id', 'priority', 'created_at', 'id'),
+    )
+    
     def __repr__(self):
         return f"<Goal(id={self.id}, name='{self.name}')>"
 
@@ -93,6 +117,11 @@ class Assignee(Base):
     # Relationships
     goals = relationship("Goal", secondary=goal_assignees, back_populates="assignees")
     
+    # Keyset pagination on (created_at, id)
+    __table_args__ = (
+        Index('ix_assignees_created_at_id', 'created_at', 'id'),
+    )
+    
     def __repr__(self):
         return f"<Assignee(id={self.id}, name='{self.name}')>"
 
@@ -107,4 +136,38 @@ class Dependency(Base):
     # Prevent a goal from depending on itself
     __table_args__ = (
         CheckConstraint('dependent_goal_id != dependency_goal_id', name='no_self_dependency'),
-    )
\ No newline at end of file
+    )
+
+# Cached extraction results keyed on a hash of the normalized transcript, model and prompt version
+class ExtractionCacheEntry(Base):
+    __tablename__ = 'extraction_cache'
+    
+    key = Column(String(64), primary_key=True)
+    model = Column(String(100), nullable=False)
+    prompt_version = Column(String(50), nullable=False)
+    payload = Column(JSON, nullable=False)
+    created_at = Column(DateTime(timezone=True), default=lambda: datetime.now(pytz.utc))
+    expires_at = Column(DateTime(timezone=True), nullable=True, index=True)
+    
+    def __repr__(self):
+        return f"<ExtractionCacheEntry(key='{self.key}', model='{self.model}')>"
+
+
+# Transcript processing jobs run by the background worker pool
+class Job(Base):
+    __tablename__ = 'jobs'
+    
+    id = Column(String(36), primary_key=True)
+    status = Column(Enum(JobStatus), default=JobStatus.queued, nullable=False, index=True)
+    transcript = Column(Text, nullable=False)
+    result = Column(JSON, nullable=True)
+    error = Column(Text, nullable=True)
+    created_at = Column(DateTime(timezone=True), default=lambda: datetime.now(pytz.utc))
+    started_at = Column(DateTime(timezone=True), nullable=True)
+    finished_at = Column(DateTime(timezone=True), nullable=True)
+    # The worker running the job, and until when its claim holds unless renewed
+    owner = Column(String(128), nullable=True)
+    lease_expires_at = Column(DateTime(timezone=True), nullable=True)
+    
+    def __repr__(self):
+        return f"<Job(id='{self.id}', status='{self.status}')>"
@@ -0,0 +1,144 @@
+# persistence.py
+import logging
+from datetime import datetime
+from typing import Any, Dict, List, Optional
+
+from sqlalchemy import insert as core_insert
+from sqlalchemy.dialects.postgresql import insert
+from sqlalchemy.orm import Session
+
+from app import models
+from app.assignees import assignee_resolver, normalize_name
+from app.graph import CycleError, DependencyGraph
+
+logger = logging.getLogger(__name__)
+
+
+def parse_meeting_date(value: Optional[str]) -> Optional[datetime]:
+    """Best-effort parse of the free-form date the LLM extracted"""
+    if not value:
+        return None
+    try:
+        return datetime.fromisoformat(value)
+    except ValueError:
+        pass
+    for date_format in ("%B %d, %Y", "%b %d, %Y", "%d %B %Y", "%m/%d/%Y", "%Y/%m/%d"):
+        try:
+            return datetime.strptime(value, date_format)
+        except ValueError:
+            continue
+    return None
+
+
+def save_extraction(db: Session, meeting: Dict[str, Any], goals: List[Dict[str, Any]]) -> Dict[str, Any]:
+    """Write a meeting with all of its goals, subtasks, assignees and dependencies in one transaction
+
+    Each table is written with a single bulk statement, so the number of round
+    trips doesn't grow with the number of goals. Returns the new meeting ID and
+    the mapping from the LLM's local goal IDs to database IDs.
+
+    Goals are matched to their rows by position, since the LLM may repeat a local
+    ID; a dependency on a repeated ID refers to the first goal that has it.
+    """
+    with db.begin():
+        meeting_id = db.execute(
+            insert(models.Meeting)
+            .values(title=meeting["title"], date=parse_meeting_date(meeting.get("date")), summary=meeting.get("summary"))
+            .returning(models.Meeting.id)
+        ).scalar_one()
+
+        db_ids: List[int] = []
+        if goals:
+            # insertmanyvalues batches the rows and returns IDs in parameter order
+            rows = db.execute(
+                insert(models.Goal).returning(models.Goal.id, sort_by_parameter_order=True),
+                [
+                    {
+                        "meeting_id": meeting_id,
+                        "name": goal["name"],
+                        "description": goal.get("description"),
+                        "priority": models.PriorityLevel(getattr(goal["priority"], "value", goal["priority"])),
+                    }
+                    for goal in goals
+                ],
+            ).scalars().all()
+            db_ids = list(rows)
+        goal_ids: Dict[int, int] = {}
+        for goal, db_id in zip(goals, db_ids):
+            if goal["id"] in goal_ids:
+                logger.warning("Extracted goal ID %s is repeated; dependencies on it refer to its first goal", goal["id"])
+                continue
+            goal_ids[goal["id"]] = db_id
+
+        subtasks = [
+            {"goal_id": db_id, "name": subtask["name"]}
+            for goal, db_id in zip(goals, db_ids)
+            for subtask in goal.get("subtasks") or []
+        ]
+        if subtasks:
+            db.execute(core_insert(models.Subtask), subtasks)
+
+        # Match names to existing people first ("Sam K." and "sam kim" are one assignee)
+        names = sorted({name for goal in goals for name in goal.get("assignees") or []})
+        assignee_ids = assignee_resolver.resolve(db, names) if names else {}
+
+        # Upsert the rest at once, one row per normalized name; DO UPDATE makes RETURNING include existing rows
+        new_names: Dict[str, List[str]] = {}
+        for name in names:
+            if name not in assignee_ids and normalize_name(name):
+                new_names.setdefault(normalize_name(name), []).append(name)
+        created = []
+        if new_names:
+            statement = insert(models.Assignee).values([{"name": spellings[0]} for spellings in new_names.values()])
+            statement = statement.on_conflict_do_update(
+                index_elements=[models.Assignee.name],
+                set_={"name": statement.excluded.name},
+            ).returning(models.Assignee.id, models.Assignee.name)
+            created = db.execute(statement).all()
+            for assignee_id, name in created:
+                for spelling in new_names[normalize_name(name)]:
+                    assignee_ids[spelling] = assignee_id
+
+        # Two spellings of one person on the same goal become a single row
+        goal_assignees = [
+            {"goal_id": goal_id, "assignee_id": assignee_id}
+            for goal, db_id in zip(goals, db_ids)
+            for goal_id, assignee_id in dict.fromkeys(
+                (db_id, assignee_ids[name]) for name in goal.get("assignees") or [] if name in assignee_ids
+            )
+        ]
+        if goal_assignees:
+            db.execute(core_insert(models.goal_assignees), goal_assignees)
+
+        # Remap the LLM's local dependency IDs; drop unknown goals and any edge that would close a cycle
+        graph = DependencyGraph(db_ids)
+        dependencies = set()
+        for goal, db_id in zip(goals, db_ids):
+            for dependency_id in goal.get("dependencies") or []:
+                if dependency_id not in goal_ids:
+                    continue
+                edge = (db_id, goal_ids[dependency_id])
+                try:
+                    graph.add_dependency(*edge)
+                except CycleError as e:
+                    logger.warning("Dropping extracted dependency: %s", e)
+                    continue
+                dependencies.add(edge)
+        if dependencies:
+            db.execute(
+                core_insert(models.Dependency),
+                [{"dependent_goal_id": dependent, "dependency_goal_id": dependency} for dependent, dependency in sorted(dependencies)],
+            )
+
+    # Only index new assignees once their rows are committed
+    assignee_resolver.remember(created)
+    logger.info("Saved meeting %s with %s goals, %s subtasks and %s dependencies", meeting_id, len(db_ids), len(subtasks), len(dependencies))
+    return {"meeting_id": meeting_id, "goal_ids": goal_ids}
+
+
+def save_extraction_sync(meeting: Dict[str, Any], goals: List[Dict[str, Any]]) -> Dict[str, Any]:
+    """Save an extraction with its own session (blocking; call through asyncio.to_thread)"""
+    from app.database import SessionLocal
+
+    with SessionLocal() as db:
+        return save_extraction(db, meeting, goals)
@@ -0,0 +1,204 @@
+# preprocess.py
+import functools
+import logging
+import re
+from collections import Counter
+from dataclasses import dataclass, field
+from typing import Callable, Dict, List, Optional, Tuple
+
+from app import config
+from app.chunking import estimate_tokens
+
+logger = logging.getLogger(__name__)
+
+# Caption timing lines, and timestamps before or around a speaker label
+# ("[00:01:02]", "(01:02)", "00:01:02.500", "12:03 -")
+TIMING_LINE = re.compile(r"^\s*(?:\d{1,2}:)?\d{1,2}:\d{2}(?:[.,]\d{1,3})?\s*-->.*$", re.MULTILINE)
+TIMESTAMP = re.compile(r"[\[(]?\b(?:(\d{1,2}):)?(\d{1,2}):(\d{2})(?:[.,]\d{1,3})?\b[\])]?\s*(?:-\s+)?")
+BRACKETED_TIMESTAMP = re.compile(r"[\[(](?:\d{1,2}:)?\d{1,2}:\d{2}(?:[.,]\d{1,3})?[\])]\s*(?:-\s+)?")
+# Bracketed times are always markup; a bare one ("10:30 works for me") may be speech,
+# so it is only stripped in caption files or before a speaker label
+LEADING_TIMESTAMP = re.compile(rf"^\s*(?:{BRACKETED_TIMESTAMP.pattern})+")
+LEADING_BARE_TIMESTAMP = re.compile(rf"^\s*(?:{TIMESTAMP.pattern})+")
+CAPTION_HEADER = re.compile(r"^\s*(?:WEBVTT.*|\d+)\s*$")
+SPEAKER_LINE = re.compile(r"^\s*([A-Za-z][\w .'\-]{0,40}?)\s*(?:\([^)]*\))?:\s+(.*)$")
+
+# Verbal fillers that carry no content; "you know" and "I mean" only when set off by commas,
+# and "mm" only as an interjection before a comma or the end of the line, never after a number ("5 mm")
+FILLERS = re.compile(
+    r"(?:(?<=\s)|^)(?:(?:u+m+|u+h+|e+r+m+|hm+|ah+)\b|(?<!\d\s)mm+\b(?=,|[.!?]?\s*$))[,.]?\s*"
+    r"|,\s*(?:you know|I mean)\s*(?=[,.])",
+    re.IGNORECASE,
+)
+SPACE_BEFORE_PUNCTUATION = re.compile(r"\s+([,.!?])")
+REPEATED_PUNCTUATION = re.compile(r"([,.])(?:\s*[,.])+")
+
+# A speaker's lines this far back are checked for duplicates (caption repeats); a line of
+# at least DUPLICATE_MIN_CHARS also counts as one when an earlier line by them contains it.
+# The same words from someone else ("Yes.", an answer echoing the question) are kept
+DUPLICATE_WINDOW = 3
+DUPLICATE_MIN_CHARS = 20
+
+
+@functools.lru_cache(maxsize=None)
+def get_token_counter(model: str = None) -> Callable[[str], int]:
+    """Token counter for the model's tokenizer, or the character estimate when tiktoken is unavailable
+
+    tiktoken downloads the encoding the first time it is used, so call this at
+    startup rather than on the first request.
+    """
+    model = model or config.EXTRACTION_MODEL
+    try:
+        import tiktoken
+
+        try:
+            encoding = tiktoken.encoding_for_model(model)
+        except KeyError:
+            encoding = tiktoken.get_encoding("o200k_base")
+        encode = encoding.encode_ordinary
+        return lambda text: len(encode(text))
+    except Exception as e:
+        logger.warning("Falling back to estimated token counts (%s: %s)", type(e).__name__, e)
+        return estimate_tokens
+
+
+@dataclass
+class PreparedTranscript:
+    """A transcript compacted for the prompt, with the speaker legend and token counts"""
+
+    text: str
+    aliases: Dict[str, str] = field(default_factory=dict)  # alias (@S1, @S2, ...) -> full name
+    original_tokens: int = 0
+    tokens: int = 0
+    speakers: int = 0
+
+    @property
+    def legend(self) -> str:
+        if not self.aliases:
+            return ""
+        names = "; ".join(f"{alias} = {name}" for alias, name in self.aliases.items())
+        return f"Speakers: {names}. Use their full names in your answer."
+
+    def prompt(self, text: Optional[str] = None) -> str:
+        """The transcript (or one chunk of it) as sent to the model, headed by the speaker legend"""
+        text = self.text if text is None else text
+        return f"{self.legend}\n\n{text}" if self.legend else text
+
+    def restore_names(self, text: str) -> str:
+        """Replace any speaker aliases the model echoed back in free text with the full names"""
+        if not self.aliases or not text:
+            return text
+        return _alias_pattern(tuple(self.aliases)).sub(lambda match: self.aliases[match.group(0)], text)
+
+    def restore_name(self, value: str) -> str:
+        """The full name for a value that is exactly an alias (an assignee), with or without its @"""
+        if not self.aliases or not value:
+            return value
+        alias = value.strip()
+        return self.aliases.get(alias) or self.aliases.get(f"@{alias}") or value
+
+    def stats(self) -> Dict[str, int]:
+        return {
+            "original_tokens": self.original_tokens,
+            "tokens": self.tokens,
+            "saved_tokens": self.original_tokens - self.tokens,
+        }
+
+
+@functools.lru_cache(maxsize=64)
+def _alias_pattern(aliases: tuple) -> re.Pattern:
+    # Aliases start with "@", which doesn't occur in speech, so "S3" or "@S10" are never rewritten
+    return re.compile(r"(?<![\w@])(?:" + "|".join(map(re.escape, aliases)) + r")\b")
+
+
+def _clean_text(text: str) -> str:
+    text = FILLERS.sub("", text)
+    text = SPACE_BEFORE_PUNCTUATION.sub(r"\1", text)
+    text = REPEATED_PUNCTUATION.sub(r"\1", text)
+    text = " ".join(text.split()).strip(" ,")
+    return text[:1].upper() + text[1:] if text else text
+
+
+def _duplicate_key(text: str) -> str:
+    return " ".join(re.sub(r"[^\w\s]", "", text.casefold()).split())
+
+
+def prepare_transcript(transcript: str, count_tokens: Callable[[str], int] = None) -> PreparedTranscript:
+    """Compact a transcript for extraction
+
+    Drops caption headers and timing lines, strips (or with PREPROCESS_TIMESTAMPS=compact,
+    shortens to m:ss) timestamps, removes verbal fillers and lines a speaker repeats
+    within the last few lines, folds consecutive lines by one speaker into a single
+    turn, and replaces long speaker names with short aliases (@S1, @S2, ...) explained
+    in a legend.
+    Blocking for long transcripts; call through asyncio.to_thread.
+    """
+    count_tokens = count_tokens or get_token_counter()
+    if not config.PREPROCESS_ENABLED:
+        tokens = count_tokens(transcript)
+        return PreparedTranscript(text=transcript, original_tokens=tokens, tokens=tokens)
+
+    captions = bool(TIMING_LINE.search(transcript))
+    turns: List[List[str]] = []  # [speaker, text]
+    recent: List[Tuple[Optional[str], str]] = []  # (speaker, duplicate key)
+    current_speaker: Optional[str] = None
+    for line in transcript.splitlines():
+        if not line.strip() or CAPTION_HEADER.match(line) or TIMING_LINE.match(line):
+            continue
+        match = LEADING_TIMESTAMP.match(line)
+        if not match:
+            bare = LEADING_BARE_TIMESTAMP.match(line)
+            if bare and (captions or SPEAKER_LINE.match(line[bare.end():])):
+                match = bare
+        marker = ""
+        if match:
+            if config.PREPROCESS_TIMESTAMPS == "compact":
+                stamp = TIMESTAMP.match(match.group(0).strip())
+                hours, minutes, seconds = stamp.group(1), stamp.group(2), stamp.group(3)
+                marker = f"[{int(hours or 0) * 60 + int(minutes)}:{seconds}] "
+            line = line[match.end():]
+
+        speaker_match = SPEAKER_LINE.match(line)
+        speaker, text = (speaker_match.group(1).strip(), speaker_match.group(2)) if speaker_match else (None, line)
+        # Unlabelled lines (caption continuations) belong to the last labelled speaker
+        if speaker is not None:
+            current_speaker = speaker
+        text = _clean_text(text)
+        if not text:
+            continue
+        key = _duplicate_key(text)
+        earlier = [earlier_key for earlier_speaker, earlier_key in recent if earlier_speaker == current_speaker]
+        if key and (key in earlier or (len(key) >= DUPLICATE_MIN_CHARS and any(key in line for line in earlier))):
+            continue
+        recent = (recent + [(current_speaker, key)])[-DUPLICATE_WINDOW:]
+
+        text = marker + text
+        if turns and speaker is not None and turns[-1][0] == speaker:
+            turns[-1][1] += f" {text}"
+        elif turns and speaker is None and turns[-1][0] is None:
+            turns[-1][1] += f"\n{text}"
+        else:
+            turns.append([speaker, text])
+
+    # Alias a speaker when the tokens saved over their turns outweigh their legend entry
+    turn_counts = Counter(speaker for speaker, _ in turns if speaker is not None)
+    aliases: Dict[str, str] = {}
+    labels: Dict[str, str] = {}
+    for speaker, count in turn_counts.items():
+        alias = f"@S{len(aliases) + 1}"
+        saved = count * (count_tokens(speaker) - count_tokens(alias))
+        if saved > count_tokens(f"{alias} = {speaker}; "):
+            aliases[alias] = speaker
+            labels[speaker] = alias
+
+    def render(labels: Dict[str, str]) -> str:
+        return "\n".join(f"{labels.get(speaker, speaker)}: {line}" if speaker is not None else line for speaker, line in turns)
+
+    text = render(labels)
+    if aliases and count_tokens(PreparedTranscript(text=text, aliases=aliases).prompt()) >= count_tokens(render({})):
+        # The legend's fixed wording costs more than the aliases save
+        aliases, text = {}, render({})
+
+    prepared = PreparedTranscript(text=text, aliases=aliases, original_tokens=count_tokens(transcript), speakers=len(turn_counts))
+    prepared.tokens = count_tokens(prepared.prompt())
+    return prepared
@@ -0,0 +1,56 @@
+# prompts.py
+from typing import Dict, List
+
+# Each call's instructions are a fixed system message and the transcript is the whole
+# user message. The request prefix (tool schema and instructions) is then identical for
+# every call of a kind, which the provider's prompt caching reuses across requests.
+# Change PROMPT_VERSION in config.py whenever these change.
+
+_TRANSCRIPT_NOTES = (
+    "The user message is the meeting transcript, one speaker turn per line as \"Speaker: text\". "
+    "It may start with a \"Speakers:\" legend mapping short aliases (@S1, @S2, ...) to full names; "
+    "always refer to people by their full names. Timestamps, when present, appear as [m:ss]."
+)
+
+MEETING_INSTRUCTIONS = (
+    "You extract structured meeting information from meeting transcripts. "
+    "Give the meeting a short, specific title describing its purpose, the meeting date if it is "
+    "mentioned, and a brief summary of what was discussed and decided. "
+    + _TRANSCRIPT_NOTES
+)
+
+GOALS_INSTRUCTIONS = (
+    "You extract action items from meeting transcripts. "
+    "Create a goal for every action item or commitment made in the meeting, with a short name, "
+    "a description, a priority, the people assigned to it, its subtasks, and the IDs of the goals "
+    "it depends on. Number goals from 1 in the order they come up. "
+    + _TRANSCRIPT_NOTES
+)
+
+MEETING_AND_GOALS_INSTRUCTIONS = (
+    "You extract structured meeting information and action items from meeting transcripts. "
+    "Give the meeting a short, specific title, the meeting date if it is mentioned, and a brief summary. "
+    "Create a goal for every action item or commitment made in the meeting, with a short name, "
+    "a description, a priority, the people assigned to it, its subtasks, and the IDs of the goals "
+    "it depends on. Number goals from 1 in the order they come up. "
+    + _TRANSCRIPT_NOTES
+)
+
+LIVE_GOALS_INSTRUCTIONS = (
+    "You extract action items from the latest part of a meeting that is still going on. "
+    "The user message starts with the goals found earlier in the meeting, with their IDs, followed by "
+    "the ID to number new goals from, and then the latest part of the transcript. "
+    "Create a goal for every new action item or commitment in the transcript, with a short name, "
+    "a description, a priority, the people assigned to it, its subtasks, and the IDs of the goals it "
+    "depends on, which may be earlier goals. If the transcript adds to an earlier goal, repeat that goal "
+    "with its ID and the new details. Leave out earlier goals the transcript doesn't mention. "
+    + _TRANSCRIPT_NOTES
+)
+
+
+def messages(instructions: str, transcript: str) -> List[Dict[str, str]]:
+    """Chat messages for an extraction call: the static instructions, then the transcript"""
+    return [
+        {"role": "system", "content": instructions},
+        {"role": "user", "content": transcript},
+    ]
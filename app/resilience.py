@@ -0,0 +1,316 @@
+# resilience.py
+import asyncio
+import logging
+import math
+import random
+import time
+from collections import deque
+from typing import Any, Awaitable, Callable, Deque, Dict, Optional
+
+from fastapi import HTTPException
+
+from app import config
+from app.metrics import LLM_CIRCUIT_TRANSITIONS, LLM_HEDGES, LLM_RETRIES
+
+logger = logging.getLogger(__name__)
+
+# HTTP statuses worth retrying (the same set the OpenAI SDK retries itself)
+RETRYABLE_STATUSES = {408, 409, 429}
+
+
+def upstream_error(error: BaseException) -> BaseException:
+    """The OpenAI error behind `error`, unwrapping instructor's retry exception"""
+    import openai
+
+    seen = set()
+    current: Optional[BaseException] = error
+    while current is not None and id(current) not in seen:
+        seen.add(id(current))
+        if isinstance(current, (openai.APIError, TimeoutError)):
+            return current
+        # InstructorRetryException carries the last attempt's error as its first argument
+        current = next((arg for arg in current.args if isinstance(arg, BaseException)), None) or current.__cause__
+    return error
+
+
+def classify(error: BaseException) -> Optional[str]:
+    """Why `error` is worth retrying ("timeout", "connection", "rate_limit", "server"), or None"""
+    import openai
+
+    error = upstream_error(error)
+    if isinstance(error, (TimeoutError, openai.APITimeoutError)):
+        return "timeout"
+    if isinstance(error, openai.APIConnectionError):
+        return "connection"
+    if isinstance(error, openai.APIStatusError):
+        if error.status_code == 429:
+            return "rate_limit"
+        if error.status_code >= 500 or error.status_code in RETRYABLE_STATUSES:
+            return "server"
+    return None
+
+
+def _discard_outcome(task: asyncio.Task) -> None:
+    if not task.cancelled():
+        task.exception()
+
+
+class CircuitBreaker:
+    """Fails calls to one model fast once it keeps failing
+
+    Opens after `threshold` consecutive upstream failures (timeouts, connection
+    errors and 5xx, not rate limits or bad requests). After `reset_timeout`
+    seconds it lets a single probe call through (half-open): success closes it,
+    failure opens it again.
+    """
+
+    def __init__(self, model: str, threshold: int, reset_timeout: float):
+        self.model = model
+        self.threshold = threshold
+        self.reset_timeout = reset_timeout
+        self.state = "closed"
+        self.failures = 0
+        self.opened_at = 0.0
+        self._probing = False
+
+    def before_call(self) -> None:
+        """Raise a 503 if the circuit is open (or half-open with its probe already running)"""
+        if self.state == "open" and time.monotonic() - self.opened_at >= self.reset_timeout:
+            self._transition("half_open")
+        if self.state == "closed":
+            return
+        if self.state == "half_open" and not self._probing:
+            self._probing = True
+            return
+        retry_after = max(1, math.ceil(self.opened_at + self.reset_timeout - time.monotonic()))
+        raise HTTPException(
+            status_code=503,
+            detail=f"LLM provider is failing for {self.model}; not calling it for now",
+            headers={"Retry-After": str(retry_after)},
+        )
+
+    def record_success(self) -> None:
+        self.failures = 0
+        self._probing = False
+        if self.state != "closed":
+            self._transition("closed")
+
+    def record_failure(self) -> None:
+        self.failures += 1
+        self._probing = False
+        if self.state == "half_open" or (self.state == "closed" and self.failures >= self.threshold):
+            self.opened_at = time.monotonic()
+            self._transition("open")
+
+    def release(self) -> None:
+        """End a call that neither succeeded nor failed upstream (e.g. a bad request or a cancellation)"""
+        self._probing = False
+
+    def _transition(self, state: str) -> None:
+        self.state = state
+        LLM_CIRCUIT_TRANSITIONS.inc(model=self.model, state=state)
+        if state == "open":
+            logger.warning("LLM circuit for %s opened after %s consecutive failures", self.model, self.failures)
+        else:
+            logger.info("LLM circuit for %s is %s", self.model, state.replace('_', '-'))
+
+    def stats(self) -> Dict[str, Any]:
+        return {"state": self.state, "consecutive_failures": self.failures}
+
+
+class LatencyWindow:
+    """Recent successful latencies of one kind of call, for the hedging delay"""
+
+    def __init__(self, size: int):
+        self.samples: Deque[float] = deque(maxlen=size)
+
+    def add(self, seconds: float) -> None:
+        self.samples.append(seconds)
+
+    def percentile(self, pct: float) -> Optional[float]:
+        if not self.samples:
+            return None
+        ordered = sorted(self.samples)
+        return ordered[min(len(ordered) - 1, math.ceil(pct / 100 * len(ordered)) - 1)]
+
+
+class LLMResilience:
+    """Deadlines, retries, hedging and circuit breaking for LLM calls
+
+    Each attempt gets `attempt_timeout` seconds and the call as a whole
+    `deadline`. Retryable errors are retried up to `max_retries` times after a
+    full-jitter exponential backoff, so callers that failed together don't
+    retry together. With hedging, an attempt still running after the p95 of
+    recent calls of its kind is sent once more and the first answer wins; the
+    other is cancelled. Streamed calls count as answered once their first item
+    arrives. Circuits are per model.
+    """
+
+    def __init__(
+        self,
+        attempt_timeout: float = None,
+        deadline: float = None,
+        max_retries: int = None,
+        base_delay: float = None,
+        max_delay: float = None,
+        hedge: bool = None,
+        hedge_min_delay: float = None,
+        hedge_min_samples: int = None,
+        breaker_failures: int = None,
+        breaker_reset: float = None,
+    ):
+        self.attempt_timeout = attempt_timeout or config.LLM_ATTEMPT_TIMEOUT
+        self.deadline = deadline or config.LLM_DEADLINE
+        self.max_retries = max_retries if max_retries is not None else config.LLM_MAX_RETRIES
+        self.base_delay = base_delay if base_delay is not None else config.LLM_RETRY_BASE_DELAY
+        self.max_delay = max_delay if max_delay is not None else config.LLM_RETRY_MAX_DELAY
+        self.hedge = config.LLM_HEDGE_ENABLED if hedge is None else hedge
+        self.hedge_min_delay = hedge_min_delay if hedge_min_delay is not None else config.LLM_HEDGE_MIN_DELAY
+        self.hedge_min_samples = hedge_min_samples if hedge_min_samples is not None else config.LLM_HEDGE_MIN_SAMPLES
+        self.breaker_failures = breaker_failures or config.LLM_BREAKER_FAILURES
+        self.breaker_reset = breaker_reset if breaker_reset is not None else config.LLM_BREAKER_RESET
+        self.breakers: Dict[str, CircuitBreaker] = {}
+        self.latencies: Dict[str, LatencyWindow] = {}
+        self.counters = {"calls": 0, "retries": 0, "hedges": 0, "hedges_won": 0, "timeouts": 0, "failed": 0, "rejected": 0}
+
+    def breaker(self, model: str) -> CircuitBreaker:
+        if model not in self.breakers:
+            self.breakers[model] = CircuitBreaker(model, self.breaker_failures, self.breaker_reset)
+        return self.breakers[model]
+
+    def hedge_delay(self, key: str) -> Optional[float]:
+        """Seconds to wait before hedging a call of kind `key`, or None while too few calls are known"""
+        window = self.latencies.get(key)
+        if not self.hedge or window is None or len(window.samples) < self.hedge_min_samples:
+            return None
+        return max(self.hedge_min_delay, window.percentile(95))
+
+    def backoff(self, retry: int) -> float:
+        """Full jitter: a uniform delay up to the capped exponential backoff for this retry"""
+        return random.uniform(0, min(self.max_delay, self.base_delay * 2 ** retry))
+
+    async def call(
+        self,
+        send: Callable[[], Awaitable[Any]],
+        model: str,
+        key: str,
+        admit: Optional[Callable[[], Awaitable[None]]] = None,
+    ) -> Any:
+        """Run `send` (one LLM request) under the policy; `admit` waits for rate-limit budget before each request"""
+        self.counters["calls"] += 1
+        breaker = self.breaker(model)
+        deadline = time.monotonic() + self.deadline
+        retry = 0
+        while True:
+            try:
+                breaker.before_call()
+            except HTTPException:
+                self.counters["rejected"] += 1
+                raise
+            reason = None
+            try:
+                if admit is not None:
+                    await admit()
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    self.counters["failed"] += 1
+                    raise HTTPException(status_code=504, detail=f"LLM call deadline of {self.deadline:.0f}s exceeded")
+                async with asyncio.timeout(min(self.attempt_timeout, remaining)):
+                    result = await self._hedged(send, key, admit)
+                breaker.record_success()
+                return result
+            except HTTPException:
+                # Scheduler rejections are local and final
+                breaker.release()
+                raise
+            except Exception as e:
+                reason = classify(e)
+                if reason is None:
+                    breaker.release()
+                    raise
+                if reason == "rate_limit":
+                    # Quota, not an outage; the scheduler holds admissions until it resets
+                    breaker.release()
+                else:
+                    breaker.record_failure()
+                if reason == "timeout":
+                    self.counters["timeouts"] += 1
+                delay = self.backoff(retry)
+                if retry >= self.max_retries or time.monotonic() + delay >= deadline:
+                    self.counters["failed"] += 1
+                    raise self._give_up(e, reason, model, retry + 1) from e
+            except BaseException:
+                breaker.release()
+                raise
+            retry += 1
+            self.counters["retries"] += 1
+            LLM_RETRIES.inc(model=model, reason=reason)
+            logger.info("Retrying %s call in %.2fs after %s (retry %s)", model, delay, reason, retry)
+            await asyncio.sleep(delay)
+
+    async def _hedged(self, send: Callable[[], Awaitable[Any]], key: str, admit: Optional[Callable[[], Awaitable[None]]]) -> Any:
+        """One attempt: `send`, plus a second copy if the first is slower than the hedging delay"""
+        window = self.latencies.setdefault(key, LatencyWindow(config.LLM_LATENCY_WINDOW))
+
+        async def timed(hedge: bool) -> Any:
+            if hedge and admit is not None:
+                await admit()
+            start = time.monotonic()
+            result = await send()
+            window.add(time.monotonic() - start)
+            return result
+
+        delay = self.hedge_delay(key)
+        if delay is None:
+            return await timed(False)
+
+        primary = asyncio.ensure_future(timed(False))
+        hedge = None
+        try:
+            done, _ = await asyncio.wait({primary}, timeout=delay)
+            if done:
+                return primary.result()
+            self.counters["hedges"] += 1
+            LLM_HEDGES.inc(call=key, result="sent")
+            hedge = asyncio.ensure_future(timed(True))
+            pending = {primary, hedge}
+            error = None
+            while pending:
+                done, pending = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+                # Check every finished task, so no failure goes unretrieved
+                winner = None
+                for task in done:
+                    if task.exception() is None:
+                        winner = winner or task
+                    elif error is None or task is primary:
+                        error = task.exception()
+                if winner is not None:
+                    if winner is hedge:
+                        self.counters["hedges_won"] += 1
+                        LLM_HEDGES.inc(call=key, result="won")
+                    return winner.result()
+            raise error
+        finally:
+            for task in (primary, hedge):
+                if task is not None and not task.done():
+                    task.cancel()
+                    # The loser may still end in an error rather than a cancellation; nobody waits for it
+                    task.add_done_callback(_discard_outcome)
+
+    def _give_up(self, error: Exception, reason: str, model: str, attempts: int) -> HTTPException:
+        """The error returned once a call's retries or deadline are used up"""
+        logger.warning("LLM call to %s failed after %s attempts (%s): %s", model, attempts, reason, error)
+        if reason == "timeout":
+            return HTTPException(status_code=504, detail=f"LLM provider timed out after {attempts} attempts")
+        if reason == "rate_limit":
+            return HTTPException(status_code=429, detail="LLM provider rate limit exceeded", headers={"Retry-After": "30"})
+        return HTTPException(status_code=502, detail=f"LLM provider error after {attempts} attempts: {str(upstream_error(error))}")
+
+    def stats(self) -> Dict[str, Any]:
+        """Counters, circuit states and hedging delays for monitoring"""
+        delays = {key: self.hedge_delay(key) for key in self.latencies}
+        return {
+            **self.counters,
+            "circuits": {model: breaker.stats() for model, breaker in self.breakers.items()},
+            "hedge_delays_ms": {key: round(delay * 1000) for key, delay in delays.items() if delay is not None},
+        }
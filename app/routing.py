@@ -0,0 +1,58 @@
+# routing.py
+from dataclasses import asdict, dataclass
+from typing import Dict
+
+from app import config
+from app.metrics import MODEL_ROUTES
+from app.preprocess import PreparedTranscript
+
+
+@dataclass(frozen=True)
+class ModelRoute:
+    """Models chosen for one transcript's extraction calls, and the rule that chose them"""
+
+    meeting: str
+    goals: str
+    reason: str
+
+    def to_dict(self) -> Dict[str, str]:
+        return asdict(self)
+
+
+def route_models(prepared: PreparedTranscript, record: bool = True) -> ModelRoute:
+    """Pick the models for a prepared transcript's extraction calls
+
+    Meeting title and summary extraction always uses MEETING_MODEL. Goals (and
+    single-pass extraction) use ROUTING_SMALL_MODEL for short transcripts with
+    few speakers, escalate to ROUTING_LONG_MODEL past ROUTING_LONG_TOKENS, and
+    use EXTRACTION_MODEL otherwise. Decisions are counted in MODEL_ROUTES
+    unless `record` is false (e.g. when describing a cached extraction).
+    """
+    if not config.ROUTING_ENABLED:
+        route = ModelRoute(config.EXTRACTION_MODEL, config.EXTRACTION_MODEL, "disabled")
+    elif prepared.tokens > config.ROUTING_LONG_TOKENS:
+        route = ModelRoute(config.MEETING_MODEL, config.ROUTING_LONG_MODEL, "long")
+    elif prepared.speakers > config.ROUTING_MAX_SPEAKERS:
+        route = ModelRoute(config.MEETING_MODEL, config.EXTRACTION_MODEL, "complex")
+    elif prepared.tokens <= config.ROUTING_SHORT_TOKENS:
+        route = ModelRoute(config.MEETING_MODEL, config.ROUTING_SMALL_MODEL, "short")
+    else:
+        route = ModelRoute(config.MEETING_MODEL, config.EXTRACTION_MODEL, "default")
+    if record:
+        MODEL_ROUTES.inc(reason=route.reason)
+    return route
+
+
+def policy_key() -> str:
+    """The routing settings, for cache keys: changing them changes which model answers"""
+    if not config.ROUTING_ENABLED:
+        return config.EXTRACTION_MODEL
+    return "|".join(str(setting) for setting in (
+        config.EXTRACTION_MODEL,
+        config.MEETING_MODEL,
+        config.ROUTING_SMALL_MODEL,
+        config.ROUTING_LONG_MODEL,
+        config.ROUTING_SHORT_TOKENS,
+        config.ROUTING_LONG_TOKENS,
+        config.ROUTING_MAX_SPEAKERS,
+    ))
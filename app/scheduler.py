@@ -0,0 +1,182 @@
+# scheduler.py
+import asyncio
+import logging
+import math
+import re
+import time
+from typing import TYPE_CHECKING, Any, Dict, Iterable, Optional
+
+from fastapi import HTTPException
+
+from app import config
+from app.chunking import estimate_tokens
+
+if TYPE_CHECKING:
+    import httpx
+
+logger = logging.getLogger(__name__)
+
+DURATION_PATTERN = re.compile(r"(\d+(?:\.\d+)?)(ms|s|m|h)")
+DURATION_UNITS = {"ms": 0.001, "s": 1, "m": 60, "h": 3600}
+
+
+def parse_reset(value: Optional[str]) -> Optional[float]:
+    """Parse an OpenAI rate-limit reset duration such as "20ms", "1s" or "6m0s" into seconds"""
+    if not value:
+        return None
+    matches = DURATION_PATTERN.findall(value)
+    if not matches:
+        try:
+            return float(value)
+        except ValueError:
+            return None
+    return sum(float(amount) * DURATION_UNITS[unit] for amount, unit in matches)
+
+
+class TokenBucket:
+    """Token bucket refilled continuously at `capacity` per minute"""
+
+    def __init__(self, capacity: float):
+        self.capacity = capacity
+        self.tokens = capacity
+        self.updated = time.monotonic()
+
+    @property
+    def rate(self) -> float:
+        return self.capacity / 60
+
+    def refill(self) -> None:
+        now = time.monotonic()
+        self.tokens = min(self.capacity, self.tokens + (now - self.updated) * self.rate)
+        self.updated = now
+
+    def wait_time(self, amount: float) -> float:
+        """Seconds until `amount` tokens are available"""
+        self.refill()
+        # Requests larger than the bucket only wait for a full bucket
+        amount = min(amount, self.capacity)
+        if self.tokens >= amount:
+            return 0.0
+        return (amount - self.tokens) / self.rate
+
+    def consume(self, amount: float) -> None:
+        self.refill()
+        self.tokens -= amount
+
+    def sync(self, limit: Optional[float], remaining: Optional[float]) -> None:
+        """Align the bucket with the limit and remaining budget reported by the server"""
+        self.refill()
+        if limit:
+            self.capacity = limit
+        if remaining is not None:
+            # Never assume more budget than the server reports
+            self.tokens = min(self.tokens, remaining)
+
+
+class LLMScheduler:
+    """Admission control for LLM calls against requests-per-minute and tokens-per-minute budgets
+
+    Callers wait in FIFO order until both budgets can cover their estimated
+    tokens. Requests that can't be admitted within `max_wait`, or that arrive
+    while `max_queue` callers are already waiting, are rejected with a 429.
+    """
+
+    def __init__(
+        self,
+        rpm: int = None,
+        tpm: int = None,
+        max_wait: float = None,
+        max_queue: int = None,
+        completion_tokens: int = None,
+    ):
+        self.requests = TokenBucket(rpm or config.OPENAI_RPM_LIMIT)
+        self.tokens = TokenBucket(tpm or config.OPENAI_TPM_LIMIT)
+        self.max_wait = max_wait if max_wait is not None else config.SCHEDULER_MAX_WAIT
+        self.max_queue = max_queue if max_queue is not None else config.SCHEDULER_MAX_QUEUE
+        self.completion_tokens = completion_tokens if completion_tokens is not None else config.SCHEDULER_COMPLETION_TOKENS
+        self.paused_until = 0.0
+        self.waiting = 0
+        self._lock = asyncio.Lock()
+        self.counters = {"admitted": 0, "rejected": 0, "throttled": 0, "upstream_429": 0}
+
+    def estimate(self, messages: Iterable[Dict[str, Any]]) -> int:
+        """Estimate the tokens a request counts against the TPM budget (prompt plus expected completion)"""
+        prompt_tokens = sum(estimate_tokens(str(message.get("content") or "")) + 4 for message in messages)
+        return prompt_tokens + self.completion_tokens
+
+    async def admit(self, tokens: int) -> None:
+        """Wait until the budgets can cover a request of `tokens`, then consume them"""
+        if self.waiting >= self.max_queue:
+            self._reject(f"LLM scheduler queue is full ({self.waiting} requests waiting)")
+
+        self.waiting += 1
+        try:
+            async with asyncio.timeout(self.max_wait):
+                async with self._lock:
+                    while True:
+                        wait = max(
+                            self.paused_until - time.monotonic(),
+                            self.requests.wait_time(1),
+                            self.tokens.wait_time(tokens),
+                        )
+                        if wait <= 0:
+                            break
+                        self.counters["throttled"] += 1
+                        logger.debug("LLM scheduler waiting %.2fs for %s tokens", wait, tokens)
+                        await asyncio.sleep(wait)
+                    self.requests.consume(1)
+                    self.tokens.consume(min(tokens, self.tokens.capacity))
+                    self.counters["admitted"] += 1
+        except TimeoutError:
+            self._reject(f"LLM rate limit budget exhausted; request not admitted within {self.max_wait:.0f}s")
+        finally:
+            self.waiting -= 1
+
+    async def observe_response(self, response: "httpx.Response") -> None:
+        """httpx response hook: sync the budgets with OpenAI's rate-limit headers"""
+        headers = response.headers
+        if "x-ratelimit-remaining-requests" in headers or "x-ratelimit-remaining-tokens" in headers:
+            self.requests.sync(
+                _number(headers.get("x-ratelimit-limit-requests")),
+                _number(headers.get("x-ratelimit-remaining-requests")),
+            )
+            self.tokens.sync(
+                _number(headers.get("x-ratelimit-limit-tokens")),
+                _number(headers.get("x-ratelimit-remaining-tokens")),
+            )
+        if response.status_code == 429:
+            # Hold every caller until the upstream window resets
+            self.counters["upstream_429"] += 1
+            retry_after = parse_reset(headers.get("retry-after")) or max(
+                parse_reset(headers.get("x-ratelimit-reset-requests")) or 0,
+                parse_reset(headers.get("x-ratelimit-reset-tokens")) or 0,
+                1.0,
+            )
+            self.paused_until = max(self.paused_until, time.monotonic() + retry_after)
+            logger.warning("OpenAI returned 429; pausing LLM admissions for %.1fs", retry_after)
+
+    def stats(self) -> Dict[str, Any]:
+        """Budgets and counters for monitoring"""
+        self.requests.refill()
+        self.tokens.refill()
+        return {
+            **self.counters,
+            "waiting": self.waiting,
+            "requests_available": math.floor(self.requests.tokens),
+            "requests_per_minute": self.requests.capacity,
+            "tokens_available": math.floor(self.tokens.tokens),
+            "tokens_per_minute": self.tokens.capacity,
+        }
+
+    def _reject(self, detail: str) -> None:
+        self.counters["rejected"] += 1
+        retry_after = max(1, math.ceil(max(self.paused_until - time.monotonic(), self.tokens.wait_time(self.completion_tokens))))
+        logger.warning(detail)
+        raise HTTPException(status_code=429, detail=detail, headers={"Retry-After": str(retry_after)})
+
+
+def _number(value: Optional[str]) -> Optional[float]:
+    try:
+        return float(value) if value is not None else None
+    except ValueError:
+        return None
@@ -1,5 +1,5 @@
 # schemas.py
-from pydantic import BaseModel, Field
+from pydantic import BaseModel, ConfigDict, Field
 from typing import List, Optional, Set
 from datetime import datetime
 from enum import Enum
@@ -9,6 +9,13 @@ class PriorityEnum(str, Enum):
     medium = "Medium"
     low = "Low"
 
+class JobStatusEnum(str, Enum):
+    queued = "queued"
+    running = "running"
+    succeeded = "succeeded"
+    failed = "failed"
+    cancelled = "cancelled"
+
 # Pydantic schemas for reading data
 class SubtaskBase(BaseModel):
     name: str
@@ -22,8 +29,7 @@ class Subtask(SubtaskBase):
     created_at: datetime
     updated_at: datetime
     
-    class Config:
-        orm_mode = True
+    model_config = ConfigDict(from_attributes=True)
 
 class AssigneeBase(BaseModel):
     name: str
@@ -36,8 +42,7 @@ class Assignee(AssigneeBase):
     created_at: datetime
     updated_at: datetime
     
-    class Config:
-        orm_mode = True
+    model_config = ConfigDict(from_attributes=True)
 
 class GoalBase(BaseModel):
     name: str
@@ -57,8 +62,7 @@ class Goal(GoalBase):
     subtasks: List[Subtask] = []
     assignees: List[Assignee] = []
     
-    class Config:
-        orm_mode = True
+    model_config = ConfigDict(from_attributes=True)
 
 class GoalWithDependencies(Goal):
     dependencies: List[Goal] = []
@@ -77,8 +81,7 @@ class Meeting(MeetingBase):
     created_at: datetime
     updated_at: datetime
     
-    class Config:
-        orm_mode = True
+    model_config = ConfigDict(from_attributes=True)
 
 class MeetingWithGoals(Meeting):
     goals: List[Goal] = []
@@ -89,4 +92,75 @@ class DependencyCreate(BaseModel):
 
 class DependencyDelete(BaseModel):
     dependent_goal_id: int
-    dependency_goal_id: int
\ No newline at end of file
+    dependency_goal_id: int
+
+class Job(BaseModel):
+    id: str
+    status: JobStatusEnum
+    error: Optional[str] = None
+    created_at: datetime
+    started_at: Optional[datetime] = None
+    finished_at: Optional[datetime] = None
+    
+    model_config = ConfigDict(from_attributes=True)
+
+
+# Keyset-paginated listings; pass next_cursor back as `cursor` for the next page
+class MeetingPage(BaseModel):
+    items: List[Meeting]
+    next_cursor: Optional[str] = None
+
+class GoalPage(BaseModel):
+    items: List[Goal]
+    next_cursor: Optional[str] = None
+
+class AssigneePage(BaseModel):
+    items: List[Assignee]
+    next_cursor: Optional[str] = None
+
+
+# Dependency graph views of a meeting's goals
+class GoalStatusEnum(str, Enum):
+    ready = "ready"
+    blocked = "blocked"
+    completed = "completed"
+
+class GoalStatus(BaseModel):
+    goal_id: int
+    status: GoalStatusEnum
+    blocked_by: List[int] = []
+
+class GraphOrder(BaseModel):
+    meeting_id: int
+    order: List[int]
+
+class CriticalPath(BaseModel):
+    meeting_id: int
+    path: List[int]
+    length: int
+
+class GraphStatus(BaseModel):
+    meeting_id: int
+    goals: List[GoalStatus]
+
+
+# Full-text search results; headline marks matched terms with <mark>
+class SearchTypeEnum(str, Enum):
+    meeting = "meeting"
+    goal = "goal"
+    subtask = "subtask"
+
+class SearchResult(BaseModel):
+    type: SearchTypeEnum
+    id: int
+    meeting_id: int
+    goal_id: Optional[int] = None
+    title: str
+    headline: str
+    rank: float
+
+class SearchResults(BaseModel):
+    query: str
+    results: List[SearchResult]
+    # True when a type had more than SEARCH_MAX_CANDIDATES matches and only the most recent were ranked
+    approximate: bool = False
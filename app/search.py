@@ -0,0 +1,208 @@
+# search.py
+import argparse
+import logging
+from typing import Any, Dict, List, Optional, Sequence, Tuple
+
+from sqlalchemy import Integer, Select, String, cast, exists, func, literal_column, null, select, text
+from sqlalchemy.dialects.postgresql import REGCONFIG, TSVECTOR
+from sqlalchemy.engine import Engine
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app import config, models
+
+logger = logging.getLogger(__name__)
+
+SEARCH_TYPES = ("meeting", "goal", "subtask")
+
+# Weighted documents behind each table's generated search_vector column: titles
+# and names rank above summaries and descriptions
+SEARCH_DOCUMENTS = {
+    "meetings": ("title", "summary"),
+    "goals": ("name", "description"),
+    "subtasks": ("name", None),
+}
+
+HEADLINE_OPTIONS = "StartSel=<mark>, StopSel=</mark>, MaxWords=35, MinWords=15, MaxFragments=2"
+
+
+def search_vector_expression(primary: str, secondary: Optional[str], language: str = None) -> str:
+    language = language or config.SEARCH_LANGUAGE
+    expression = f"setweight(to_tsvector('{language}'::regconfig, coalesce({primary}, '')), 'A')"
+    if secondary:
+        expression += f" || setweight(to_tsvector('{language}'::regconfig, coalesce({secondary}, '')), 'B')"
+    return expression
+
+
+def ensure_search_columns(engine: Engine, rebuild: bool = False) -> None:
+    """Add the generated search_vector columns and their GIN indexes where missing
+
+    Adding a generated column computes it for every existing row. With
+    `rebuild`, the columns are dropped and added again, which re-tokenizes all
+    rows (e.g. after changing SEARCH_LANGUAGE), and the indexes are rebuilt.
+    Indexes are built CONCURRENTLY so writes aren't blocked while they build.
+    """
+    with engine.connect().execution_options(isolation_level="AUTOCOMMIT") as conn:
+        for table, (primary, secondary) in SEARCH_DOCUMENTS.items():
+            if rebuild:
+                logger.info("Dropping %s.search_vector", table)
+                conn.execute(text(f"ALTER TABLE {table} DROP COLUMN IF EXISTS search_vector"))
+            logger.info("Ensuring %s.search_vector", table)
+            conn.execute(text(
+                f"ALTER TABLE {table} ADD COLUMN IF NOT EXISTS search_vector tsvector "
+                f"GENERATED ALWAYS AS ({search_vector_expression(primary, secondary)}) STORED"
+            ))
+            # A failed concurrent build leaves an invalid index behind; drop it so it's rebuilt
+            invalid = conn.execute(text(
+                "SELECT 1 FROM pg_index WHERE indexrelid = to_regclass(:index) AND NOT indisvalid"
+            ), {"index": f"ix_{table}_search_vector"}).first()
+            if invalid:
+                conn.execute(text(f"DROP INDEX CONCURRENTLY IF EXISTS ix_{table}_search_vector"))
+            conn.execute(text(
+                f"CREATE INDEX CONCURRENTLY IF NOT EXISTS ix_{table}_search_vector ON {table} USING gin (search_vector)"
+            ))
+            conn.execute(text(f"ANALYZE {table}"))
+    logger.info("Search columns and indexes are up to date.")
+
+
+def _vector(table: str):
+    return literal_column(f"{table}.search_vector", TSVECTOR)
+
+
+def _constant(value: str):
+    # Rendered inline rather than bound, so Postgres doesn't need to infer a parameter type
+    return literal_column(f"'{value}'", String)
+
+
+def _matches(table: str, tsquery):
+    return _vector(table).op("@@")(tsquery)
+
+
+def _goal_filters(query: Select, goal_id, priority: Optional[models.PriorityLevel], assignee_id: Optional[int]) -> Select:
+    if priority is not None:
+        query = query.where(models.Goal.priority == priority)
+    if assignee_id is not None:
+        query = query.where(exists().where(
+            models.goal_assignees.c.goal_id == goal_id,
+            models.goal_assignees.c.assignee_id == assignee_id,
+        ))
+    return query
+
+
+def _ranked(candidates: Select, tsquery, document) -> Select:
+    """Rank a bounded set of candidates and build headlines only for the returned page
+
+    Ranking every match of a common term would read every matching row, so
+    only the SEARCH_MAX_CANDIDATES most recent matches (highest IDs) are ranked.
+    When a type has more matches than that, its results are the best of the
+    most recent ones rather than of all matches; `candidates` (the size of the
+    ranked set) lets callers tell. Headlines are the most expensive part and
+    are only generated for the final rows.
+    """
+    candidates = candidates.order_by(candidates.selected_columns.id.desc()).limit(config.SEARCH_MAX_CANDIDATES).subquery()
+    return (
+        select(
+            candidates,
+            func.count().over().label("candidates"),
+            func.ts_headline(
+                cast(config.SEARCH_LANGUAGE, REGCONFIG),
+                document(candidates),
+                tsquery,
+                HEADLINE_OPTIONS,
+            ).label("headline"),
+        )
+        .order_by(candidates.c.rank.desc(), candidates.c.id.desc())
+    )
+
+
+def meeting_search_query(tsquery, priority=None, assignee_id=None) -> Select:
+    candidates = select(
+        _constant("meeting").label("type"),
+        models.Meeting.id.label("id"),
+        models.Meeting.id.label("meeting_id"),
+        cast(null(), Integer).label("goal_id"),
+        models.Meeting.title.label("title"),
+        models.Meeting.summary.label("body"),
+        func.ts_rank_cd(_vector("meetings"), tsquery).label("rank"),
+    ).where(_matches("meetings", tsquery))
+    if priority is not None or assignee_id is not None:
+        # Meetings with at least one goal matching the filters
+        goals = _goal_filters(select(models.Goal.id), models.Goal.id, priority, assignee_id)
+        candidates = candidates.where(goals.where(models.Goal.meeting_id == models.Meeting.id).exists())
+    return _ranked(candidates, tsquery, lambda c: func.coalesce(c.c.body, c.c.title))
+
+
+def goal_search_query(tsquery, priority=None, assignee_id=None) -> Select:
+    candidates = select(
+        _constant("goal").label("type"),
+        models.Goal.id.label("id"),
+        models.Goal.meeting_id.label("meeting_id"),
+        models.Goal.id.label("goal_id"),
+        models.Goal.name.label("title"),
+        models.Goal.description.label("body"),
+        func.ts_rank_cd(_vector("goals"), tsquery).label("rank"),
+    ).where(_matches("goals", tsquery))
+    candidates = _goal_filters(candidates, models.Goal.id, priority, assignee_id)
+    return _ranked(candidates, tsquery, lambda c: func.coalesce(c.c.body, c.c.title))
+
+
+def subtask_search_query(tsquery, priority=None, assignee_id=None) -> Select:
+    candidates = (
+        select(
+            _constant("subtask").label("type"),
+            models.Subtask.id.label("id"),
+            models.Goal.meeting_id.label("meeting_id"),
+            models.Subtask.goal_id.label("goal_id"),
+            models.Subtask.name.label("title"),
+            cast(null(), String).label("body"),
+            func.ts_rank_cd(_vector("subtasks"), tsquery).label("rank"),
+        )
+        .join(models.Goal, models.Goal.id == models.Subtask.goal_id)
+        .where(_matches("subtasks", tsquery))
+    )
+    candidates = _goal_filters(candidates, models.Subtask.goal_id, priority, assignee_id)
+    return _ranked(candidates, tsquery, lambda c: c.c.title)
+
+
+SEARCH_QUERIES = {
+    "meeting": meeting_search_query,
+    "goal": goal_search_query,
+    "subtask": subtask_search_query,
+}
+
+
+async def search(
+    db: AsyncSession,
+    q: str,
+    types: Sequence[str] = SEARCH_TYPES,
+    priority: Optional[models.PriorityLevel] = None,
+    assignee_id: Optional[int] = None,
+    limit: int = 20,
+) -> Tuple[List[Dict[str, Any]], bool]:
+    """Ranked, highlighted matches for a web-style query (quotes, OR, -exclusions) across the requested types
+
+    Also returns whether the ranking is approximate: True when some type had
+    more matches than SEARCH_MAX_CANDIDATES, so only its most recent ones were ranked.
+    """
+    # websearch_to_tsquery never raises on user input, unlike to_tsquery
+    tsquery = func.websearch_to_tsquery(cast(config.SEARCH_LANGUAGE, REGCONFIG), q)
+    results = []
+    for search_type in types:
+        query = SEARCH_QUERIES[search_type](tsquery, priority, assignee_id).limit(limit)
+        results.extend(row._asdict() for row in await db.execute(query))
+    approximate = any(result["candidates"] >= config.SEARCH_MAX_CANDIDATES for result in results)
+    results.sort(key=lambda result: result["rank"], reverse=True)
+    return [
+        {key: value for key, value in result.items() if key not in ("body", "candidates")}
+        for result in results[:limit]
+    ], approximate
+
+
+if __name__ == "__main__":
+    from app.database import engine
+
+    logging.basicConfig(level=logging.INFO, format="%(asctime)s [%(levelname)s] %(message)s")
+    parser = argparse.ArgumentParser(description="Maintain the full-text search columns and indexes")
+    parser.add_argument("command", choices=["reindex"])
+    parser.add_argument("--rebuild", action="store_true", help="Drop and recompute search_vector for every existing row")
+    args = parser.parse_args()
+    ensure_search_columns(engine, rebuild=args.rebuild)
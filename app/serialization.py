@@ -0,0 +1,37 @@
+# serialization.py
+import functools
+from typing import Any, Dict, Optional
+
+from fastapi.responses import Response
+from pydantic import TypeAdapter
+
+
+@functools.lru_cache(maxsize=None)
+def type_adapter(type_: Any) -> TypeAdapter:
+    """One TypeAdapter per type; building its validator and serializer is the expensive part"""
+    return TypeAdapter(type_)
+
+
+def dump_json(type_: Any, value: Any) -> bytes:
+    """Validate models, dicts or ORM objects as `type_` and encode them straight to JSON bytes"""
+    adapter = type_adapter(type_)
+    return adapter.dump_json(adapter.validate_python(value, from_attributes=True))
+
+
+def dump_jsonable(type_: Any, value: Any) -> Any:
+    """JSON-compatible dicts and lists for `value` (already of `type_`), built in one pass"""
+    return type_adapter(type_).dump_python(value, mode="json")
+
+
+class ModelResponse(Response):
+    """JSON response encoded by pydantic from the route's response model in a single pass
+
+    FastAPI's own response_model handling dumps the result to dicts and then
+    encodes those; this skips the intermediate dicts. Keep `response_model` on
+    the route so the OpenAPI schema still describes the response.
+    """
+
+    media_type = "application/json"
+
+    def __init__(self, response_model: Any, content: Any, status_code: int = 200, headers: Optional[Dict[str, str]] = None):
+        super().__init__(dump_json(response_model, content), status_code=status_code, headers=headers)
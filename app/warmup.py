@@ -0,0 +1,100 @@
+# warmup.py
+import asyncio
+import logging
+import time
+from typing import Any, Awaitable, Dict, List, Optional
+
+from fastapi import FastAPI
+from sqlalchemy import text
+
+from app import config
+from app.database import async_engine, engine
+from app.llm import resolve_client
+
+logger = logging.getLogger(__name__)
+
+
+class StartupState:
+    """Startup work still running in the background, reported by /readyz"""
+
+    def __init__(self):
+        self.started = time.monotonic()
+        self.ready_after: Optional[float] = None
+        self.components: Dict[str, str] = {}
+        self._tasks: List[asyncio.Task] = []
+
+    @property
+    def ready(self) -> bool:
+        return all(status != "pending" for status in self.components.values())
+
+    def track(self, name: str, aw: Awaitable[Any]) -> asyncio.Task:
+        """Run `aw` in the background as startup component `name`; failures are logged, not raised"""
+        self.components[name] = "pending"
+
+        async def run():
+            start = time.monotonic()
+            try:
+                await aw
+                self.components[name] = "ok"
+                logger.info("Startup step %s finished in %.0f ms", name, (time.monotonic() - start) * 1000)
+            except asyncio.CancelledError:
+                self.components[name] = "cancelled"
+                raise
+            except Exception as e:
+                self.components[name] = f"failed: {type(e).__name__}"
+                logger.warning("Startup step %s failed: %s", name, e)
+            finally:
+                if self.ready and self.ready_after is None:
+                    self.ready_after = time.monotonic() - self.started
+                    logger.info("Ready %.0f ms after startup began", self.ready_after * 1000)
+
+        task = asyncio.ensure_future(run())
+        self._tasks.append(task)
+        return task
+
+    def cancel(self) -> None:
+        for task in self._tasks:
+            task.cancel()
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "ready": self.ready,
+            "components": self.components,
+            "ready_after_ms": round(self.ready_after * 1000) if self.ready_after is not None else None,
+            "uptime_ms": round((time.monotonic() - self.started) * 1000),
+        }
+
+
+async def warm_llm(app: FastAPI) -> None:
+    """Open a pooled connection (DNS, TCP and TLS) to the OpenAI API"""
+    client = await resolve_client(app)
+    if client is None:
+        return
+    try:
+        await client.client.models.list()
+    except Exception as e:
+        # An error response still leaves the connection open in the pool
+        logger.debug("Warm-up models request failed: %s", e)
+
+
+async def warm_database() -> None:
+    """Open WARMUP_DB_CONNECTIONS connections in each engine's pool"""
+    async def open_async() -> None:
+        async with async_engine.connect() as connection:
+            await connection.execute(text("SELECT 1"))
+
+    def open_sync() -> None:
+        connections = [engine.connect() for _ in range(config.WARMUP_DB_CONNECTIONS)]
+        for connection in connections:
+            connection.execute(text("SELECT 1"))
+            connection.close()
+
+    await asyncio.gather(*(open_async() for _ in range(config.WARMUP_DB_CONNECTIONS)))
+    await asyncio.to_thread(open_sync)
+
+
+def warm_up(app: FastAPI, startup: StartupState, templates: Any) -> None:
+    """Start the optional warm-up steps: LLM and database connections, and compiled templates"""
+    startup.track("warmup_llm", warm_llm(app))
+    startup.track("warmup_db", warm_database())
+    startup.track("warmup_templates", asyncio.to_thread(templates.get_template, "index.html"))
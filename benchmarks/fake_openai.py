@@ -0,0 +1,220 @@
+# fake_openai.py
+"""OpenAI-compatible chat completions stub that replays recorded tool-call responses.
+
+Requests are answered from a fixture keyed by the requested tool name (the
+response model instructor sends: Meeting, IterableGoal, MeetingExtraction),
+cycling through the recordings for each name. Every response waits `--latency`
+seconds before its first byte, then generates its arguments in `--chunk-size`
+character chunks, `--chunk-delay` seconds apart, streamed as SSE deltas when the
+request asks for `stream`. Responses report usage (streams in a final chunk,
+when the request sets `stream_options.include_usage`), with cached prompt tokens
+the way OpenAI's prompt caching does: the longest leading run of tools and
+messages seen in an earlier request, if at least 1024 tokens, in steps of 128.
+For resilience testing, `--error-rate` of the requests fail with a 500 after the
+latency, and `--slow-rate` of them wait `--slow-latency` instead.
+
+Usage: python benchmarks/fake_openai.py [--port 8900] [--latency 0.5] [--chunk-size 40] [--chunk-delay 0.005]
+           [--error-rate 0.05] [--slow-rate 0.05] [--slow-latency 5] [--seed 0]
+"""
+import argparse
+import asyncio
+import hashlib
+import itertools
+import json
+import os
+import random
+import time
+from typing import Dict, Iterator, List
+
+from fastapi import FastAPI, HTTPException, Request
+from fastapi.responses import JSONResponse, StreamingResponse
+
+DEFAULT_RESPONSES = os.path.join(os.path.dirname(os.path.abspath(__file__)), "fixtures", "openai_responses.json")
+
+# Generous enough that the app's scheduler never throttles the benchmark
+RATE_LIMIT_HEADERS = {
+    "x-ratelimit-limit-requests": "100000",
+    "x-ratelimit-remaining-requests": "100000",
+    "x-ratelimit-reset-requests": "1s",
+    "x-ratelimit-limit-tokens": "100000000",
+    "x-ratelimit-remaining-tokens": "100000000",
+    "x-ratelimit-reset-tokens": "1s",
+}
+
+
+def load_responses(path: str) -> Dict[str, List[dict]]:
+    """Recorded tool-call arguments by tool name"""
+    with open(path) as f:
+        return json.load(f)
+
+
+def chunks(text: str, size: int) -> Iterator[str]:
+    for start in range(0, len(text), size):
+        yield text[start:start + size]
+
+
+def estimate_tokens(text: str) -> int:
+    return len(text) // 4
+
+
+def cached_prefix_tokens(body: dict, seen: set) -> int:
+    """Tokens of the longest request prefix (tools, then whole messages) seen before; remembers this request's prefixes"""
+    digest = hashlib.sha256(json.dumps(body.get("tools"), sort_keys=True).encode())
+    tokens = estimate_tokens(json.dumps(body.get("tools")))
+    cached = 0
+    for message in body.get("messages", []):
+        digest.update(json.dumps(message, sort_keys=True).encode())
+        tokens += estimate_tokens(str(message.get("content", "")))
+        key = digest.copy().hexdigest()
+        if key in seen:
+            cached = tokens
+        seen.add(key)
+    return cached // 128 * 128 if cached >= 1024 else 0
+
+
+def create_app(
+    responses: Dict[str, List[dict]],
+    latency: float,
+    chunk_size: int,
+    chunk_delay: float,
+    error_rate: float = 0.0,
+    slow_rate: float = 0.0,
+    slow_latency: float = 0.0,
+    seed: int = 0,
+) -> FastAPI:
+    app = FastAPI()
+    recordings = {name: itertools.cycle([json.dumps(arguments) for arguments in recorded]) for name, recorded in responses.items()}
+    counters = {"requests": 0, "streamed": 0, "by_tool": {}, "by_model": {}, "cached_tokens": 0, "errors": 0, "slow": 0}
+    rng = random.Random(seed)
+    seen_prefixes: set = set()
+
+    @app.post("/v1/chat/completions")
+    async def chat_completions(request: Request):
+        body = await request.json()
+        tool_choice = body.get("tool_choice")
+        if isinstance(tool_choice, dict):
+            name = tool_choice["function"]["name"]
+        elif body.get("tools"):
+            name = body["tools"][0]["function"]["name"]
+        else:
+            raise HTTPException(status_code=400, detail="The stub only answers tool calls")
+        if name not in recordings:
+            raise HTTPException(status_code=400, detail=f"No recorded response for {name}")
+
+        counters["requests"] += 1
+        counters["by_tool"][name] = counters["by_tool"].get(name, 0) + 1
+        arguments = next(recordings[name])
+        model = body.get("model", "gpt-4o")
+        counters["by_model"][model] = counters["by_model"].get(model, 0) + 1
+        completion_id = f"chatcmpl-stub-{counters['requests']}"
+        created = int(time.time())
+        prompt_tokens = estimate_tokens(json.dumps(body.get("tools"))) + sum(
+            estimate_tokens(str(message.get("content", ""))) for message in body.get("messages", [])
+        )
+        cached_tokens = cached_prefix_tokens(body, seen_prefixes)
+
+        roll = rng.random()
+        if roll < error_rate:
+            counters["errors"] += 1
+            await asyncio.sleep(latency)
+            return JSONResponse(
+                {"error": {"message": "The server had an error while processing your request.", "type": "server_error", "code": None}},
+                status_code=500,
+            )
+        if roll < error_rate + slow_rate:
+            counters["slow"] += 1
+            await asyncio.sleep(slow_latency)
+        else:
+            await asyncio.sleep(latency)
+
+        counters["cached_tokens"] += cached_tokens
+        usage = {
+            "prompt_tokens": prompt_tokens,
+            "completion_tokens": len(arguments) // 4,
+            "total_tokens": prompt_tokens + len(arguments) // 4,
+            "prompt_tokens_details": {"cached_tokens": cached_tokens},
+        }
+        if not body.get("stream"):
+            await asyncio.sleep(chunk_delay * (len(arguments) // chunk_size))
+            return JSONResponse(
+                {
+                    "id": completion_id,
+                    "object": "chat.completion",
+                    "created": created,
+                    "model": model,
+                    "choices": [{
+                        "index": 0,
+                        "message": {
+                            "role": "assistant",
+                            "content": None,
+                            "tool_calls": [{"id": "call_0", "type": "function", "function": {"name": name, "arguments": arguments}}],
+                        },
+                        "finish_reason": "tool_calls",
+                    }],
+                    "usage": usage,
+                },
+                headers=RATE_LIMIT_HEADERS,
+            )
+
+        counters["streamed"] += 1
+
+        def event(delta: dict, finish_reason=None) -> str:
+            chunk = {
+                "id": completion_id,
+                "object": "chat.completion.chunk",
+                "created": created,
+                "model": model,
+                "choices": [{"index": 0, "delta": delta, "finish_reason": finish_reason}],
+            }
+            return f"data: {json.dumps(chunk)}\n\n"
+
+        async def stream():
+            yield event({
+                "role": "assistant",
+                "tool_calls": [{"index": 0, "id": "call_0", "type": "function", "function": {"name": name, "arguments": ""}}],
+            })
+            for piece in chunks(arguments, chunk_size):
+                if chunk_delay:
+                    await asyncio.sleep(chunk_delay)
+                yield event({"tool_calls": [{"index": 0, "function": {"arguments": piece}}]})
+            yield event({}, finish_reason="tool_calls")
+            if (body.get("stream_options") or {}).get("include_usage"):
+                chunk = {"id": completion_id, "object": "chat.completion.chunk", "created": created, "model": model, "choices": [], "usage": usage}
+                yield f"data: {json.dumps(chunk)}\n\n"
+            yield "data: [DONE]\n\n"
+
+        return StreamingResponse(stream(), media_type="text/event-stream", headers=RATE_LIMIT_HEADERS)
+
+    @app.get("/stats")
+    async def stats():
+        return counters
+
+    return app
+
+
+if __name__ == "__main__":
+    import uvicorn
+
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8900)
+    parser.add_argument("--responses", default=DEFAULT_RESPONSES, help="JSON fixture of recorded tool-call arguments by tool name")
+    parser.add_argument("--latency", type=float, default=0.5, help="Seconds before the first byte of each response")
+    parser.add_argument("--chunk-size", type=int, default=40, help="Characters of tool-call arguments per streamed chunk")
+    parser.add_argument("--chunk-delay", type=float, default=0.005, help="Seconds between chunks (generation speed)")
+    parser.add_argument("--error-rate", type=float, default=0.0, help="Fraction of requests answered with a 500")
+    parser.add_argument("--slow-rate", type=float, default=0.0, help="Fraction of requests that wait --slow-latency instead")
+    parser.add_argument("--slow-latency", type=float, default=5.0, help="Seconds before the first byte of a slow response")
+    parser.add_argument("--seed", type=int, default=0, help="Seed for choosing failed and slow requests")
+    args = parser.parse_args()
+    app = create_app(
+        load_responses(args.responses),
+        args.latency,
+        max(1, args.chunk_size),
+        args.chunk_delay,
+        args.error_rate,
+        args.slow_rate,
+        args.slow_latency,
+        args.seed,
+    )
+    uvicorn.run(app, host=args.host, port=args.port, log_level="warning")
@@ -0,0 +1,344 @@
+# load_test.py
+"""Load test the API end to end against the fake OpenAI server.
+
+Starts benchmarks/fake_openai.py and the app under uvicorn (pointed at the stub
+through OPENAI_BASE_URL), then drives each scenario at each concurrency level
+with transcripts of each size, and reports throughput, p50/p95/p99 latency and
+the app's memory. Results are written as JSON; pass an earlier results file to
+--compare to print the change per scenario.
+
+Scenarios:
+  process  POST /process (no_cache, so every request reaches the stub)
+  stream   POST /process/stream, also timing the first goal event
+  crud     GET /meetings, /goals and /assignees (needs DATABASE_URL)
+
+Usage: python benchmarks/load_test.py [--scenarios process,stream,crud] [--concurrency 1,8,32]
+           [--requests 50] [--sizes small,medium,large] [--latency 0.5] [--compare results/old.json]
+"""
+import argparse
+import asyncio
+import json
+import os
+import random
+import re
+import resource
+import socket
+import subprocess
+import sys
+import time
+from datetime import datetime
+from typing import Dict, List, Optional, Tuple
+
+import httpx
+
+BENCHMARKS_DIR = os.path.dirname(os.path.abspath(__file__))
+PROJECT_ROOT = os.path.dirname(BENCHMARKS_DIR)
+
+# Target transcript sizes in characters; "large" is past CHUNK_MAX_TOKENS, so it
+# exercises the chunked map-reduce path
+SIZES = {"small": 2_000, "medium": 16_000, "large": 64_000}
+SPEAKERS = ["Sam", "Alex", "Priya", "Jordan", "Maria"]
+FALLBACK_CORPUS = [
+    "Let's make sure the release scope is final by Friday.",
+    "I can take the database migration, but I need the runbook reviewed first.",
+    "The load test should run at twice the expected launch traffic.",
+    "We still need owners for the beta customer onboarding calls.",
+    "Can someone update the on-call rotation before launch week?",
+    "The reporting dashboard moves to the second milestone.",
+]
+CRUD_PATHS = ["/meetings?limit=50", "/goals?limit=50", "/assignees?limit=50"]
+
+
+def load_corpus(path: str) -> List[str]:
+    """Sentences from the request bodies in requests.jsonl, or a built-in corpus when it's missing"""
+    sentences = []
+    if os.path.exists(path):
+        with open(path) as f:
+            for line in f:
+                if not line.strip():
+                    continue
+                body = json.loads(line).get("body", "")
+                sentences.extend(s.strip() for s in re.split(r"(?<=[.?!])\s+", body) if 20 <= len(s.strip()) <= 300)
+    return sentences or FALLBACK_CORPUS
+
+
+def make_transcript(corpus: List[str], size: int, rng: random.Random) -> str:
+    """A speaker-turn transcript of roughly `size` characters"""
+    turns, length = [], 0
+    while length < size:
+        sentences = " ".join(rng.choice(corpus) for _ in range(rng.randint(1, 3)))
+        turn = f"{rng.choice(SPEAKERS)}: {sentences}"
+        turns.append(turn)
+        length += len(turn) + 1
+    return "\n".join(turns)
+
+
+def percentile(values: List[float], pct: float) -> Optional[float]:
+    """Nearest-rank percentile of an unsorted list"""
+    if not values:
+        return None
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, max(0, round(pct / 100 * len(ordered) + 0.5) - 1))]
+
+
+def summarize(values: List[float]) -> Dict[str, Optional[float]]:
+    """Latency summary in milliseconds"""
+    if not values:
+        return {"p50": None, "p95": None, "p99": None, "mean": None, "max": None}
+    return {
+        "p50": round(percentile(values, 50) * 1000, 1),
+        "p95": round(percentile(values, 95) * 1000, 1),
+        "p99": round(percentile(values, 99) * 1000, 1),
+        "mean": round(sum(values) / len(values) * 1000, 1),
+        "max": round(max(values) * 1000, 1),
+    }
+
+
+def rss_mb(pid: int) -> Optional[float]:
+    """Resident set size of a process in MB (Linux only)"""
+    try:
+        with open(f"/proc/{pid}/status") as f:
+            for line in f:
+                if line.startswith("VmRSS:"):
+                    return round(int(line.split()[1]) / 1024, 1)
+    except OSError:
+        pass
+    return None
+
+
+def free_port() -> int:
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+
+def wait_until_ready(url: str, process: subprocess.Popen, timeout: float = 30.0) -> None:
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        if process.poll() is not None:
+            raise RuntimeError(f"{url} exited with code {process.returncode} before it was ready")
+        try:
+            httpx.get(url, timeout=1.0)
+            return
+        except httpx.TransportError:
+            time.sleep(0.1)
+    raise RuntimeError(f"{url} was not ready after {timeout:.0f}s")
+
+
+def start_servers(args) -> Tuple[str, List[subprocess.Popen], Optional[int]]:
+    """Start the stub and the app; returns the app URL, the processes and the app's PID"""
+    stub_port, app_port = free_port(), free_port()
+    # Keep server logs out of the report unless asked for
+    log = open(args.server_log, "a") if args.server_log else subprocess.DEVNULL
+    stub = subprocess.Popen([
+        sys.executable, os.path.join(BENCHMARKS_DIR, "fake_openai.py"),
+        "--port", str(stub_port),
+        "--latency", str(args.latency),
+        "--chunk-size", str(args.chunk_size),
+        "--chunk-delay", str(args.chunk_delay),
+    ], stdout=log, stderr=subprocess.STDOUT)
+    processes = [stub]
+    try:
+        wait_until_ready(f"http://127.0.0.1:{stub_port}/stats", stub)
+        env = {
+            **os.environ,
+            "OPENAI_API_KEY": "benchmark",
+            "OPENAI_BASE_URL": f"http://127.0.0.1:{stub_port}/v1",
+            # Start from the stub's limits so admission control never waits
+            "OPENAI_RPM_LIMIT": "100000",
+            "OPENAI_TPM_LIMIT": "100000000",
+            "EXTRACTION_CACHE_PERSIST": "false",
+        }
+        app = subprocess.Popen(
+            [sys.executable, "-m", "uvicorn", "main:app", "--port", str(app_port), "--log-level", "warning", "--no-access-log"],
+            cwd=PROJECT_ROOT,
+            env=env,
+            stdout=log,
+            stderr=subprocess.STDOUT,
+        )
+        processes.append(app)
+        wait_until_ready(f"http://127.0.0.1:{app_port}/metrics", app)
+    except Exception:
+        stop_servers(processes)
+        raise
+    return f"http://127.0.0.1:{app_port}", processes, app.pid
+
+
+def stop_servers(processes: List[subprocess.Popen]) -> None:
+    for process in reversed(processes):
+        process.terminate()
+        try:
+            process.wait(timeout=10)
+        except subprocess.TimeoutExpired:
+            process.kill()
+
+
+async def send(client: httpx.AsyncClient, scenario: str, transcript: str, index: int) -> dict:
+    """Send one request; returns its status, latency and (for streams) time to the first goal"""
+    start = time.perf_counter()
+    first_goal = None
+    try:
+        if scenario == "process":
+            response = await client.post("/process", data={"transcript": transcript, "no_cache": "true"})
+            status = response.status_code
+        elif scenario == "stream":
+            async with client.stream("POST", "/process/stream", data={"transcript": transcript, "no_cache": "true"}) as response:
+                status = response.status_code
+                async for line in response.aiter_lines():
+                    if line == "event: goal" and first_goal is None:
+                        first_goal = time.perf_counter() - start
+                    elif line == "event: error":
+                        status = 599
+        else:
+            response = await client.get(CRUD_PATHS[index % len(CRUD_PATHS)])
+            status = response.status_code
+    except httpx.HTTPError as e:
+        status = type(e).__name__
+    return {"status": status, "latency": time.perf_counter() - start, "first_goal": first_goal}
+
+
+async def run_level(client: httpx.AsyncClient, scenario: str, transcripts: List[str], concurrency: int, total: int, app_pid: Optional[int]) -> dict:
+    """Closed-loop run: `concurrency` workers send `total` requests between them"""
+    results = []
+    counter = iter(range(total))
+
+    async def worker():
+        for index in counter:
+            results.append(await send(client, scenario, transcripts[index % len(transcripts)], index))
+
+    memory = [rss_mb(app_pid)] if app_pid else []
+
+    async def sample_memory():
+        while True:
+            await asyncio.sleep(0.2)
+            memory.append(rss_mb(app_pid))
+
+    sampler = asyncio.create_task(sample_memory()) if app_pid else None
+    start = time.perf_counter()
+    await asyncio.gather(*(worker() for _ in range(concurrency)))
+    elapsed = time.perf_counter() - start
+    if sampler is not None:
+        sampler.cancel()
+        memory.append(rss_mb(app_pid))
+    memory = [value for value in memory if value is not None]
+
+    ok = [result for result in results if result["status"] == 200]
+    statuses: Dict[str, int] = {}
+    for result in results:
+        statuses[str(result["status"])] = statuses.get(str(result["status"]), 0) + 1
+    summary = {
+        "requests": len(results),
+        "errors": len(results) - len(ok),
+        "status_codes": statuses,
+        "elapsed_s": round(elapsed, 3),
+        "throughput_rps": round(len(ok) / elapsed, 2) if elapsed else None,
+        "latency_ms": summarize([result["latency"] for result in ok]),
+        "app_rss_mb": {"start": memory[0], "peak": max(memory), "end": memory[-1]} if memory else None,
+    }
+    if scenario == "stream":
+        summary["first_goal_ms"] = summarize([result["first_goal"] for result in ok if result["first_goal"] is not None])
+    return summary
+
+
+def print_row(row: dict) -> None:
+    latency = row["latency_ms"]
+    memory = row["app_rss_mb"] or {}
+
+    def fmt(value):
+        return f"{value:.1f}" if isinstance(value, (int, float)) else "-"
+
+    print(
+        f"{row['scenario']:<8} {row['size']:<7} {row['concurrency']:>5} {row['requests']:>6} {row['errors']:>6} "
+        f"{fmt(row['throughput_rps']):>8} {fmt(latency['p50']):>9} {fmt(latency['p95']):>9} {fmt(latency['p99']):>9} "
+        f"{fmt(memory.get('peak')):>9}"
+    )
+
+
+def compare(results: List[dict], previous_path: str) -> None:
+    """Print the change in throughput and latency against an earlier results file"""
+    with open(previous_path) as f:
+        previous = {(row["scenario"], row["size"], row["concurrency"]): row for row in json.load(f)["results"]}
+
+    def change(new, old):
+        if not isinstance(new, (int, float)) or not old:
+            return "-"
+        return f"{(new - old) / old * 100:+.1f}%"
+
+    matched = [(row, previous[key]) for row in results if (key := (row["scenario"], row["size"], row["concurrency"])) in previous]
+    print(f"\nCompared with {previous_path}")
+    if not matched:
+        print("No scenario, size and concurrency in common")
+        return
+    print(f"{'scenario':<8} {'size':<7} {'conc':>5} {'rps':>9} {'p50':>9} {'p95':>9} {'p99':>9}")
+    for row, old in matched:
+        print(
+            f"{row['scenario']:<8} {row['size']:<7} {row['concurrency']:>5} "
+            f"{change(row['throughput_rps'], old['throughput_rps']):>9} "
+            + " ".join(f"{change(row['latency_ms'][p], old['latency_ms'][p]):>9}" for p in ("p50", "p95", "p99"))
+        )
+
+
+async def run(args) -> List[dict]:
+    rng = random.Random(args.seed)
+    corpus = load_corpus(args.corpus)
+    sizes = args.sizes.split(",")
+    transcripts = {size: [make_transcript(corpus, SIZES[size], rng) for _ in range(args.variants)] for size in sizes}
+
+    processes, app_pid = [], None
+    base_url = args.url
+    if base_url is None:
+        base_url, processes, app_pid = start_servers(args)
+    try:
+        limits = httpx.Limits(max_connections=None, max_keepalive_connections=None)
+        async with httpx.AsyncClient(base_url=base_url, timeout=args.timeout, limits=limits) as client:
+            results = []
+            print(f"{'scenario':<8} {'size':<7} {'conc':>5} {'reqs':>6} {'errors':>6} {'rps':>8} {'p50 ms':>9} {'p95 ms':>9} {'p99 ms':>9} {'rss MB':>9}")
+            for scenario in args.scenarios.split(","):
+                # Transcript size doesn't apply to the read endpoints
+                for size in (sizes if scenario != "crud" else ["-"]):
+                    for concurrency in (int(value) for value in args.concurrency.split(",")):
+                        row = {"scenario": scenario, "size": size, "concurrency": concurrency}
+                        row.update(await run_level(client, scenario, transcripts.get(size, [""]), concurrency, args.requests, app_pid))
+                        results.append(row)
+                        print_row(row)
+        return results
+    finally:
+        stop_servers(processes)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--scenarios", default="process,stream,crud", help="Comma-separated scenarios to run")
+    parser.add_argument("--concurrency", default="1,8,32", help="Comma-separated concurrency levels")
+    parser.add_argument("--requests", type=int, default=50, help="Requests per scenario, size and concurrency level")
+    parser.add_argument("--sizes", default="small,medium,large", help=f"Comma-separated transcript sizes ({', '.join(SIZES)})")
+    parser.add_argument("--variants", type=int, default=5, help="Distinct transcripts per size")
+    parser.add_argument("--corpus", default=os.path.join(PROJECT_ROOT, "requests.jsonl"), help="JSONL file whose bodies seed the transcripts")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--latency", type=float, default=0.5, help="Stub latency before the first byte, in seconds")
+    parser.add_argument("--chunk-size", type=int, default=40, help="Stub characters per streamed chunk")
+    parser.add_argument("--chunk-delay", type=float, default=0.005, help="Stub seconds between streamed chunks")
+    parser.add_argument("--timeout", type=float, default=120.0, help="Per-request timeout in seconds")
+    parser.add_argument("--url", help="Benchmark an already running app instead of starting the stub and app")
+    parser.add_argument("--server-log", help="Append the stub's and the app's output to this file")
+    parser.add_argument("--output", help="Results file (default: benchmarks/results/load-<timestamp>.json)")
+    parser.add_argument("--compare", help="Earlier results file to compare against")
+    args = parser.parse_args()
+    unknown = set(args.sizes.split(",")) - set(SIZES)
+    if unknown:
+        parser.error(f"unknown sizes: {', '.join(sorted(unknown))}")
+
+    started_at = datetime.now()
+    results = asyncio.run(run(args))
+    output = args.output or os.path.join(BENCHMARKS_DIR, "results", f"load-{started_at:%Y%m%d-%H%M%S}.json")
+    os.makedirs(os.path.dirname(os.path.abspath(output)), exist_ok=True)
+    with open(output, "w") as f:
+        json.dump({
+            "started_at": started_at.isoformat(),
+            "config": {key: value for key, value in vars(args).items() if key not in ("output", "compare", "server_log")},
+            "client_max_rss_mb": round(resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024, 1),
+            "results": results,
+        }, f, indent=2)
+    print(f"\nWrote {output}")
+    if args.compare:
+        compare(results, args.compare)
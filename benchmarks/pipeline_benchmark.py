@@ -0,0 +1,92 @@
+# pipeline_benchmark.py
+"""Compare /process pipeline modes against a mocked LLM.
+
+Usage: python benchmarks/pipeline_benchmark.py [--latency 0.5] [--goals 10] [--runs 20]
+"""
+import argparse
+import asyncio
+import os
+import statistics
+import sys
+import time
+import types
+import typing
+
+# Add project root to path to properly import modules
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import main
+
+
+def make_goals(count: int) -> typing.List[main.Goal]:
+    """Build a list of fake goals"""
+    return [
+        main.Goal(
+            id=i,
+            name=f"Goal {i}",
+            description=f"Description for goal {i}",
+            priority=main.PriorityEnum.medium,
+            assignees=["Sam", "Alex"],
+            subtasks=[main.Subtask(id=1, name=f"Subtask for goal {i}")],
+            dependencies=[i - 1] if i > 1 else [],
+        )
+        for i in range(1, count + 1)
+    ]
+
+
+class FakeCompletions:
+    """Mimics instructor's async chat.completions with a fixed per-call latency"""
+
+    def __init__(self, latency: float, goal_count: int):
+        self.latency = latency
+        self.goal_count = goal_count
+
+    async def create(self, model, response_model, messages, **kwargs):
+        await asyncio.sleep(self.latency)
+        meeting = main.Meeting(id=0, title="Weekly sync", summary="Discussed the roadmap.")
+        if response_model is main.Meeting:
+            return meeting
+        if response_model is main.MeetingExtraction:
+            return main.MeetingExtraction(meeting=meeting, goals=make_goals(self.goal_count))
+
+        # Iterable[Goal] responses are consumed as an async iterator
+        async def stream():
+            for goal in make_goals(self.goal_count):
+                yield goal
+        return stream()
+
+
+class FakeClient:
+    """Mimics the client returned by instructor.from_openai"""
+
+    def __init__(self, latency: float, goal_count: int):
+        self.chat = types.SimpleNamespace(completions=FakeCompletions(latency, goal_count))
+
+
+async def time_mode(client: FakeClient, mode: str, runs: int) -> typing.List[float]:
+    """Run the pipeline `runs` times and return the latencies in seconds"""
+    latencies = []
+    for _ in range(runs):
+        start = time.perf_counter()
+        await main.run_pipeline(client, "Sam: let's ship the release on Friday.", mode=mode)
+        latencies.append(time.perf_counter() - start)
+    return latencies
+
+
+async def run(args):
+    fake = FakeClient(args.latency, args.goals)
+    print(f"LLM latency {args.latency * 1000:.0f} ms, {args.goals} goals, {args.runs} runs per mode")
+    print(f"{'mode':<12} {'p50 (ms)':>10} {'p95 (ms)':>10}")
+    for mode in main.config.PIPELINE_MODES:
+        latencies = sorted(await time_mode(fake, mode, args.runs))
+        p50 = statistics.median(latencies) * 1000
+        p95 = latencies[max(0, int(len(latencies) * 0.95) - 1)] * 1000
+        print(f"{mode:<12} {p50:>10.1f} {p95:>10.1f}")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--latency", type=float, default=0.5, help="Mocked LLM latency per call, in seconds")
+    parser.add_argument("--goals", type=int, default=10, help="Number of goals returned by the mocked LLM")
+    parser.add_argument("--runs", type=int, default=20, help="Number of runs per mode")
+    asyncio.run(run(parser.parse_args()))
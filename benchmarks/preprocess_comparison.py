@@ -0,0 +1,90 @@
+# preprocess_comparison.py
+"""Compare extraction results with and without transcript preprocessing.
+
+Runs the extraction pipeline on each sample transcript twice, once on the raw
+transcript (PREPROCESS_ENABLED=false) and once on the compacted one, and reports
+the prompt tokens, the goals and the assignees each run produced. Assignees or
+goals found in only one run, and speaker aliases (@S1, ...) left in the results,
+point at content the preprocessing lost or mangled.
+
+Calls the configured LLM (OPENAI_API_KEY, OPENAI_BASE_URL), so results vary a
+little between runs; use --runs to repeat each side.
+
+Usage: python benchmarks/preprocess_comparison.py [--transcripts benchmarks/fixtures/transcripts] [--runs 1]
+"""
+import argparse
+import asyncio
+import glob
+import os
+import re
+import sys
+from typing import Dict, List, Set
+
+# Add project root to path to properly import modules
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import main
+from app import config
+from app.assignees import normalize_name
+from app.llm import create_client
+from app.preprocess import prepare_transcript
+
+ALIAS = re.compile(r"@S\d+\b")
+DEFAULT_TRANSCRIPTS = os.path.join(os.path.dirname(os.path.abspath(__file__)), "fixtures", "transcripts")
+
+
+async def extract(client, transcript: str, preprocess: bool) -> Dict:
+    """One extraction with preprocessing switched on or off"""
+    config.PREPROCESS_ENABLED = preprocess
+    prepared = prepare_transcript(transcript)
+    meeting, goals = await main.run_pipeline(client, transcript, prepared=prepared)
+    texts = [meeting.title, meeting.summary] + [text for goal in goals for text in (goal.name, goal.description, *goal.assignees)]
+    return {
+        "tokens": prepared.tokens,
+        "goals": {normalize_name(goal.name) for goal in goals},
+        "assignees": {normalize_name(name) for goal in goals for name in goal.assignees},
+        "aliases": sorted({alias for text in texts if text for alias in ALIAS.findall(text)}),
+    }
+
+
+def union(results: List[Dict], field: str) -> Set[str]:
+    return set().union(*(result[field] for result in results))
+
+
+async def compare(path: str, client, runs: int) -> bool:
+    with open(path) as f:
+        transcript = f.read()
+    raw = [await extract(client, transcript, False) for _ in range(runs)]
+    prepared = [await extract(client, transcript, True) for _ in range(runs)]
+
+    print(f"== {os.path.basename(path)}")
+    print(f"   prompt tokens: {raw[0]['tokens']} raw, {prepared[0]['tokens']} preprocessed")
+    print(f"   goals per run: {[len(result['goals']) for result in raw]} raw, {[len(result['goals']) for result in prepared]} preprocessed")
+    missing = union(raw, "assignees") - union(prepared, "assignees")
+    extra = union(prepared, "assignees") - union(raw, "assignees")
+    aliases = sorted(set().union(*(result["aliases"] for result in prepared)))
+    print(f"   assignees: {sorted(union(prepared, 'assignees'))}")
+    if missing:
+        print(f"   assignees only without preprocessing: {sorted(missing)}")
+    if extra:
+        print(f"   assignees only with preprocessing: {sorted(extra)}")
+    if aliases:
+        print(f"   aliases left in the results: {aliases}")
+    return not missing and not extra and not aliases
+
+
+async def run(args) -> int:
+    client = create_client()
+    if client is None:
+        raise SystemExit("Set OPENAI_API_KEY (and OPENAI_BASE_URL for a compatible endpoint) to run the comparison")
+    paths = sorted(glob.glob(os.path.join(args.transcripts, "*")))
+    matched = [await compare(path, client, args.runs) for path in paths]
+    print(f"{sum(matched)}/{len(matched)} transcripts give the same assignees with and without preprocessing")
+    return 0 if all(matched) else 1
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--transcripts", default=DEFAULT_TRANSCRIPTS, help="Directory of sample transcripts")
+    parser.add_argument("--runs", type=int, default=1, help="Extractions per transcript and side")
+    sys.exit(asyncio.run(run(parser.parse_args())))
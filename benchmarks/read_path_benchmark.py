@@ -0,0 +1,87 @@
+# read_path_benchmark.py
+"""Check that meeting and goal read paths issue a constant number of queries.
+
+Seeds meetings of increasing size and counts the SQL statements needed to load
+and serialize MeetingWithGoals and GoalWithDependencies. Exits non-zero if the
+query count grows with the number of goals.
+
+Usage: python benchmarks/read_path_benchmark.py [--database-url sqlite://] [--sizes 10 100 1000]
+"""
+import argparse
+import os
+import sys
+import time
+
+from sqlalchemy import create_engine, event
+from sqlalchemy.orm import Session
+
+# Add project root to path to properly import modules
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from app import crud, models, schemas
+
+
+def seed_meeting(db: Session, goal_count: int) -> models.Meeting:
+    """Create a meeting whose goals each have subtasks, assignees and a dependency chain"""
+    people = [models.Assignee(name=f"Person {goal_count}-{i}") for i in range(5)]
+    meeting = models.Meeting(title=f"Meeting with {goal_count} goals", summary="Seeded")
+    previous = None
+    for i in range(goal_count):
+        goal = models.Goal(name=f"Goal {i}", description="Seeded goal", priority=models.PriorityLevel.medium)
+        goal.subtasks = [models.Subtask(name=f"Subtask {i}.{j}") for j in range(3)]
+        goal.assignees = [people[i % len(people)], people[(i + 1) % len(people)]]
+        if previous is not None:
+            goal.dependencies = [previous]
+        meeting.goals.append(goal)
+        previous = goal
+    db.add(meeting)
+    db.commit()
+    return meeting
+
+
+def measure(engine, statement, schema) -> tuple:
+    """Run a read query and serialize the result, returning (query count, milliseconds)"""
+    queries = []
+
+    def count(conn, cursor, statement, parameters, context, executemany):
+        queries.append(statement)
+
+    event.listen(engine, "before_cursor_execute", count)
+    start = time.perf_counter()
+    with Session(engine) as db:
+        result = db.execute(statement).scalar_one()
+        schema.model_validate(result, from_attributes=True).model_dump()
+    elapsed = (time.perf_counter() - start) * 1000
+    event.remove(engine, "before_cursor_execute", count)
+    return len(queries), elapsed
+
+
+def main(args) -> int:
+    engine = create_engine(args.database_url)
+    models.Base.metadata.create_all(engine)
+
+    counts = {"meeting": set(), "goal": set()}
+    print(f"{'goals':>6} {'meeting queries':>16} {'meeting ms':>11} {'goal queries':>13} {'goal ms':>8}")
+    for size in args.sizes:
+        with Session(engine) as db:
+            meeting = seed_meeting(db, size)
+            meeting_id = meeting.id
+            middle_goal_id = meeting.goals[size // 2].id
+        meeting_queries, meeting_ms = measure(engine, crud.meeting_with_goals_query(meeting_id), schemas.MeetingWithGoals)
+        goal_queries, goal_ms = measure(engine, crud.goal_with_dependencies_query(middle_goal_id), schemas.GoalWithDependencies)
+        counts["meeting"].add(meeting_queries)
+        counts["goal"].add(goal_queries)
+        print(f"{size:>6} {meeting_queries:>16} {meeting_ms:>11.1f} {goal_queries:>13} {goal_ms:>8.1f}")
+
+    if len(counts["meeting"]) > 1 or len(counts["goal"]) > 1:
+        print("FAIL: query count grows with the number of goals")
+        return 1
+    print("OK: query count is constant")
+    return 0
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--database-url", default="sqlite://", help="Database to seed (default: in-memory SQLite)")
+    parser.add_argument("--sizes", type=int, nargs="+", default=[10, 100, 1000], help="Goal counts to test")
+    sys.exit(main(parser.parse_args()))
@@ -0,0 +1,151 @@
+# resilience_benchmark.py
+"""Measure /process tail latency and failures against a faulty LLM, per resilience mode.
+
+Runs the fake OpenAI server with injected faults (a fraction of requests fail
+with a 500, another fraction answer slowly) and drives /process at a fixed
+concurrency in each mode, restarting the stub with the same seed so every mode
+sees the same faults:
+  off       RESILIENCE_ENABLED=false (only the OpenAI SDK's own retries)
+  retries   deadlines, jittered retries and the circuit breaker
+  hedged    the same plus hedged requests after the p95 delay
+
+A warm-up phase runs first in every mode so the hedging delay has samples.
+
+Usage: python benchmarks/resilience_benchmark.py [--requests 200] [--concurrency 8]
+           [--error-rate 0.05] [--slow-rate 0.05] [--slow-latency 5] [--modes off,retries,hedged]
+"""
+import argparse
+import asyncio
+import os
+import subprocess
+import sys
+import time
+from typing import Dict, List
+
+import httpx
+
+# Add project root to path to properly import modules
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from load_test import BENCHMARKS_DIR, PROJECT_ROOT, free_port, stop_servers, summarize, wait_until_ready
+
+MODES = {
+    "off": {"RESILIENCE_ENABLED": "false"},
+    "retries": {"RESILIENCE_ENABLED": "true", "LLM_HEDGE_ENABLED": "false"},
+    "hedged": {"RESILIENCE_ENABLED": "true", "LLM_HEDGE_ENABLED": "true"},
+}
+TRANSCRIPT = "Sam: Let's ship the release on Friday.\nAlex: I'll finish the QA pass by Thursday.\nSam: Priya, can you update the runbook?"
+
+
+async def drive(base: str, total: int, concurrency: int) -> List[dict]:
+    """Send `total` /process requests, `concurrency` at a time; returns each one's status and latency"""
+    results: List[dict] = []
+    queue = iter(range(total))
+
+    async def worker(client: httpx.AsyncClient):
+        for _ in queue:
+            start = time.perf_counter()
+            try:
+                response = await client.post("/process", data={"transcript": TRANSCRIPT, "no_cache": "true"})
+                status = response.status_code
+            except httpx.HTTPError as e:
+                status = type(e).__name__
+            results.append({"status": status, "latency": time.perf_counter() - start})
+
+    async with httpx.AsyncClient(base_url=base, timeout=300) as client:
+        await asyncio.gather(*(worker(client) for _ in range(concurrency)))
+    return results
+
+
+def run_mode(mode: str, args, log) -> Dict:
+    stub_port, app_port = free_port(), free_port()
+    stub = subprocess.Popen([
+        sys.executable, os.path.join(BENCHMARKS_DIR, "fake_openai.py"),
+        "--port", str(stub_port),
+        "--latency", str(args.latency),
+        "--error-rate", str(args.error_rate),
+        "--slow-rate", str(args.slow_rate),
+        "--slow-latency", str(args.slow_latency),
+        "--seed", str(args.seed),
+    ], stdout=log, stderr=subprocess.STDOUT)
+    processes = [stub]
+    try:
+        wait_until_ready(f"http://127.0.0.1:{stub_port}/stats", stub)
+        env = {
+            **os.environ,
+            **MODES[mode],
+            "OPENAI_API_KEY": "benchmark",
+            "OPENAI_BASE_URL": f"http://127.0.0.1:{stub_port}/v1",
+            "OPENAI_RPM_LIMIT": "100000",
+            "OPENAI_TPM_LIMIT": "100000000",
+            "EXTRACTION_CACHE_PERSIST": "false",
+            "LLM_ATTEMPT_TIMEOUT": str(args.attempt_timeout),
+            "LLM_HEDGE_MIN_DELAY": str(args.hedge_min_delay),
+            # Long enough that the breaker doesn't trip on the injected error rate alone
+            "LLM_BREAKER_FAILURES": "10",
+        }
+        app = subprocess.Popen(
+            [sys.executable, "-m", "uvicorn", "main:app", "--port", str(app_port), "--log-level", "warning", "--no-access-log"],
+            cwd=PROJECT_ROOT,
+            env=env,
+            stdout=log,
+            stderr=subprocess.STDOUT,
+        )
+        processes.append(app)
+        base = f"http://127.0.0.1:{app_port}"
+        wait_until_ready(f"{base}/healthz", app)
+        asyncio.run(drive(base, args.warmup, args.concurrency))
+        upstream_before = httpx.get(f"http://127.0.0.1:{stub_port}/stats").json()["requests"]
+        results = asyncio.run(drive(base, args.requests, args.concurrency))
+        upstream = httpx.get(f"http://127.0.0.1:{stub_port}/stats").json()["requests"] - upstream_before
+        return {
+            "mode": mode,
+            "ok": sum(1 for result in results if result["status"] == 200),
+            "failed": sum(1 for result in results if result["status"] != 200),
+            "upstream_per_request": round(upstream / len(results), 2),
+            **summarize([result["latency"] for result in results]),
+            "resilience": httpx.get(f"{base}/resilience/stats").json(),
+        }
+    finally:
+        stop_servers(processes)
+
+
+def main(args) -> None:
+    log = open(args.server_log, "a") if args.server_log else subprocess.DEVNULL
+    rows = []
+    for mode in args.modes.split(","):
+        if mode not in MODES:
+            raise SystemExit(f"Unknown mode {mode}; expected one of {', '.join(MODES)}")
+        rows.append(run_mode(mode, args, log))
+
+    print(
+        f"{args.requests} requests at concurrency {args.concurrency}; LLM latency {args.latency * 1000:.0f} ms, "
+        f"{args.error_rate:.0%} errors, {args.slow_rate:.0%} slow ({args.slow_latency:.1f}s)"
+    )
+    print(f"{'mode':<9}{'ok':>6}{'failed':>8}{'calls/req':>11}{'p50 ms':>9}{'p95 ms':>9}{'p99 ms':>9}{'max ms':>9}")
+    for row in rows:
+        print(
+            f"{row['mode']:<9}{row['ok']:>6}{row['failed']:>8}{row['upstream_per_request']:>11}"
+            f"{row['p50']:>9}{row['p95']:>9}{row['p99']:>9}{row['max']:>9}"
+        )
+    for row in rows:
+        stats = row["resilience"]
+        if stats.get("enabled"):
+            print(f"{row['mode']}: retries {stats['retries']}, hedges {stats['hedges']} ({stats['hedges_won']} won), timeouts {stats['timeouts']}, rejected {stats['rejected']}")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--requests", type=int, default=200, help="Measured requests per mode")
+    parser.add_argument("--warmup", type=int, default=40, help="Unmeasured requests per mode, sent first")
+    parser.add_argument("--concurrency", type=int, default=8)
+    parser.add_argument("--modes", default=",".join(MODES), help="Comma-separated resilience modes")
+    parser.add_argument("--latency", type=float, default=0.2, help="Fake OpenAI latency per call, in seconds")
+    parser.add_argument("--error-rate", type=float, default=0.05, help="Fraction of LLM calls failing with a 500")
+    parser.add_argument("--slow-rate", type=float, default=0.05, help="Fraction of LLM calls answering slowly")
+    parser.add_argument("--slow-latency", type=float, default=5.0, help="Latency of the slow calls, in seconds")
+    parser.add_argument("--attempt-timeout", type=float, default=10.0, help="LLM_ATTEMPT_TIMEOUT for the app")
+    parser.add_argument("--hedge-min-delay", type=float, default=0.1, help="LLM_HEDGE_MIN_DELAY for the app")
+    parser.add_argument("--seed", type=int, default=0, help="Fault injection seed")
+    parser.add_argument("--server-log", help="Append server output to this file")
+    main(parser.parse_args())
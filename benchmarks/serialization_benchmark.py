@@ -0,0 +1,107 @@
+# serialization_benchmark.py
+"""Compare response serialization paths on a large meeting.
+
+Times the /process encoding (goal.dict() loop + JSONResponse against one-pass
+dumps + ORJSONResponse, and a straight model_dump_json as the lower bound), and
+the stored-meeting read path (FastAPI's response_model dump + JSONResponse
+against ModelResponse) on a meeting loaded from SQLite.
+
+Usage: python benchmarks/serialization_benchmark.py [--goals 500] [--runs 50]
+"""
+import argparse
+import os
+import statistics
+import sys
+import time
+import warnings
+from typing import Callable, List
+
+from fastapi.responses import JSONResponse, ORJSONResponse
+from sqlalchemy import create_engine
+from sqlalchemy.orm import Session
+
+# Add project root to path to properly import modules
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import main
+from app import crud, models, schemas
+from app.serialization import ModelResponse, dump_jsonable, type_adapter
+from pipeline_benchmark import make_goals
+from read_path_benchmark import seed_meeting
+
+
+def time_ms(func: Callable[[], bytes], runs: int) -> List[float]:
+    func()  # warm up (builds the TypeAdapters)
+    timings = []
+    for _ in range(runs):
+        start = time.perf_counter()
+        func()
+        timings.append((time.perf_counter() - start) * 1000)
+    return timings
+
+
+def report(title: str, cases: dict, runs: int) -> None:
+    print(f"\n{title}")
+    print(f"{'path':<34} {'p50 (ms)':>10} {'min (ms)':>10} {'bytes':>10} {'speedup':>8}")
+    baseline = None
+    for name, func in cases.items():
+        timings = time_ms(func, runs)
+        p50 = statistics.median(timings)
+        baseline = baseline or p50
+        print(f"{name:<34} {p50:>10.2f} {min(timings):>10.2f} {len(func()):>10} {baseline / p50:>7.1f}x")
+
+
+def main_benchmark(args) -> None:
+    meeting = main.Meeting(id=1, title="Quarterly planning", date="2024-07-15", summary="Planning for the quarter. " * 20)
+    goals = make_goals(args.goals)
+    for goal in goals:
+        goal.meeting_id = meeting.id
+
+    def legacy():
+        # The previous /process path: a goal.dict() per goal, then the stdlib JSON encoder
+        with warnings.catch_warnings():
+            warnings.simplefilter("ignore")
+            content = {"goals": [goal.dict() for goal in goals], "meeting": meeting.dict()}
+        return JSONResponse(content=content).body
+
+    def one_pass_dicts():
+        content = {"goals": dump_jsonable(List[main.Goal], goals), "meeting": meeting.model_dump(mode="json")}
+        return ORJSONResponse(content=content).body
+
+    extraction = main.MeetingExtraction(meeting=meeting, goals=goals)
+
+    def model_dump_json():
+        return type_adapter(main.MeetingExtraction).dump_json(extraction)
+
+    report(f"/process response, {args.goals} goals", {
+        "goal.dict() + JSONResponse": legacy,
+        "dump_jsonable + ORJSONResponse": one_pass_dicts,
+        "model_dump_json (lower bound)": model_dump_json,
+    }, args.runs)
+
+    engine = create_engine("sqlite://")
+    models.Base.metadata.create_all(engine)
+    with Session(engine) as db:
+        meeting_id = seed_meeting(db, args.goals).id
+    with Session(engine) as db:
+        db_meeting = db.execute(crud.meeting_with_goals_query(meeting_id)).scalar_one()
+
+        def response_model_path():
+            # What FastAPI does for response_model routes: validate, dump to dicts, then encode
+            model = schemas.MeetingWithGoals.model_validate(db_meeting, from_attributes=True)
+            return JSONResponse(content=model.model_dump(mode="json")).body
+
+        def model_response():
+            return ModelResponse(schemas.MeetingWithGoals, db_meeting).body
+
+        report(f"GET /meetings/{{id}}, {args.goals} goals", {
+            "response_model + JSONResponse": response_model_path,
+            "ModelResponse": model_response,
+        }, args.runs)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--goals", type=int, default=500, help="Goals in the meeting")
+    parser.add_argument("--runs", type=int, default=50, help="Timed runs per path")
+    main_benchmark(parser.parse_args())
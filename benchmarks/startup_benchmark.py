@@ -0,0 +1,124 @@
+# startup_benchmark.py
+"""Measure time to first response after a cold boot, per startup mode.
+
+Boots the app under uvicorn repeatedly (against the fake OpenAI server, so no
+API calls are made) and times, from the moment the process is spawned: the
+first /healthz answer, /readyz turning 200, and the first completed /process
+extraction (sent right after /healthz answers, so it includes any wait for the
+LLM client). Compares the default startup with FAST_STARTUP and with
+FAST_STARTUP plus WARMUP_ENABLED.
+
+Usage: python benchmarks/startup_benchmark.py [--runs 5] [--modes default,fast,fast+warmup]
+"""
+import argparse
+import os
+import statistics
+import subprocess
+import sys
+import time
+from typing import Dict, List, Optional
+
+import httpx
+
+# Add project root to path to properly import modules
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from load_test import BENCHMARKS_DIR, PROJECT_ROOT, free_port, stop_servers, wait_until_ready
+
+MODES = {
+    "default": {"FAST_STARTUP": "false", "WARMUP_ENABLED": "false"},
+    "fast": {"FAST_STARTUP": "true", "WARMUP_ENABLED": "false"},
+    "fast+warmup": {"FAST_STARTUP": "true", "WARMUP_ENABLED": "true"},
+}
+TRANSCRIPT = "Sam: Let's ship the release on Friday.\nAlex: I'll finish the QA pass by Thursday."
+
+
+def poll(client: httpx.Client, url: str, start: float, process: subprocess.Popen, timeout: float) -> float:
+    """Seconds from `start` until `url` answers 200"""
+    deadline = start + timeout
+    while time.perf_counter() < deadline:
+        if process.poll() is not None:
+            raise RuntimeError(f"The app exited with code {process.returncode} during startup")
+        try:
+            if client.get(url).status_code == 200:
+                return time.perf_counter() - start
+        except httpx.TransportError:
+            pass
+        # Polling competes with the booting app for CPU; don't spin
+        time.sleep(0.01)
+    raise RuntimeError(f"{url} did not answer 200 within {timeout:.0f}s")
+
+
+def boot_once(mode: str, stub_url: str, log, timeout: float) -> Dict[str, float]:
+    port = free_port()
+    base = f"http://127.0.0.1:{port}"
+    env = {
+        **os.environ,
+        **MODES[mode],
+        "OPENAI_API_KEY": "benchmark",
+        "OPENAI_BASE_URL": f"{stub_url}/v1",
+        "EXTRACTION_CACHE_PERSIST": "false",
+    }
+    start = time.perf_counter()
+    app = subprocess.Popen(
+        [sys.executable, "-m", "uvicorn", "main:app", "--port", str(port), "--log-level", "warning", "--no-access-log"],
+        cwd=PROJECT_ROOT,
+        env=env,
+        stdout=log,
+        stderr=subprocess.STDOUT,
+    )
+    try:
+        with httpx.Client(timeout=timeout) as client:
+            timings = {"healthz": poll(client, f"{base}/healthz", start, app, timeout)}
+            response = client.post(f"{base}/process", data={"transcript": TRANSCRIPT, "no_cache": "true"})
+            response.raise_for_status()
+            timings["first_process"] = time.perf_counter() - start
+            timings["readyz"] = poll(client, f"{base}/readyz", start, app, timeout)
+        return timings
+    finally:
+        stop_servers([app])
+
+
+def report(results: Dict[str, List[Dict[str, float]]]) -> None:
+    columns = ("healthz", "readyz", "first_process")
+    print(f"{'mode':<14}" + "".join(f"{name + ' (ms)':>22}" for name in columns))
+    baseline: Optional[Dict[str, float]] = None
+    for mode, runs in results.items():
+        medians = {name: statistics.median(run[name] for run in runs) * 1000 for name in columns}
+        baseline = baseline or medians
+        cells = "".join(f"{medians[name]:>11.0f} ({baseline[name] / medians[name]:>4.1f}x)".rjust(22) for name in columns)
+        print(f"{mode:<14}{cells}")
+
+
+def main(args) -> None:
+    log = open(args.server_log, "a") if args.server_log else subprocess.DEVNULL
+    stub_port = free_port()
+    stub = subprocess.Popen(
+        [sys.executable, os.path.join(BENCHMARKS_DIR, "fake_openai.py"), "--port", str(stub_port), "--latency", str(args.latency)],
+        stdout=log,
+        stderr=subprocess.STDOUT,
+    )
+    try:
+        stub_url = f"http://127.0.0.1:{stub_port}"
+        wait_until_ready(f"{stub_url}/stats", stub)
+        results: Dict[str, List[Dict[str, float]]] = {}
+        for mode in args.modes.split(","):
+            if mode not in MODES:
+                raise SystemExit(f"Unknown mode {mode}; expected one of {', '.join(MODES)}")
+            # One unmeasured boot first, so every mode starts with a warm OS page cache
+            boot_once(mode, stub_url, log, args.timeout)
+            results[mode] = [boot_once(mode, stub_url, log, args.timeout) for _ in range(args.runs)]
+        print(f"Median time from process spawn, {args.runs} boots per mode (LLM latency {args.latency * 1000:.0f} ms)")
+        report(results)
+    finally:
+        stop_servers([stub])
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--runs", type=int, default=5, help="Boots per mode")
+    parser.add_argument("--modes", default=",".join(MODES), help="Comma-separated startup modes")
+    parser.add_argument("--latency", type=float, default=0.05, help="Fake OpenAI latency per call, in seconds")
+    parser.add_argument("--timeout", type=float, default=60.0, help="Seconds to wait for each step")
+    parser.add_argument("--server-log", help="Append server output to this file")
+    main(parser.parse_args())
@@ -1,31 +1,119 @@
-import instructor
-from openai import AsyncOpenAI
-from typing import Iterable, List, Optional
+from typing import AsyncIterator, Iterable, List, Optional, Tuple
 from enum import Enum
 from pydantic import BaseModel, Field
-from fastapi import FastAPI, Request, Form, HTTPException
+from fastapi import FastAPI, Request, Form, File, UploadFile, HTTPException, Depends, Query, WebSocket, WebSocketDisconnect
 from fastapi.templating import Jinja2Templates
 from fastapi.staticfiles import StaticFiles
-from fastapi.responses import HTMLResponse, JSONResponse
+from fastapi.responses import HTMLResponse, ORJSONResponse, Response, StreamingResponse
 import os
-import json
+import time
+import orjson
+import asyncio
 import logging
 import traceback
 from dotenv import load_dotenv
 from datetime import datetime
+from contextlib import asynccontextmanager
+from app import config
+from app.llm import LLMClient, close_client, create_client, get_llm_client, resolve_client, start_client
+from app.scheduler import LLMScheduler
+from app.resilience import LLMResilience
+from app.persistence import save_extraction_sync
+from app.assignees import assignee_resolver, refresh_assignees_sync
+from app.database import engine, async_engine, pool_stats, get_async_db
+from app import crud, models, search
+from sqlalchemy.ext.asyncio import AsyncSession
+from app.cache import ExtractionCache, cache_key, get_extraction_cache
+from app.chunking import chunk_transcript, estimate_tokens, merge_goals
+from app.jobs import JobQueue, QueueFullError, get_job_queue
+from app import graph
+from app.graph import GraphIndex, get_graph_index
+from app.knowledge_graph import GraphPayloadCache, etag_matches, get_graph_payload_cache
+from app import schemas
+from app import metrics
+from app.metrics import CACHE_REQUESTS, LLM_CALL_SECONDS, SERIALIZATION_SECONDS, STREAM_FIRST_GOAL_SECONDS, TRANSCRIPT_TOKENS, MetricsMiddleware
+from app.logs import RequestIdMiddleware, configure_logging, log_payload
+from app.serialization import ModelResponse, dump_jsonable
+from app.ingest import TRANSCRIPT_FORMATS, UploadLimitMiddleware, read_transcript
+from app.preprocess import PreparedTranscript, get_token_counter, prepare_transcript
+from app.prompts import GOALS_INSTRUCTIONS, LIVE_GOALS_INSTRUCTIONS, MEETING_AND_GOALS_INSTRUCTIONS, MEETING_INSTRUCTIONS, messages
+from app.routing import ModelRoute, route_models
+from app.live import LiveSession
+from app.warmup import StartupState, warm_up
 
-# Configure logging
-logging.basicConfig(
-    level=logging.DEBUG,
-    format='%(asctime)s - %(name)s - %(levelname)s - %(message)s',
-)
+# Configure logging (LOG_LEVEL, LOG_FORMAT); records are written from a background thread
+configure_logging()
 logger = logging.getLogger(__name__)
 
 # Load environment variables from .env file
 load_dotenv()
 
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    """Create the shared LLM client on startup and close it on shutdown
+    
+    With FAST_STARTUP the slow parts (the LLM stack import, the tokenizer, the
+    assignee index) run in the background while the app already serves requests.
+    """
+    app.state.startup = startup = StartupState()
+    app.state.llm_scheduler = LLMScheduler() if config.SCHEDULER_ENABLED else None
+    app.state.llm_resilience = LLMResilience() if config.RESILIENCE_ENABLED else None
+    if config.FAST_STARTUP:
+        # Shielded so that cancelling the startup steps on shutdown leaves it alone
+        startup.track("llm_client", asyncio.shield(start_client(app, app.state.llm_scheduler, app.state.llm_resilience)))
+    else:
+        app.state.llm_client = create_client(scheduler=app.state.llm_scheduler, resilience=app.state.llm_resilience)
+    app.state.extraction_cache = ExtractionCache() if config.EXTRACTION_CACHE_ENABLED else None
+    app.state.graph_index = GraphIndex()
+    app.state.graph_payload_cache = GraphPayloadCache()
+    
+    async def run_job(transcript: str) -> dict:
+        client = await resolve_client(app)
+        if client is None:
+            raise HTTPException(status_code=500, detail="OpenAI API key not found. Please set OPENAI_API_KEY environment variable.")
+        content, _, _ = await extract_transcript(client, transcript, app.state.extraction_cache)
+        return content
+    
+    async def preload_assignees():
+        try:
+            loaded = await asyncio.to_thread(refresh_assignees_sync)
+            logger.info("Loaded %s assignees into the name index", loaded)
+        except Exception as e:
+            # Names still resolve through the database until the index fills up
+            logger.warning("Could not preload assignees: %s", e)
+    
+    app.state.job_queue = JobQueue(run_job)
+    await app.state.job_queue.start()
+    # Load the tokenizer in the background; it may have to download its encoding
+    startup.track("tokenizer", asyncio.to_thread(get_token_counter))
+    if config.PERSIST_RESULTS:
+        if config.FAST_STARTUP:
+            startup.track("assignees", preload_assignees())
+        else:
+            await preload_assignees()
+    if config.WARMUP_ENABLED:
+        warm_up(app, startup, templates)
+    try:
+        yield
+    finally:
+        startup.cancel()
+        await app.state.job_queue.stop()
+        try:
+            await close_client(await resolve_client(app))
+        except Exception as e:
+            logger.warning("Could not close the LLM client: %s", e)
+        await async_engine.dispose()
+        engine.dispose()
+
+
 # Create FastAPI app
-app = FastAPI(title="Action Item Extractor")
+# Plain dict responses are encoded with orjson; model responses go through ModelResponse
+app = FastAPI(title="Action Item Extractor", lifespan=lifespan, default_response_class=ORJSONResponse)
+app.add_middleware(UploadLimitMiddleware)
+app.add_middleware(MetricsMiddleware)
+# Outermost, so everything logged while handling a request carries its ID
+app.add_middleware(RequestIdMiddleware)
 
 # Mount static files and templates
 app.mount("/static", StaticFiles(directory="static"), name="static")
@@ -63,91 +151,309 @@ class Meeting(BaseModel):
     summary: str = Field(description="Brief summary of the meeting")
 
 
+class MeetingExtraction(BaseModel):
+    """Meeting information and goals resolved from the given transcript in a single pass"""
+    meeting: Meeting
+    goals: List[Goal]
+
+
+def new_meeting_id() -> int:
+    """Generate a unique ID for a meeting based on timestamp"""
+    return int(datetime.now().timestamp())
+
+
 # Service functions
-async def generate_goals(transcript: str, meeting_id: int) -> List[Goal]:
+async def stream_goals(
+    client: LLMClient,
+    transcript: str,
+    meeting_id: int,
+    model: Optional[str] = None,
+    instructions: str = GOALS_INSTRUCTIONS,
+) -> AsyncIterator[Goal]:
+    """Yield goals from a transcript as soon as OpenAI's streamed response parses them"""
+    count = 0
+    # Timed until the stream is exhausted, so this covers the whole generation
+    with LLM_CALL_SECONDS.time("llm", call="generate_goals"):
+        try:
+            logger.info("Making async API call to generate goals")
+            response = await client.chat.completions.create(
+                model=model or config.EXTRACTION_MODEL,
+                response_model=Iterable[Goal],
+                stream=True,
+                messages=messages(instructions, transcript),
+            )
+            # Properly handle the async generator
+            async for goal in response:
+                # Set the meeting_id for each goal
+                goal.meeting_id = meeting_id
+                count += 1
+                yield goal
+        
+            logger.info("Successfully generated %s goals", count)
+        except HTTPException:
+            # Rate-limit rejections, open circuits and exhausted retries keep their status code
+            raise
+        except Exception as e:
+            logger.error("Error generating goals: %s", e)
+            logger.error(traceback.format_exc())
+            raise HTTPException(status_code=500, detail=f"Error generating goals: {str(e)}")
+
+
+async def generate_goals(
+    client: LLMClient,
+    transcript: str,
+    meeting_id: int,
+    model: Optional[str] = None,
+    instructions: str = GOALS_INSTRUCTIONS,
+) -> List[Goal]:
     """Generate goals from a transcript using OpenAI"""
-    # Check for API key
-    api_key = os.getenv("OPENAI_API_KEY")
-    if not api_key:
-        logger.error("OpenAI API key not found in environment variables")
-        raise HTTPException(status_code=500, detail="OpenAI API key not found. Please set OPENAI_API_KEY environment variable.")
-    
-    logger.info("Creating AsyncOpenAI client with API key")
-    # Create AsyncOpenAI client with instructor
-    try:
-        client = instructor.from_openai(AsyncOpenAI(api_key=api_key))
-        logger.debug("AsyncOpenAI client created successfully")
-    except Exception as e:
-        logger.error(f"Error creating AsyncOpenAI client: {str(e)}")
-        logger.error(traceback.format_exc())
-        raise HTTPException(status_code=500, detail=f"Error creating AsyncOpenAI client: {str(e)}")
-    
+    return [goal async for goal in stream_goals(client, transcript, meeting_id, model, instructions)]
+
+
+@LLM_CALL_SECONDS.time("llm", call="extract_meeting_info")
+async def extract_meeting_info(
+    client: LLMClient,
+    transcript: str,
+    meeting_id: Optional[int] = None,
+    model: Optional[str] = None,
+) -> Meeting:
+    """Extract structured meeting information from transcripts."""
     try:
-        logger.info("Making async API call to generate goals")
         response = await client.chat.completions.create(
-            model="gpt-4o",
-            response_model=Iterable[Goal],
-            messages=[
-                {
-                    "role": "system",
-                    "content": "The following is a transcript of a meeting. Extract the action items, goals, subtasks, assignees, and dependencies.",
-                },
-                {
-                    "role": "user",
-                    "content": f"Create the action items and goals for the following transcript: {transcript}",
-                },
-            ],
+            model=model or config.EXTRACTION_MODEL,
+            response_model=Meeting,
+            messages=messages(MEETING_INSTRUCTIONS, transcript),
         )
-        # Properly handle the async generator
-        goals = []
-        async for goal in response:
-            # Set the meeting_id for each goal
-            goal.meeting_id = meeting_id
-            goals.append(goal)
         
-        logger.info(f"Successfully generated {len(goals)} goals")
-        return goals
+        # Use the ID assigned by the caller, or generate one from the timestamp
+        response.id = meeting_id if meeting_id is not None else new_meeting_id()
+        
+        logger.info("Successfully extracted meeting information for meeting %s", response.id)
+        return response
+    except HTTPException:
+        # Rate-limit rejections, open circuits and exhausted retries keep their status code
+        raise
     except Exception as e:
-        logger.error(f"Error generating goals: {str(e)}")
+        logger.error("Error extracting meeting information: %s", e)
         logger.error(traceback.format_exc())
-        raise HTTPException(status_code=500, detail=f"Error generating goals: {str(e)}")
+        raise HTTPException(status_code=500, detail=f"Error extracting meeting information: {str(e)}")
 
 
-async def extract_meeting_info(transcript: str) -> Meeting:
-    """Extract structured meeting information from transcripts."""
-    # Check for API key
-    api_key = os.getenv("OPENAI_API_KEY")
-    if not api_key:
-        logger.error("OpenAI API key not found in environment variables")
-        raise HTTPException(status_code=500, detail="OpenAI API key not found. Please set OPENAI_API_KEY environment variable.")
-    
+@LLM_CALL_SECONDS.time("llm", call="extract_meeting_and_goals")
+async def extract_meeting_and_goals(client: LLMClient, transcript: str, model: Optional[str] = None) -> Tuple[Meeting, List[Goal]]:
+    """Extract meeting information and goals from a transcript in a single call"""
     try:
-        client = instructor.from_openai(AsyncOpenAI(api_key=api_key))
-        
         response = await client.chat.completions.create(
-            model="gpt-4o",
-            response_model=Meeting,
-            messages=[
-                {
-                    "role": "system",
-                    "content": "Extract detailed meeting information from this file."
-                },
-                {
-                    "role": "user",
-                    "content": f"Extract the complete meeting details from this file: {transcript}"
-                }
-            ]
+            model=model or config.EXTRACTION_MODEL,
+            response_model=MeetingExtraction,
+            messages=messages(MEETING_AND_GOALS_INSTRUCTIONS, transcript),
         )
         
-        # Generate a unique ID for the meeting based on timestamp
-        response.id = int(datetime.now().timestamp())
+        meeting_info = response.meeting
+        meeting_info.id = new_meeting_id()
+        for goal in response.goals:
+            goal.meeting_id = meeting_info.id
         
-        logger.info(f"Successfully extracted meeting information: {response}")
-        return response
+        logger.info("Successfully extracted meeting information and %s goals in a single pass", len(response.goals))
+        return meeting_info, response.goals
+    except HTTPException:
+        # Rate-limit rejections, open circuits and exhausted retries keep their status code
+        raise
     except Exception as e:
-        logger.error(f"Error extracting meeting information: {str(e)}")
+        logger.error("Error extracting meeting information and goals: %s", e)
         logger.error(traceback.format_exc())
-        raise HTTPException(status_code=500, detail=f"Error extracting meeting information: {str(e)}")
+        raise HTTPException(status_code=500, detail=f"Error extracting meeting information and goals: {str(e)}")
+
+
+async def gather_or_cancel(*aws):
+    """Run awaitables concurrently, cancelling the rest as soon as one of them fails"""
+    tasks = [asyncio.ensure_future(aw) for aw in aws]
+    try:
+        return await asyncio.gather(*tasks)
+    except BaseException:
+        # Don't leave the other extractions running if one of them failed
+        for task in tasks:
+            task.cancel()
+        raise
+
+
+def split_long_transcript(transcript: str) -> Optional[List[str]]:
+    """Return the transcript's chunks if it is over the chunk budget, otherwise None"""
+    if estimate_tokens(transcript) <= config.CHUNK_MAX_TOKENS:
+        return None
+    chunks = chunk_transcript(transcript)
+    return chunks if len(chunks) > 1 else None
+
+
+async def run_chunked_pipeline(
+    client: LLMClient,
+    chunks: List[str],
+    route: Optional[ModelRoute] = None,
+) -> Tuple[Meeting, List[Goal]]:
+    """Map-reduce extraction: extract every chunk in parallel, then merge the results"""
+    meeting_model, goals_model = (route.meeting, route.goals) if route else (None, None)
+    logger.info("Running chunked extraction over %s chunks", len(chunks))
+    meeting_id = new_meeting_id()
+    semaphore = asyncio.Semaphore(config.CHUNK_CONCURRENCY)
+    
+    async def extract_chunk(index: int, chunk: str) -> Tuple[Meeting, List[Goal]]:
+        async with semaphore:
+            if logger.isEnabledFor(logging.DEBUG):
+                logger.debug("Extracting chunk %s/%s (%s tokens)", index + 1, len(chunks), estimate_tokens(chunk))
+            return await gather_or_cancel(
+                extract_meeting_info(client, chunk, meeting_id, meeting_model),
+                generate_goals(client, chunk, meeting_id, goals_model),
+            )
+    
+    results = await gather_or_cancel(*(extract_chunk(index, chunk) for index, chunk in enumerate(chunks)))
+    
+    # Reduce: the first chunk names the meeting, summaries are joined in order
+    meetings = [meeting for meeting, _ in results]
+    meeting_info = meetings[0].model_copy(update={
+        "date": next((meeting.date for meeting in meetings if meeting.date), None),
+        "summary": " ".join(meeting.summary for meeting in meetings),
+    })
+    goals = merge_goals([chunk_goals for _, chunk_goals in results])
+    
+    logger.info("Merged %s chunk goals into %s goals", sum(len(chunk_goals) for _, chunk_goals in results), len(goals))
+    return meeting_info, goals
+
+
+def restore_speaker_names(prepared: PreparedTranscript, meeting_info: Optional[Meeting] = None, goals: Iterable[Goal] = ()) -> None:
+    """Replace speaker aliases from the prompt's legend with full names in extracted results, in place"""
+    if not prepared.aliases:
+        return
+    restore = prepared.restore_names
+    if meeting_info is not None:
+        meeting_info.title = restore(meeting_info.title)
+        meeting_info.summary = restore(meeting_info.summary)
+    for goal in goals:
+        goal.name = restore(goal.name)
+        goal.description = restore(goal.description)
+        # Assignees are names, so only whole aliases are mapped
+        goal.assignees = [prepared.restore_name(assignee) for assignee in goal.assignees]
+        for subtask in goal.subtasks or []:
+            subtask.name = restore(subtask.name)
+
+
+async def prepare(transcript: str) -> PreparedTranscript:
+    """Compact a transcript for the prompts off the event loop, and record the tokens saved"""
+    prepared = await asyncio.to_thread(prepare_transcript, transcript)
+    TRANSCRIPT_TOKENS.inc(prepared.original_tokens, stage="original")
+    TRANSCRIPT_TOKENS.inc(prepared.tokens, stage="prompt")
+    logger.info("Prepared transcript: %s -> %s tokens", prepared.original_tokens, prepared.tokens)
+    return prepared
+
+
+async def run_pipeline(
+    client: LLMClient,
+    transcript: str,
+    mode: Optional[str] = None,
+    prepared: Optional[PreparedTranscript] = None,
+    route: Optional[ModelRoute] = None,
+) -> Tuple[Meeting, List[Goal]]:
+    """Run meeting and goal extraction on the prepared transcript using the configured pipeline mode"""
+    prepared = prepared or await prepare(transcript)
+    route = route or route_models(prepared)
+    meeting_info, goals = await _run_pipeline(client, prepared, mode, route)
+    restore_speaker_names(prepared, meeting_info, goals)
+    return meeting_info, goals
+
+
+async def _run_pipeline(
+    client: LLMClient,
+    prepared: PreparedTranscript,
+    mode: Optional[str],
+    route: ModelRoute,
+) -> Tuple[Meeting, List[Goal]]:
+    chunks = split_long_transcript(prepared.text)
+    if chunks:
+        # Every chunk carries the speaker legend
+        return await run_chunked_pipeline(client, [prepared.prompt(chunk) for chunk in chunks], route)
+    
+    transcript = prepared.prompt()
+    mode = mode or config.PIPELINE_MODE
+    logger.info("Running extraction pipeline in %s mode (meeting: %s, goals: %s)", mode, route.meeting, route.goals)
+    
+    if mode == "sequential":
+        # Extract meeting information first to get the meeting ID
+        meeting_info = await extract_meeting_info(client, transcript, model=route.meeting)
+        goals = await generate_goals(client, transcript, meeting_info.id, route.goals)
+        return meeting_info, goals
+    
+    if mode == "concurrent":
+        # Goals only need the meeting ID, so assign it up front and run both calls at once
+        meeting_id = new_meeting_id()
+        meeting_info, goals = await gather_or_cancel(
+            extract_meeting_info(client, transcript, meeting_id, route.meeting),
+            generate_goals(client, transcript, meeting_id, route.goals),
+        )
+        return meeting_info, goals
+    
+    if mode == "single_pass":
+        # One call does the goal extraction too, so it gets the goals model
+        return await extract_meeting_and_goals(client, transcript, route.goals)
+    
+    logger.error("Unknown pipeline mode: %s", mode)
+    raise HTTPException(status_code=500, detail=f"Unknown pipeline mode: {mode}. Expected one of {', '.join(config.PIPELINE_MODES)}.")
+
+
+async def stream_pipeline(
+    client: LLMClient,
+    transcript: str,
+    prepared: Optional[PreparedTranscript] = None,
+    route: Optional[ModelRoute] = None,
+) -> AsyncIterator[Tuple[str, BaseModel]]:
+    """Yield the meeting record and then each goal as soon as it is parsed
+    
+    Both extractions run concurrently; goals parsed before the meeting record
+    is ready are held back so that the meeting is always emitted first.
+    Long transcripts are extracted chunk by chunk and emitted once merged,
+    since goal IDs are only final after the reduce step.
+    """
+    prepared = prepared or await prepare(transcript)
+    route = route or route_models(prepared)
+    chunks = split_long_transcript(prepared.text)
+    if chunks:
+        meeting_info, goals = await run_chunked_pipeline(client, [prepared.prompt(chunk) for chunk in chunks], route)
+        restore_speaker_names(prepared, meeting_info, goals)
+        yield "meeting", meeting_info
+        for goal in goals:
+            yield "goal", goal
+        return
+    
+    transcript = prepared.prompt()
+    meeting_id = new_meeting_id()
+    goal_queue: asyncio.Queue = asyncio.Queue()
+    
+    async def produce_goals():
+        try:
+            async for goal in stream_goals(client, transcript, meeting_id, route.goals):
+                restore_speaker_names(prepared, goals=[goal])
+                await goal_queue.put(goal)
+        finally:
+            # Sentinel marking the end of the goal stream
+            await goal_queue.put(None)
+    
+    meeting_task = asyncio.ensure_future(extract_meeting_info(client, transcript, meeting_id, route.meeting))
+    goals_task = asyncio.ensure_future(produce_goals())
+    try:
+        meeting_info = await meeting_task
+        restore_speaker_names(prepared, meeting_info)
+        yield "meeting", meeting_info
+        while (goal := await goal_queue.get()) is not None:
+            yield "goal", goal
+        # Surface any error raised while streaming goals
+        await goals_task
+    finally:
+        meeting_task.cancel()
+        goals_task.cancel()
+
+
+def format_sse(event: str, data: dict) -> str:
+    """Format a Server-Sent Events message"""
+    with SERIALIZATION_SECONDS.time("ser", kind="sse"):
+        return f"event: {event}\ndata: {orjson.dumps(data).decode()}\n\n"
 
 
 # Routes
@@ -158,62 +464,721 @@ async def read_root(request: Request):
     return templates.TemplateResponse("index.html", {"request": request})
 
 
+async def extract_transcript(
+    client: LLMClient,
+    transcript: str,
+    cache: Optional[ExtractionCache] = None,
+    no_cache: bool = False,
+) -> Tuple[dict, str, bool]:
+    """Extract a transcript into its response content, going through the extraction cache
+    
+    The cache holds only the extraction (goals and meeting, plus the ID it was
+    saved under); the per-request fields are built for every response. Results
+    are saved once, on a miss, so cache hits return the stored meeting instead
+    of inserting a copy. Returns the content, its cache key and whether it was
+    a cache hit.
+    """
+    key = cache_key(transcript)
+    if cache is not None and not no_cache:
+        cached = await cache.get(key)
+        CACHE_REQUESTS.inc(result="hit" if cached is not None else "miss")
+        if cached is not None:
+            logger.info("Returning cached extraction %s", key)
+            # Nothing is sent to the LLM, so the preparation and routing aren't recorded
+            prepared = await asyncio.to_thread(prepare_transcript, transcript)
+            route = route_models(prepared, record=False)
+            usage = {"prompt_tokens": 0, "cached_tokens": 0, "completion_tokens": 0}
+            return build_content(cached, prepared, route, usage), key, True
+    
+    # Extract meeting information and goals from the compacted transcript
+    prepared = await prepare(transcript)
+    route = route_models(prepared)
+    with metrics.track_usage() as usage:
+        meeting_info, goals = await run_pipeline(client, transcript, prepared=prepared, route=route)
+    logger.info(
+        "LLM usage: %s prompt tokens (%s cached), %s completion tokens",
+        usage["prompt_tokens"], usage["cached_tokens"], usage["completion_tokens"],
+    )
+    
+    # JSON-compatible dicts, as the cache, the job results and persistence all keep them
+    with SERIALIZATION_SECONDS.time("ser", kind="model_dump"):
+        extraction = {
+            "goals": dump_jsonable(List[Goal], goals),
+            "meeting": meeting_info.model_dump(mode="json"),
+        }
+    
+    logger.info("Successfully processed %s goals and meeting information", len(extraction["goals"]))
+    # Sampled, and serialized off the request path
+    log_payload(logger, "Extraction payload", extraction)
+    
+    if config.PERSIST_RESULTS:
+        saved_meeting_id = await persist_extraction(extraction)
+        if saved_meeting_id is not None:
+            extraction["saved_meeting_id"] = saved_meeting_id
+    if cache is not None:
+        await cache.set(key, extraction)
+    return build_content(extraction, prepared, route, usage), key, False
+
+
+async def persist_extraction(extraction: dict) -> Optional[int]:
+    """Save an extraction's meeting and goals; returns the new meeting ID, or None if saving failed"""
+    try:
+        saved = await asyncio.to_thread(save_extraction_sync, extraction["meeting"], extraction["goals"])
+        return saved["meeting_id"]
+    except Exception as e:
+        # The extraction is still returned; it just isn't stored
+        logger.error("Error saving extraction results: %s", e)
+        logger.error(traceback.format_exc())
+        return None
+
+
+def build_content(extraction: dict, prepared: PreparedTranscript, route: ModelRoute, usage: dict) -> dict:
+    """The /process response for an extraction: goals and meeting plus this request's own fields"""
+    content = {
+        "goals": extraction["goals"],
+        "meeting": extraction["meeting"],
+        "preprocessing": prepared.stats(),
+        "models": route.to_dict(),
+        # Tokens reported for every LLM call of this extraction, the streamed goals call included.
+        # cached_tokens counts prompt tokens served from the provider's prompt cache; extraction
+        # cache hits are reported by X-Cache and make no calls at all
+        "usage": usage,
+    }
+    if extraction.get("saved_meeting_id") is not None:
+        content["saved_meeting_id"] = extraction["saved_meeting_id"]
+    return content
+
+
 # Update the /process endpoint
 @app.post("/process")
-async def process_transcript(transcript: str = Form(...)):
+async def process_transcript(
+    transcript: str = Form(...),
+    no_cache: bool = Form(False),
+    client: LLMClient = Depends(get_llm_client),
+    cache: Optional[ExtractionCache] = Depends(get_extraction_cache),
+):
     """Process a transcript and return goals and meeting information"""
     logger.info("Received request to process transcript")
-    logger.debug(f"Transcript length: {len(transcript)} characters")
+    logger.debug("Transcript length: %s characters", len(transcript))
     
     try:
-        # Extract meeting information first to get the meeting ID
-        logger.info("Extracting meeting information from transcript")
-        meeting_info = await extract_meeting_info(transcript)
-        
-        # Generate goals from transcript with the meeting ID
-        logger.info("Generating goals from transcript")
-        goals = await generate_goals(transcript, meeting_info.id)
-        
-        goals_dict = []
-        for goal in goals:
-            try:
-                goal_dict = goal.dict()
-                goals_dict.append(goal_dict)
-            except Exception as e:
-                logger.error(f"Error converting goal to dict: {str(e)}")
-                logger.error(f"Problematic goal: {goal}")
-                logger.error(traceback.format_exc())
-                raise HTTPException(status_code=500, detail=f"Error processing goal data: {str(e)}")
-        
-        meeting_dict = meeting_info.dict()
-        
-        logger.info(f"Successfully processed {len(goals_dict)} goals and meeting information")
-        logger.debug(f"Goals data: {json.dumps(goals_dict)}")
-        logger.debug(f"Meeting info: {json.dumps(meeting_dict)}")
-        
-        return JSONResponse(content={"goals": goals_dict, "meeting": meeting_dict})
+        content, key, hit = await extract_transcript(client, transcript, cache, no_cache)
+        # The response renders its body when it's constructed
+        with SERIALIZATION_SECONDS.time("ser", kind="json"):
+            return ORJSONResponse(content=content, headers={"X-Cache": "HIT" if hit else "MISS", "X-Cache-Key": key})
     except HTTPException as e:
-        logger.error(f"HTTP exception occurred: {e.detail}")
+        logger.error("HTTP exception occurred: %s", e.detail)
         raise e
     except Exception as e:
-        logger.error(f"Unexpected error processing transcript: {str(e)}")
+        logger.error("Unexpected error processing transcript: %s", e)
         logger.error(traceback.format_exc())
         raise HTTPException(status_code=500, detail=f"Error processing transcript: {str(e)}")
 
 
+@app.post("/process/upload")
+async def process_transcript_upload(
+    file: UploadFile = File(...),
+    format: Optional[str] = Form(None),
+    no_cache: bool = Form(False),
+    client: LLMClient = Depends(get_llm_client),
+    cache: Optional[ExtractionCache] = Depends(get_extraction_cache),
+):
+    """Process an uploaded transcript file (WebVTT, SRT, DOCX or plain text) like /process
+    
+    The format is detected from the file name or contents unless given. The
+    upload is spooled to a temp file as it arrives and parsed into speaker
+    turns off the event loop.
+    """
+    if format is not None and format not in TRANSCRIPT_FORMATS:
+        raise HTTPException(status_code=422, detail=f"format must be one of: {', '.join(TRANSCRIPT_FORMATS)}")
+    logger.info("Received transcript upload %s (%s bytes)", file.filename, file.size)
+    
+    try:
+        transcript, transcript_format, turns = await asyncio.to_thread(read_transcript, file.file, file.filename, format)
+    finally:
+        await file.close()
+    if not transcript.strip():
+        raise HTTPException(status_code=400, detail="The uploaded transcript is empty")
+    logger.info("Parsed %s transcript into %s turns", transcript_format, turns)
+    
+    response = await process_transcript(transcript=transcript, no_cache=no_cache, client=client, cache=cache)
+    response.headers["X-Transcript-Format"] = transcript_format
+    return response
+
+
+@app.post("/process/stream")
+async def process_transcript_stream(
+    transcript: str = Form(...),
+    no_cache: bool = Form(False),
+    client: LLMClient = Depends(get_llm_client),
+    cache: Optional[ExtractionCache] = Depends(get_extraction_cache),
+):
+    """Process a transcript and stream the meeting information and goals as Server-Sent Events
+    
+    Emits one `meeting` event, a `goal` event per goal as soon as it is parsed,
+    and a final `summary` event (or an `error` event if extraction fails). Like
+    /process, a fresh extraction is saved once the stream completes; the summary
+    carries its `saved_meeting_id`.
+    """
+    logger.info("Received request to stream transcript processing")
+    logger.debug("Transcript length: %s characters", len(transcript))
+    
+    key = cache_key(transcript)
+    cached = None
+    if cache is not None and not no_cache:
+        cached = await cache.get(key)
+        CACHE_REQUESTS.inc(result="hit" if cached is not None else "miss")
+    
+    async def event_stream():
+        start = time.perf_counter()
+        if cached is not None:
+            # Replay the cached extraction in the same event order
+            logger.info("Streaming cached extraction %s", key)
+            yield format_sse("meeting", cached["meeting"])
+            for goal_dict in cached["goals"]:
+                yield format_sse("goal", goal_dict)
+            prepared = await asyncio.to_thread(prepare_transcript, transcript)
+            summary = {
+                "meeting_id": cached["meeting"]["id"],
+                "goal_count": len(cached["goals"]),
+                "elapsed_ms": round((time.perf_counter() - start) * 1000),
+                "cached": True,
+                "preprocessing": prepared.stats(),
+                "models": route_models(prepared, record=False).to_dict(),
+                "usage": {"prompt_tokens": 0, "cached_tokens": 0, "completion_tokens": 0},
+            }
+            if cached.get("saved_meeting_id") is not None:
+                summary["saved_meeting_id"] = cached["saved_meeting_id"]
+            yield format_sse("summary", summary)
+            return
+        
+        meeting_dict = None
+        goals_dict = []
+        try:
+            prepared = await prepare(transcript)
+            route = route_models(prepared)
+            with metrics.track_usage() as usage:
+                async for event, payload in stream_pipeline(client, transcript, prepared=prepared, route=route):
+                    payload_dict = payload.model_dump(mode="json")
+                    if event == "meeting":
+                        meeting_dict = payload_dict
+                    else:
+                        if not goals_dict:
+                            STREAM_FIRST_GOAL_SECONDS.observe(time.perf_counter() - start)
+                        goals_dict.append(payload_dict)
+                    yield format_sse(event, payload_dict)
+            
+            logger.info("Successfully streamed %s goals and meeting information", len(goals_dict))
+            extraction = {"goals": goals_dict, "meeting": meeting_dict}
+            # Saved only once every goal has been streamed, so a failed stream stores nothing
+            if config.PERSIST_RESULTS:
+                saved_meeting_id = await persist_extraction(extraction)
+                if saved_meeting_id is not None:
+                    extraction["saved_meeting_id"] = saved_meeting_id
+            if cache is not None:
+                await cache.set(key, extraction)
+            summary = {
+                "meeting_id": meeting_dict["id"],
+                "goal_count": len(goals_dict),
+                "elapsed_ms": round((time.perf_counter() - start) * 1000),
+                "cached": False,
+                "preprocessing": prepared.stats(),
+                "models": route.to_dict(),
+                "usage": usage,
+            }
+            if extraction.get("saved_meeting_id") is not None:
+                summary["saved_meeting_id"] = extraction["saved_meeting_id"]
+            yield format_sse("summary", summary)
+        except HTTPException as e:
+            logger.error("HTTP exception occurred while streaming: %s", e.detail)
+            yield format_sse("error", {"detail": e.detail})
+        except Exception as e:
+            logger.error("Unexpected error streaming transcript: %s", e)
+            logger.error(traceback.format_exc())
+            yield format_sse("error", {"detail": f"Error processing transcript: {str(e)}"})
+    
+    return StreamingResponse(
+        event_stream(),
+        media_type="text/event-stream",
+        # Keep proxies from buffering the stream
+        headers={
+            "Cache-Control": "no-cache",
+            "X-Accel-Buffering": "no",
+            "X-Cache": "HIT" if cached is not None else "MISS",
+            "X-Cache-Key": key,
+        },
+    )
+
+
+def parse_live_message(message: str) -> Tuple[str, str]:
+    """(type, text) of a live-mode client message: plain text is a transcript segment"""
+    if not message.lstrip().startswith("{"):
+        return "segment", message
+    try:
+        data = orjson.loads(message)
+    except orjson.JSONDecodeError:
+        return "segment", message
+    return str(data.get("type", "segment")), str(data.get("text") or "")
+
+
+@app.websocket("/process/live")
+async def process_live(websocket: WebSocket):
+    """Extract goals incrementally while a meeting is still going on
+    
+    Send transcript segments as text frames (or {"type": "segment", "text": ...}),
+    {"type": "flush"} to extract the pending segments right away, and {"type": "end"}
+    to extract the rest and finish. The server sends a `ready` message with the
+    meeting ID, a `goals` message with the goals added and updated by each
+    extraction, `error` messages, and a final `summary` with every goal. A failed
+    window is retried with backoff; if it is dropped because the pending transcript
+    grew too large, or the last window still fails after LIVE_FINAL_RETRIES retries,
+    an `error` names the lost window and the summary is marked `incomplete`.
+    """
+    await websocket.accept()
+    
+    async def send(data: dict) -> None:
+        await websocket.send_text(orjson.dumps(data).decode())
+    
+    client = await resolve_client(websocket.app)
+    if client is None:
+        await send({"type": "error", "detail": "OpenAI API key not found. Please set OPENAI_API_KEY environment variable."})
+        await websocket.close(code=1011)
+        return
+    
+    session = LiveSession()
+    meeting_id = new_meeting_id()
+    wake = asyncio.Event()
+    flush = False
+    ended = False
+    logger.info("Live session started for meeting %s", meeting_id)
+    await send({"type": "ready", "meeting_id": meeting_id})
+    
+    async def report_lost(lost: dict) -> None:
+        logger.warning("Live session for meeting %s lost window %s (%s lines)", meeting_id, lost["window"], lost["lines"])
+        await send({
+            "type": "error",
+            "detail": f"Window {lost['window']} ({lost['lines']} lines, {lost['tokens']} tokens) could not be extracted; its goals are missing",
+            "lost_window": lost,
+        })
+    
+    async def receive_segments():
+        nonlocal flush, ended
+        while not ended:
+            kind, text = parse_live_message(await websocket.receive_text())
+            if kind == "segment":
+                session.add_segment(text)
+                if session.due():
+                    wake.set()
+            elif kind in ("flush", "end"):
+                flush = True
+                ended = kind == "end"
+                wake.set()
+            else:
+                await send({"type": "error", "detail": f"Unknown message type: {kind}. Expected segment, flush or end."})
+    
+    async def extract_window() -> bool:
+        # Only the pending window and a bounded goal context go to the model
+        text, lines = session.window()
+        prepared = await prepare(text)
+        route = route_models(prepared)
+        try:
+            goals = await generate_goals(
+                client,
+                f"{session.context()}\n\n{prepared.prompt()}",
+                meeting_id,
+                route.goals,
+                LIVE_GOALS_INSTRUCTIONS,
+            )
+        except HTTPException as e:
+            # The window stays pending and is retried after a backoff, unless it has grown too large
+            await send({"type": "error", "detail": e.detail})
+            lost = session.fail(lines)
+            if lost is not None:
+                await report_lost(lost)
+            return False
+        restore_speaker_names(prepared, goals=goals)
+        session.advance(lines)
+        changes = session.merge(goals)
+        logger.info("Live extraction: %s goals added, %s updated", len(changes["added"]), len(changes["updated"]))
+        if changes["added"] or changes["updated"]:
+            await send({
+                "type": "goals",
+                "added": dump_jsonable(List[Goal], changes["added"]),
+                "updated": dump_jsonable(List[Goal], changes["updated"]),
+                "window_tokens": prepared.tokens,
+            })
+        return True
+    
+    async def extract_windows():
+        nonlocal flush
+        while True:
+            try:
+                await asyncio.wait_for(wake.wait(), timeout=session.interval)
+            except TimeoutError:
+                pass
+            wake.clear()
+            if session.due(force=flush):
+                flush = False
+                await extract_window()
+            if ended:
+                # Segments that arrived while the last window was being extracted; a
+                # failure here has no next window to catch up in, so retry with backoff
+                retries = 0
+                while session.due(force=True):
+                    if await extract_window():
+                        retries = 0
+                    elif retries < config.LIVE_FINAL_RETRIES:
+                        await asyncio.sleep(config.LIVE_FINAL_RETRY_DELAY * 2 ** retries)
+                        retries += 1
+                    else:
+                        return
+                return
+    
+    receiver = asyncio.ensure_future(receive_segments())
+    extractor = asyncio.ensure_future(extract_windows())
+    try:
+        done, _ = await asyncio.wait((receiver, extractor), return_when=asyncio.FIRST_COMPLETED)
+        # Surfaces a disconnect from the receiver, or an error from the extractor
+        for task in done:
+            task.result()
+        await extractor
+        unextracted = session.due(force=True)
+        if unextracted:
+            await report_lost(session.pending_window())
+        incomplete = unextracted or session.counters["lost_windows"] > 0
+        await send({
+            "type": "summary",
+            "meeting_id": meeting_id,
+            "goal_count": len(session.goals),
+            "goals": dump_jsonable(List[Goal], list(session.goals.values())),
+            "incomplete": incomplete,
+            **session.stats(),
+        })
+        await websocket.close()
+        logger.info("Live session for meeting %s finished with %s goals", meeting_id, len(session.goals))
+    except WebSocketDisconnect:
+        logger.info("Live session for meeting %s disconnected", meeting_id)
+    except Exception as e:
+        logger.error("Unexpected error in live session: %s", e)
+        logger.error(traceback.format_exc())
+        await send({"type": "error", "detail": f"Error processing transcript: {str(e)}"})
+        await websocket.close(code=1011)
+    finally:
+        receiver.cancel()
+        extractor.cancel()
+
+
+# Job endpoints
+@app.post("/jobs", response_model=schemas.Job, status_code=202)
+async def create_job(transcript: str = Form(...), queue: JobQueue = Depends(get_job_queue)):
+    """Queue a transcript for background processing and return the job right away"""
+    logger.info("Received request to queue transcript processing")
+    try:
+        job = await queue.submit(transcript)
+    except QueueFullError as e:
+        logger.warning(str(e))
+        raise HTTPException(status_code=429, detail=str(e), headers={"Retry-After": "30"})
+    return job
+
+
+@app.get("/jobs/stats")
+async def read_job_stats(queue: JobQueue = Depends(get_job_queue)):
+    """Return job queue depth and worker utilisation"""
+    return queue.stats()
+
+
+@app.get("/jobs/{job_id}", response_model=schemas.Job)
+async def read_job(job_id: str, queue: JobQueue = Depends(get_job_queue)):
+    """Return the status of a job"""
+    job = await queue.get(job_id)
+    if job is None:
+        raise HTTPException(status_code=404, detail="Job not found")
+    return job
+
+
+@app.get("/jobs/{job_id}/result")
+async def read_job_result(job_id: str, queue: JobQueue = Depends(get_job_queue)):
+    """Return the goals and meeting information extracted by a finished job"""
+    job = await queue.get(job_id)
+    if job is None:
+        raise HTTPException(status_code=404, detail="Job not found")
+    if job["status"] != schemas.JobStatusEnum.succeeded:
+        raise HTTPException(status_code=409, detail=f"Job is {job['status'].value}")
+    return ORJSONResponse(content=job["result"])
+
+
+@app.delete("/jobs/{job_id}", response_model=schemas.Job)
+async def cancel_job(job_id: str, queue: JobQueue = Depends(get_job_queue)):
+    """Cancel a queued or running job"""
+    job = await queue.cancel(job_id)
+    if job is None:
+        raise HTTPException(status_code=404, detail="Job not found")
+    return job
+
+
+# LLM scheduler endpoints
+@app.get("/scheduler/stats")
+async def read_scheduler_stats(request: Request):
+    """Return the LLM scheduler's rate-limit budgets and admission counters"""
+    scheduler = request.app.state.llm_scheduler
+    if scheduler is None:
+        return {"enabled": False}
+    return {"enabled": True, **scheduler.stats()}
+
+
+@app.get("/resilience/stats")
+async def read_resilience_stats(request: Request):
+    """Return the LLM resilience policy's retry and hedging counters and circuit states"""
+    resilience = request.app.state.llm_resilience
+    if resilience is None:
+        return {"enabled": False}
+    return {"enabled": True, **resilience.stats()}
+
+
+# Stored meeting endpoints
+@app.get("/meetings", response_model=schemas.MeetingPage)
+async def list_meetings(
+    cursor: Optional[str] = None,
+    limit: int = Query(50, ge=1, le=200),
+    created_after: Optional[datetime] = None,
+    created_before: Optional[datetime] = None,
+    db: AsyncSession = Depends(get_async_db),
+):
+    """List stored meetings newest first; pass next_cursor back as cursor for the next page"""
+    items, next_cursor = await crud.list_meetings(db, cursor, limit, created_after, created_before)
+    return ModelResponse(schemas.MeetingPage, {"items": items, "next_cursor": next_cursor})
+
+
+@app.get("/goals", response_model=schemas.GoalPage)
+async def list_goals(
+    cursor: Optional[str] = None,
+    limit: int = Query(50, ge=1, le=200),
+    meeting_id: Optional[int] = None,
+    priority: Optional[schemas.PriorityEnum] = None,
+    assignee_id: Optional[int] = None,
+    created_after: Optional[datetime] = None,
+    created_before: Optional[datetime] = None,
+    db: AsyncSession = Depends(get_async_db),
+):
+    """List stored goals newest first, filtered by meeting, priority, assignee and creation date"""
+    items, next_cursor = await crud.list_goals(
+        db,
+        cursor,
+        limit,
+        meeting_id=meeting_id,
+        priority=models.PriorityLevel(priority.value) if priority is not None else None,
+        assignee_id=assignee_id,
+        created_after=created_after,
+        created_before=created_before,
+    )
+    return ModelResponse(schemas.GoalPage, {"items": items, "next_cursor": next_cursor})
+
+
+@app.get("/assignees", response_model=schemas.AssigneePage)
+async def list_assignees(
+    cursor: Optional[str] = None,
+    limit: int = Query(50, ge=1, le=200),
+    db: AsyncSession = Depends(get_async_db),
+):
+    """List assignees newest first"""
+    items, next_cursor = await crud.list_assignees(db, cursor, limit)
+    return ModelResponse(schemas.AssigneePage, {"items": items, "next_cursor": next_cursor})
+
+
+@app.get("/assignees/resolver/stats")
+async def read_assignee_resolver_stats():
+    """Return how assignee names were resolved (in memory, fuzzy match in the database, or new)"""
+    return assignee_resolver.stats()
+
+
+@app.get("/meetings/{meeting_id}", response_model=schemas.MeetingWithGoals)
+async def read_meeting(meeting_id: int, db: AsyncSession = Depends(get_async_db)):
+    """Return a stored meeting with its goals, loaded in a fixed number of queries"""
+    db_meeting = await crud.get_meeting_with_goals(db, meeting_id)
+    if db_meeting is None:
+        raise HTTPException(status_code=404, detail="Meeting not found")
+    return ModelResponse(schemas.MeetingWithGoals, db_meeting)
+
+
+@app.get("/goals/{goal_id}", response_model=schemas.GoalWithDependencies)
+async def read_goal(goal_id: int, db: AsyncSession = Depends(get_async_db)):
+    """Return a stored goal with its dependencies and dependents, loaded in a fixed number of queries"""
+    db_goal = await crud.get_goal_with_dependencies(db, goal_id)
+    if db_goal is None:
+        raise HTTPException(status_code=404, detail="Goal not found")
+    return ModelResponse(schemas.GoalWithDependencies, db_goal)
+
+
+async def _meeting_graph(db: AsyncSession, index: GraphIndex, meeting_id: int) -> graph.DependencyGraph:
+    meeting_graph = await index.get(db, meeting_id)
+    if not meeting_graph and await db.get(models.Meeting, meeting_id) is None:
+        raise HTTPException(status_code=404, detail="Meeting not found")
+    return meeting_graph
+
+
+# Dependency graph endpoints
+@app.get("/meetings/{meeting_id}/graph")
+async def read_knowledge_graph(
+    meeting_id: int,
+    request: Request,
+    layout: bool = True,
+    db: AsyncSession = Depends(get_async_db),
+    payloads: GraphPayloadCache = Depends(get_graph_payload_cache),
+):
+    """Return the meeting's knowledge graph as compact node/edge arrays, with an ETag for conditional requests"""
+    body, etag = await payloads.get(db, meeting_id, layout)
+    # no-cache lets browsers keep the payload but revalidate it every time
+    headers = {"ETag": etag, "Cache-Control": "no-cache"}
+    if etag_matches(request.headers.get("if-none-match"), etag):
+        return Response(status_code=304, headers=headers)
+    return Response(content=body, media_type="application/json", headers=headers)
+
+
+@app.get("/meetings/{meeting_id}/graph/order", response_model=schemas.GraphOrder)
+async def read_topological_order(
+    meeting_id: int,
+    db: AsyncSession = Depends(get_async_db),
+    index: GraphIndex = Depends(get_graph_index),
+):
+    """Return the meeting's goal IDs ordered so every goal comes after its dependencies"""
+    meeting_graph = await _meeting_graph(db, index, meeting_id)
+    return {"meeting_id": meeting_id, "order": meeting_graph.topological_order()}
+
+
+@app.get("/meetings/{meeting_id}/graph/critical-path", response_model=schemas.CriticalPath)
+async def read_critical_path(
+    meeting_id: int,
+    db: AsyncSession = Depends(get_async_db),
+    index: GraphIndex = Depends(get_graph_index),
+):
+    """Return the longest chain of dependent goals in the meeting"""
+    path = (await _meeting_graph(db, index, meeting_id)).critical_path()
+    return {"meeting_id": meeting_id, "path": path, "length": len(path)}
+
+
+@app.get("/meetings/{meeting_id}/graph/status", response_model=schemas.GraphStatus)
+async def read_goal_statuses(
+    meeting_id: int,
+    completed: List[int] = Query([]),
+    db: AsyncSession = Depends(get_async_db),
+    index: GraphIndex = Depends(get_graph_index),
+):
+    """Return whether each goal is ready or blocked, given the IDs of goals already completed"""
+    statuses = (await _meeting_graph(db, index, meeting_id)).statuses(completed)
+    return {
+        "meeting_id": meeting_id,
+        "goals": [{"goal_id": goal_id, **status} for goal_id, status in statuses.items()],
+    }
+
+
+@app.post("/dependencies", status_code=201)
+async def create_dependency(
+    dependency: schemas.DependencyCreate,
+    db: AsyncSession = Depends(get_async_db),
+    index: GraphIndex = Depends(get_graph_index),
+):
+    """Add a dependency between two goals of a meeting; 409 if it would create a cycle"""
+    created = await graph.add_dependency(db, index, dependency.dependent_goal_id, dependency.dependency_goal_id)
+    if not created:
+        return {"message": "Dependency already exists"}
+    return {"message": "Dependency created successfully"}
+
+
+@app.delete("/dependencies", status_code=204)
+async def delete_dependency(
+    dependency: schemas.DependencyDelete,
+    db: AsyncSession = Depends(get_async_db),
+    index: GraphIndex = Depends(get_graph_index),
+):
+    """Remove a dependency between two goals"""
+    if not await graph.remove_dependency(db, index, dependency.dependent_goal_id, dependency.dependency_goal_id):
+        raise HTTPException(status_code=404, detail="Dependency not found")
+    return None
+
+
+# Search endpoints
+@app.get("/search", response_model=schemas.SearchResults)
+async def search_items(
+    q: str = Query(..., min_length=1, max_length=500),
+    type: List[schemas.SearchTypeEnum] = Query(list(schemas.SearchTypeEnum)),
+    priority: Optional[schemas.PriorityEnum] = None,
+    assignee_id: Optional[int] = None,
+    limit: int = Query(20, ge=1, le=100),
+    db: AsyncSession = Depends(get_async_db),
+):
+    """Full-text search over meetings, goals and subtasks, ranked by relevance with highlighted matches"""
+    results, approximate = await search.search(
+        db,
+        q,
+        types=[search_type.value for search_type in dict.fromkeys(type)],
+        priority=models.PriorityLevel(priority.value) if priority is not None else None,
+        assignee_id=assignee_id,
+        limit=limit,
+    )
+    return ModelResponse(schemas.SearchResults, {"query": q, "results": results, "approximate": approximate})
+
+
+# Monitoring endpoints
+@app.get("/healthz")
+async def read_health():
+    """Liveness: answers as soon as the server is up, without touching the LLM or the database"""
+    return {"status": "ok"}
+
+
+@app.get("/readyz")
+async def read_readiness(request: Request):
+    """Readiness: 200 once the background startup steps have finished, 503 until then"""
+    startup = request.app.state.startup
+    return ORJSONResponse(startup.stats(), status_code=200 if startup.ready else 503)
+
+
+@app.get("/metrics")
+async def read_metrics():
+    """Return latency histograms and counters in the Prometheus text format"""
+    return Response(content=metrics.render(), media_type="text/plain; version=0.0.4; charset=utf-8")
+
+
+# Database endpoints
+@app.get("/db/pool")
+async def read_pool_stats():
+    """Return connection pool status and checkout-wait metrics for sizing the pools"""
+    return pool_stats()
+
+
+# Extraction cache endpoints
+@app.get("/cache/stats")
+async def read_cache_stats(cache: Optional[ExtractionCache] = Depends(get_extraction_cache)):
+    """Return extraction cache hit/miss/eviction counters"""
+    if cache is None:
+        return {"enabled": False}
+    return {"enabled": True, **cache.stats()}
+
+
+@app.delete("/cache/{key}", status_code=204)
+async def invalidate_cache_entry(key: str, cache: Optional[ExtractionCache] = Depends(get_extraction_cache)):
+    """Invalidate a single cached extraction (see the X-Cache-Key response header)"""
+    if cache is None or not await cache.invalidate(key):
+        raise HTTPException(status_code=404, detail="Cache entry not found")
+    return None
+
+
+@app.delete("/cache")
+async def clear_cache(cache: Optional[ExtractionCache] = Depends(get_extraction_cache)):
+    """Invalidate every cached extraction"""
+    if cache is None:
+        return {"removed": 0}
+    removed = await cache.clear()
+    logger.info("Cleared %s cached extractions", removed)
+    return {"removed": removed}
+
+
 # For development server with better error reporting
 if __name__ == "__main__":
     import uvicorn
     
     # Log startup information
     logger.info("Starting Action Item Extractor application")
-    logger.info(f"OpenAI API key set: {bool(os.getenv('OPENAI_API_KEY'))}")
-    
-    # Print directory structure for debugging
-    logger.info("Directory structure:")
-    for root, dirs, files in os.walk('.', topdown=True):
-        for name in files:
-            logger.info(os.path.join(root, name))
+    logger.info("OpenAI API key set: %s", bool(os.getenv('OPENAI_API_KEY')))
     
     # Start the server
     uvicorn.run("main:app", host="0.0.0.0", port=8000, reload=True)
\ No newline at end of file
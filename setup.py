@@ -36,7 +36,7 @@ logging.basicConfig(
 )
 
 # Update required tables to match the models.py schema
-REQUIRED_TABLES = {'meetings', 'goals', 'subtasks', 'assignees', 'dependencies', 'goal_assignees'}
+REQUIRED_TABLES = {'meetings', 'goals', 'subtasks', 'assignees', 'dependencies', 'goal_assignees', 'extraction_cache', 'jobs'}
 
 def database_exists():
     try:
@@ -57,13 +57,13 @@ def database_exists():
 
         missing_tables = REQUIRED_TABLES - existing_tables
         if missing_tables:
-            logging.info(f"Missing tables detected: {missing_tables}")
+            logging.info("Missing tables detected: %s", missing_tables)
             return False
 
         logging.info("All required tables already exist.")
         return True
     except Exception as e:
-        logging.warning(f"Could not connect to database '{DB_NAME}': {e}")
+        logging.warning("Could not connect to database '%s': %s", DB_NAME, e)
         return False
 
 def create_database():
@@ -80,11 +80,11 @@ def create_database():
                 cur.execute("SELECT 1 FROM pg_database WHERE datname = %s", (DB_NAME,))
                 if not cur.fetchone():
                     cur.execute(sql.SQL("CREATE DATABASE {}").format(sql.Identifier(DB_NAME)))
-                    logging.info(f"Database '{DB_NAME}' created.")
+                    logging.info("Database '%s' created.", DB_NAME)
                 else:
-                    logging.info(f"Database '{DB_NAME}' already exists.")
+                    logging.info("Database '%s' already exists.", DB_NAME)
     except Exception as e:
-        logging.error(f"Failed to create database: {e}", exc_info=True)
+        logging.error("Failed to create database: %s", e, exc_info=True)
 
 def create_tables():
     try:
@@ -96,7 +96,50 @@ def create_tables():
         Base.metadata.create_all(bind=engine)
         logging.info("Tables created successfully.")
     except Exception as e:
-        logging.error(f"Failed to create tables: {e}", exc_info=True)
+        logging.error("Failed to create tables: %s", e, exc_info=True)
+
+def create_indexes():
+    try:
+        # create_all skips existing tables, so add indexes introduced since they were created
+        from app.models import Base
+        from app.database import engine
+        
+        for table in Base.metadata.sorted_tables:
+            for index in table.indexes:
+                index.create(bind=engine, checkfirst=True)
+        logging.info("Indexes are up to date.")
+    except Exception as e:
+        logging.error("Failed to create indexes: %s", e, exc_info=True)
+
+def create_search_columns():
+    try:
+        # Generated tsvector columns and GIN indexes aren't part of the models
+        from app.database import engine
+        from app.search import ensure_search_columns
+        
+        ensure_search_columns(engine)
+    except Exception as e:
+        logging.error("Failed to create search columns: %s", e, exc_info=True)
+
+def create_job_lease_columns():
+    try:
+        # Jobs tables created before job leases lack their columns
+        from app.database import engine
+        from app.jobs import ensure_lease_columns
+        
+        ensure_lease_columns(engine)
+    except Exception as e:
+        logging.error("Failed to add job lease columns: %s", e, exc_info=True)
+
+def create_trigram_index():
+    try:
+        # pg_trgm index for fuzzy assignee name matching
+        from app.database import engine
+        from app.assignees import ensure_trigram_index
+        
+        ensure_trigram_index(engine)
+    except Exception as e:
+        logging.error("Failed to create assignee trigram index: %s", e, exc_info=True)
 
 if __name__ == "__main__":
     if database_exists():
@@ -104,4 +147,8 @@ if __name__ == "__main__":
     else:
         logging.info("Running database setup...")
         create_database()
-        create_tables()
\ No newline at end of file
+        create_tables()
+    create_indexes()
+    create_search_columns()
+    create_job_lease_columns()
+    create_trigram_index()
\ No newline at end of file
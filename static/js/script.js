@@ -26,6 +26,9 @@ document.addEventListener('DOMContentLoaded', function() {
     // Cytoscape instance for graph visualization
     let cy = null;
     
+    // Dependency edges waiting for their source goal to be added to the graph
+    let pendingDependencies = [];
+    
     // Toggle between grid and list view
     toggleViewBtn.addEventListener('click', function() {
         if (goalsGrid.style.display === 'none') {
@@ -53,43 +56,103 @@ document.addEventListener('DOMContentLoaded', function() {
             const formData = new FormData();
             formData.append('transcript', transcript);
             
-            console.log('Submitting transcript to /process endpoint');
-            const response = await fetch('/process', {
+            console.log('Submitting transcript to /process/stream endpoint');
+            const response = await fetch('/process/stream', {
                 method: 'POST',
                 body: formData
             });
             
             console.log('Response status:', response.status);
-            const data = await response.json();
-            console.log('Response data:', data);
-            
-            if (response.ok) {
-                // Make sure data.goals and data.meeting are valid
-                if (!data.goals || !Array.isArray(data.goals) || !data.meeting) {
-                    console.error('Invalid data structure:', data);
-                    throw new Error('Invalid response data structure');
-                }
-                
-                // Process and display the results with meeting info
-                renderResults(data.goals, data.meeting);
-                
-                // Hide loading indicator, show results
-                loadingIndicator.style.display = 'none';
-                resultsContainer.style.display = 'block';
-                
-                // Show the data editing section explicitly
-                document.getElementById('data-editing-section').style.display = 'block';
-            } else {
-                // Handle errors
+            if (!response.ok) {
+                // Handle errors raised before the stream started
+                const data = await response.json();
                 console.error('API error:', data.detail || 'Unknown error');
                 throw new Error(data.detail || 'An error occurred');
             }
+            
+            // Render the meeting and each goal as soon as the server emits them
+            let streamedMeeting = null;
+            const streamedGoals = [];
+            await readEventStream(response, function(event, data) {
+                if (event === 'meeting') {
+                    streamedMeeting = data;
+                    startStreamingResults(data);
+                    
+                    // Hide loading indicator, show results
+                    loadingIndicator.style.display = 'none';
+                    resultsContainer.style.display = 'block';
+                } else if (event === 'goal') {
+                    streamedGoals.push(data);
+                    renderStreamedGoal(data, streamedGoals);
+                } else if (event === 'summary') {
+                    console.log('Stream summary:', data);
+                    
+                    // Final pass: full layout, team members and data tables
+                    renderResults(streamedGoals, streamedMeeting);
+                    
+                    // Show the data editing section explicitly
+                    document.getElementById('data-editing-section').style.display = 'block';
+                } else if (event === 'error') {
+                    throw new Error(data.detail || 'An error occurred');
+                }
+            });
         } catch (error) {
             console.error('Error processing transcript:', error);
             loadingIndicator.style.display = 'none';
             alert(`Error: ${error.message}`);
         }
     });
+    
+    // Read a Server-Sent Events response body and dispatch each event
+    async function readEventStream(response, onEvent) {
+        const reader = response.body.getReader();
+        const decoder = new TextDecoder();
+        let buffer = '';
+        
+        while (true) {
+            const { value, done } = await reader.read();
+            if (done) {
+                break;
+            }
+            buffer += decoder.decode(value, { stream: true });
+            
+            // Events are separated by a blank line
+            let boundary;
+            while ((boundary = buffer.indexOf('\n\n')) !== -1) {
+                const rawEvent = buffer.slice(0, boundary);
+                buffer = buffer.slice(boundary + 2);
+                
+                let event = 'message';
+                let data = '';
+                rawEvent.split('\n').forEach(line => {
+                    if (line.startsWith('event: ')) {
+                        event = line.slice(7);
+                    } else if (line.startsWith('data: ')) {
+                        data += line.slice(6);
+                    }
+                });
+                onEvent(event, data ? JSON.parse(data) : null);
+            }
+        }
+    }
+    
+    // Reset the results area and show the meeting while goals are still streaming
+    function startStreamingResults(meeting) {
+        goalsGrid.innerHTML = '';
+        goalsTableBody.innerHTML = '';
+        document.getElementById('team-container').innerHTML = '';
+        
+        renderMeetingInfo(meeting);
+        renderKnowledgeGraph([], []);
+    }
+    
+    // Add a single streamed goal to the cards, list and graph
+    function renderStreamedGoal(goal, goalsSoFar) {
+        renderGoalCard(goal, goalsSoFar);
+        renderGoalRow(goal, goalsSoFar);
+        addGoalToGraph(goal);
+        cy.layout({ name: 'grid', padding: 50 }).run();
+    }
 
     // Render meeting information
     function renderMeetingInfo(meeting) {
@@ -353,93 +416,8 @@ document.addEventListener('DOMContentLoaded', function() {
         });
         
         // Add goal nodes
-        goals.forEach(goal => {
-            cy.add({
-                group: 'nodes',
-                data: {
-                    id: `goal-${goal.id}`,
-                    label: `#${goal.id}: ${goal.name}`,
-                    priority: goal.priority,
-                    description: goal.description,
-                    type: 'goal'
-                },
-                classes: `goal ${goal.priority.toLowerCase()}-priority`
-            });
-            
-            // Add subtask nodes and edges
-            if (goal.subtasks && goal.subtasks.length > 0) {
-                goal.subtasks.forEach(subtask => {
-                    // Create a unique ID for subtasks by combining goal ID and subtask ID
-                    const uniqueSubtaskId = `subtask-${goal.id}-${subtask.id}`;
-                    
-                    cy.add({
-                        group: 'nodes',
-                        data: {
-                            id: uniqueSubtaskId,
-                            label: subtask.name,
-                            type: 'subtask'
-                        },
-                        classes: 'subtask'
-                    });
-                    
-                    // Add edge from goal to subtask (with updated target ID)
-                    cy.add({
-                        group: 'edges',
-                        data: {
-                            id: `goal-${goal.id}-subtask-${subtask.id}`,
-                            source: `goal-${goal.id}`,
-                            target: uniqueSubtaskId,
-                            type: 'subtask'
-                        },
-                        classes: 'subtask'
-                    });
-                });
-            }
-            
-            // Add assignee nodes and edges
-            goal.assignees.forEach(assignee => {
-                // Check if assignee node already exists
-                if (!cy.getElementById(`assignee-${assignee}`).length) {
-                    cy.add({
-                        group: 'nodes',
-                        data: {
-                            id: `assignee-${assignee}`,
-                            label: assignee,
-                            type: 'assignee'
-                        },
-                        classes: 'assignee'
-                    });
-                }
-                
-                // Add edge from goal to assignee
-                cy.add({
-                    group: 'edges',
-                    data: {
-                        id: `goal-${goal.id}-assignee-${assignee}`,
-                        source: `goal-${goal.id}`,
-                        target: `assignee-${assignee}`,
-                        type: 'assignment'
-                    },
-                    classes: 'assignment'
-                });
-            });
-            
-            // Add dependency edges
-            if (goal.dependencies && goal.dependencies.length > 0) {
-                goal.dependencies.forEach(depId => {
-                    cy.add({
-                        group: 'edges',
-                        data: {
-                            id: `goal-${depId}-dep-goal-${goal.id}`,
-                            source: `goal-${depId}`,
-                            target: `goal-${goal.id}`,
-                            type: 'dependency'
-                        },
-                        classes: 'dependency'
-                    });
-                });
-            }
-        });
+        pendingDependencies = [];
+        goals.forEach(goal => addGoalToGraph(goal));
         
         // Add hover interactions
         cy.on('mouseover', 'node', function(e) {
@@ -483,6 +461,102 @@ document.addEventListener('DOMContentLoaded', function() {
         cy.layout({name: 'cose'}).run();
     }
     
+    // Add a goal with its subtasks, assignees and dependency edges to the graph
+    function addGoalToGraph(goal) {
+        cy.add({
+            group: 'nodes',
+            data: {
+                id: `goal-${goal.id}`,
+                label: `#${goal.id}: ${goal.name}`,
+                priority: goal.priority,
+                description: goal.description,
+                type: 'goal'
+            },
+            classes: `goal ${goal.priority.toLowerCase()}-priority`
+        });
+        
+        // Add subtask nodes and edges
+        if (goal.subtasks && goal.subtasks.length > 0) {
+            goal.subtasks.forEach(subtask => {
+                // Create a unique ID for subtasks by combining goal ID and subtask ID
+                const uniqueSubtaskId = `subtask-${goal.id}-${subtask.id}`;
+                
+                cy.add({
+                    group: 'nodes',
+                    data: {
+                        id: uniqueSubtaskId,
+                        label: subtask.name,
+                        type: 'subtask'
+                    },
+                    classes: 'subtask'
+                });
+                
+                // Add edge from goal to subtask (with updated target ID)
+                cy.add({
+                    group: 'edges',
+                    data: {
+                        id: `goal-${goal.id}-subtask-${subtask.id}`,
+                        source: `goal-${goal.id}`,
+                        target: uniqueSubtaskId,
+                        type: 'subtask'
+                    },
+                    classes: 'subtask'
+                });
+            });
+        }
+        
+        // Add assignee nodes and edges
+        goal.assignees.forEach(assignee => {
+            // Check if assignee node already exists
+            if (!cy.getElementById(`assignee-${assignee}`).length) {
+                cy.add({
+                    group: 'nodes',
+                    data: {
+                        id: `assignee-${assignee}`,
+                        label: assignee,
+                        type: 'assignee'
+                    },
+                    classes: 'assignee'
+                });
+            }
+            
+            // Add edge from goal to assignee
+            cy.add({
+                group: 'edges',
+                data: {
+                    id: `goal-${goal.id}-assignee-${assignee}`,
+                    source: `goal-${goal.id}`,
+                    target: `assignee-${assignee}`,
+                    type: 'assignment'
+                },
+                classes: 'assignment'
+            });
+        });
+        
+        // Add dependency edges, deferring those whose goal hasn't been added yet
+        if (goal.dependencies && goal.dependencies.length > 0) {
+            goal.dependencies.forEach(depId => {
+                pendingDependencies.push({ depId: depId, goalId: goal.id });
+            });
+        }
+        pendingDependencies = pendingDependencies.filter(dep => {
+            if (!cy.getElementById(`goal-${dep.depId}`).length) {
+                return true;
+            }
+            cy.add({
+                group: 'edges',
+                data: {
+                    id: `goal-${dep.depId}-dep-goal-${dep.goalId}`,
+                    source: `goal-${dep.depId}`,
+                    target: `goal-${dep.goalId}`,
+                    type: 'dependency'
+                },
+                classes: 'dependency'
+            });
+            return false;
+        });
+    }
+    
     // Show tooltip for node
     function showTooltip(node) {
         const data = node.data();
@@ -0,0 +1,6 @@
+# conftest.py
+import os
+import sys
+
+# Add project root to path to properly import modules
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
@@ -0,0 +1,64 @@
+# test_assignees.py
+"""Resolving a batch of assignee names takes at most one statement"""
+import pytest
+from sqlalchemy import create_engine, event
+from sqlalchemy.orm import Session
+
+from app import models
+from app.assignees import AssigneeResolver
+
+
+@pytest.fixture
+def engine():
+    engine = create_engine("sqlite://")
+    models.Base.metadata.create_all(engine)
+    yield engine
+    engine.dispose()
+
+
+def add_assignees(engine, *names: str) -> None:
+    with Session(engine) as db:
+        db.add_all(models.Assignee(name=name) for name in names)
+        db.commit()
+
+
+def resolve_counting(engine, resolver: AssigneeResolver, names) -> tuple:
+    """(resolved IDs by name, statements executed)"""
+    statements = []
+
+    def count(conn, cursor, statement, parameters, context, executemany):
+        statements.append(statement)
+
+    event.listen(engine, "before_cursor_execute", count)
+    try:
+        with Session(engine) as db:
+            resolved = resolver.resolve(db, names)
+    finally:
+        event.remove(engine, "before_cursor_execute", count)
+    return resolved, len(statements)
+
+
+def test_batch_with_misses_takes_one_statement(engine):
+    add_assignees(engine, "Sam Kim", "Priya Patel")
+    resolver = AssigneeResolver()
+    with Session(engine) as db:
+        resolver.refresh(db)
+
+    # Created by another worker after the refresh: found through the same statement
+    add_assignees(engine, "Alex Chen")
+    resolved, statements = resolve_counting(engine, resolver, ["Sam K.", "alex chen", "Alex", "Jordan", "Morgan Lee"])
+    assert statements == 1
+    assert set(resolved) == {"Sam K.", "alex chen", "Alex"}
+    assert resolved["alex chen"] == resolved["Alex"]
+    assert resolver.stats()["misses"] == 2
+
+
+def test_batch_resolved_in_memory_takes_no_statements(engine):
+    add_assignees(engine, "Sam Kim")
+    resolver = AssigneeResolver()
+    with Session(engine) as db:
+        resolver.refresh(db)
+
+    resolved, statements = resolve_counting(engine, resolver, ["Sam Kim", "sam k"])
+    assert statements == 0
+    assert len(set(resolved.values())) == 1
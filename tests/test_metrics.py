@@ -0,0 +1,81 @@
+# test_metrics.py
+"""Streamed completions count toward the token and cost metrics like non-streamed ones"""
+import asyncio
+import json
+
+import httpx
+import instructor
+import pytest
+from openai import AsyncOpenAI
+from pydantic import BaseModel
+
+from app import config, metrics
+from app.llm import track_stream_usage
+
+MODEL = "gpt-4o"
+USAGE = {"prompt_tokens": 1200, "completion_tokens": 30, "total_tokens": 1230, "prompt_tokens_details": {"cached_tokens": 1024}}
+
+
+class Task(BaseModel):
+    name: str
+
+
+def sse(chunk: dict) -> str:
+    return f"data: {json.dumps(chunk)}\n\n"
+
+
+def streamed_tool_call(request: httpx.Request) -> httpx.Response:
+    """A streamed IterableTask tool call, with a final usage chunk if the request asks for one"""
+    body = json.loads(request.content)
+    chunk = {"id": "chatcmpl-test", "object": "chat.completion.chunk", "created": 0, "model": MODEL}
+    arguments = json.dumps({"tasks": [{"name": "Ship the release"}, {"name": "Update the runbook"}]})
+    events = [
+        sse({**chunk, "choices": [{"index": 0, "delta": {
+            "role": "assistant",
+            "tool_calls": [{"index": 0, "id": "call_0", "type": "function", "function": {"name": "IterableTask", "arguments": arguments}}],
+        }, "finish_reason": None}]}),
+        sse({**chunk, "choices": [{"index": 0, "delta": {}, "finish_reason": "tool_calls"}]}),
+    ]
+    if (body.get("stream_options") or {}).get("include_usage"):
+        events.append(sse({**chunk, "choices": [], "usage": USAGE}))
+    events.append("data: [DONE]\n\n")
+    return httpx.Response(200, text="".join(events), headers={"content-type": "text/event-stream"})
+
+
+def counter_value(counter: metrics.Counter, **labels) -> float:
+    return counter._values.get(counter._key(labels), 0.0)
+
+
+def test_streamed_call_records_tokens_and_cost():
+    openai_client = AsyncOpenAI(
+        api_key="test",
+        base_url="http://llm.test/v1",
+        http_client=httpx.AsyncClient(transport=httpx.MockTransport(streamed_tool_call)),
+    )
+    track_stream_usage(openai_client)
+    client = instructor.from_openai(openai_client)
+    client.on("completion:response", metrics.record_completion)
+
+    before = {kind: counter_value(metrics.LLM_TOKENS, model=MODEL, kind=kind) for kind in ("prompt", "cached", "completion")}
+    cost_before = counter_value(metrics.LLM_COST, model=MODEL)
+
+    async def extract():
+        with metrics.track_usage() as usage:
+            stream = client.chat.completions.create_iterable(
+                model=MODEL,
+                response_model=Task,
+                messages=[{"role": "user", "content": "Ship the release and update the runbook."}],
+            )
+            tasks = [task async for task in stream]
+        return tasks, usage
+
+    tasks, usage = asyncio.run(extract())
+
+    assert [task.name for task in tasks] == ["Ship the release", "Update the runbook"]
+    assert usage == {"prompt_tokens": 1200, "cached_tokens": 1024, "completion_tokens": 30}
+    assert counter_value(metrics.LLM_TOKENS, model=MODEL, kind="prompt") - before["prompt"] == 1200
+    assert counter_value(metrics.LLM_TOKENS, model=MODEL, kind="cached") - before["cached"] == 1024
+    assert counter_value(metrics.LLM_TOKENS, model=MODEL, kind="completion") - before["completion"] == 30
+    prompt_price, completion_price, cached_price = config.LLM_PRICES[MODEL]
+    expected_cost = (176 * prompt_price + 1024 * cached_price + 30 * completion_price) / 1_000_000
+    assert counter_value(metrics.LLM_COST, model=MODEL) - cost_before == pytest.approx(expected_cost)
@@ -0,0 +1,94 @@
+# test_preprocess.py
+"""Preprocessing compacts transcripts without losing or rewriting what was said"""
+import glob
+import os
+import re
+
+import pytest
+
+from app import config
+from app.chunking import estimate_tokens
+from app.preprocess import LEADING_TIMESTAMP, SPEAKER_LINE, _clean_text, prepare_transcript
+
+TRANSCRIPTS = sorted(glob.glob(os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "benchmarks", "fixtures", "transcripts", "*")))
+
+
+@pytest.fixture(autouse=True)
+def preprocessing(monkeypatch):
+    monkeypatch.setattr(config, "PREPROCESS_ENABLED", True)
+    monkeypatch.setattr(config, "PREPROCESS_TIMESTAMPS", "strip")
+
+
+def prepare(transcript: str):
+    # The character estimate keeps the tests independent of tiktoken's downloaded encodings
+    return prepare_transcript(transcript, count_tokens=estimate_tokens)
+
+
+def speaker_lines(transcript: str):
+    """(speaker, cleaned text) for every labelled line of a raw transcript"""
+    lines = []
+    for line in transcript.splitlines():
+        match = LEADING_TIMESTAMP.match(line)
+        match = SPEAKER_LINE.match(line[match.end():] if match else line)
+        if match:
+            lines.append((match.group(1).strip(), _clean_text(match.group(2))))
+    return lines
+
+
+def prepared_turns(prepared):
+    """(full speaker name, text) for every turn of a prepared transcript"""
+    return [
+        (prepared.aliases.get(label, label), text)
+        for label, text in re.findall(r"^([^:\n]+): (.*)$", prepared.text, re.MULTILINE)
+    ]
+
+
+def test_aliases_are_only_restored_where_they_stand_for_a_speaker():
+    prepared = prepare("\n".join(
+        f"Samantha Kimberly: Move batch {n} of the logs to S3.\nAlexander Dominguez: On it, batch {n}." for n in range(6)
+    ))
+    assert prepared.aliases == {"@S1": "Samantha Kimberly", "@S2": "Alexander Dominguez"}
+
+    assert prepared.restore_names("Move logs to S3") == "Move logs to S3"
+    assert prepared.restore_names("@S2 moves logs to S3 for @S1") == "Alexander Dominguez moves logs to S3 for Samantha Kimberly"
+    assert prepared.restore_name("@S1") == "Samantha Kimberly"
+    assert prepared.restore_name("S2") == "Alexander Dominguez"
+    assert prepared.restore_name("S2 team") == "S2 team"
+
+
+def test_duplicates_are_only_dropped_for_the_same_speaker():
+    prepared = prepare("Sam: Ship it on Friday.\nSam: Ship it on Friday.\nAlex: Yes.\nPriya: Yes.\nSam: Thanks.")
+
+    assert prepared.text == "Sam: Ship it on Friday.\nAlex: Yes.\nPriya: Yes.\nSam: Thanks."
+
+
+@pytest.mark.parametrize("path", TRANSCRIPTS, ids=os.path.basename)
+def test_sample_transcripts_keep_every_speakers_lines(path):
+    with open(path) as f:
+        transcript = f.read()
+    prepared = prepare(transcript)
+    turns = prepared_turns(prepared)
+
+    assert prepared.tokens <= prepared.original_tokens
+    # Every line before preprocessing is still there after it, attributed to the same speaker
+    for speaker, text in speaker_lines(transcript):
+        assert any(turn_speaker == speaker and text in turn_text for turn_speaker, turn_text in turns), (speaker, text)
+    # Mentions like "S3" survive restoring the speaker names
+    mentions = re.compile(r"(?<!@)\bS\d+\b")
+    assert set(mentions.findall(prepared.restore_names(prepared.text))) == set(mentions.findall(transcript))
+
+
+@pytest.mark.parametrize("text, cleaned", [
+    ("Mm, sounds good.", "Sounds good."),
+    ("Um, the gap is 5 mm, not 6.", "The gap is 5 mm, not 6."),
+    ("Cut it to 5 mm", "Cut it to 5 mm"),
+    ("Sounds good, mm", "Sounds good"),
+])
+def test_mm_is_only_dropped_as_an_interjection(text, cleaned):
+    assert _clean_text(text) == cleaned
+
+
+def test_bare_leading_times_are_kept_unless_they_mark_a_line():
+    prepared = prepare("Sam: Can we meet tomorrow?\n10:30 works for me.\n[00:01:02] Alex: Sure.\n12:03 - Priya: Done.")
+
+    assert prepared.text == "Sam: Can we meet tomorrow?\n10:30 works for me.\nAlex: Sure.\nPriya: Done."
@@ -0,0 +1,90 @@
+# test_read_path.py
+"""Meeting and goal read paths issue the same number of queries however many goals there are"""
+import pytest
+from sqlalchemy import create_engine, event
+from sqlalchemy.orm import Session
+
+from app import crud, models, schemas
+
+
+@pytest.fixture
+def engine():
+    engine = create_engine("sqlite://")
+    models.Base.metadata.create_all(engine)
+    yield engine
+    engine.dispose()
+
+
+def seed_meeting(engine, goal_count: int) -> tuple:
+    """Create a meeting whose goals form a dependency chain; returns (meeting ID, middle goal ID)"""
+    with Session(engine) as db:
+        people = [models.Assignee(name=f"Person {goal_count}-{i}") for i in range(3)]
+        meeting = models.Meeting(title=f"Meeting with {goal_count} goals", summary="Seeded")
+        previous = None
+        for i in range(goal_count):
+            goal = models.Goal(name=f"Goal {i}", description="Seeded goal", priority=models.PriorityLevel.medium)
+            goal.subtasks = [models.Subtask(name=f"Subtask {i}.{j}") for j in range(2)]
+            goal.assignees = [people[i % len(people)], people[(i + 1) % len(people)]]
+            if previous is not None:
+                goal.dependencies = [previous]
+            meeting.goals.append(goal)
+            previous = goal
+        db.add(meeting)
+        db.commit()
+        return meeting.id, meeting.goals[goal_count // 2].id
+
+
+def seed_star(engine, k: int) -> int:
+    """Create a goal with `k` dependencies and `k` dependents, all with subtasks and assignees; returns its ID"""
+    with Session(engine) as db:
+        people = [models.Assignee(name=f"Star {k}-{i}") for i in range(3)]
+        meeting = models.Meeting(title=f"Star with {k} neighbours", summary="Seeded")
+
+        def make_goal(name: str, i: int) -> models.Goal:
+            goal = models.Goal(name=name, description="Seeded goal", priority=models.PriorityLevel.medium)
+            goal.subtasks = [models.Subtask(name=f"{name} subtask {j}") for j in range(2)]
+            goal.assignees = [people[i % len(people)], people[(i + 1) % len(people)]]
+            meeting.goals.append(goal)
+            return goal
+
+        center = make_goal("Center", 0)
+        center.dependencies = [make_goal(f"Dependency {i}", i) for i in range(k)]
+        for i in range(k):
+            make_goal(f"Dependent {i}", i).dependencies = [center]
+        db.add(meeting)
+        db.commit()
+        return center.id
+
+
+def count_queries(engine, statement, schema) -> int:
+    """Statements executed to load a read query's result and serialize it"""
+    statements = []
+
+    def count(conn, cursor, statement, parameters, context, executemany):
+        statements.append(statement)
+
+    event.listen(engine, "before_cursor_execute", count)
+    try:
+        with Session(engine) as db:
+            result = db.execute(statement).scalar_one()
+            schema.model_validate(result, from_attributes=True).model_dump()
+    finally:
+        event.remove(engine, "before_cursor_execute", count)
+    return len(statements)
+
+
+def test_meeting_query_count_does_not_grow_with_goals(engine):
+    single, _ = seed_meeting(engine, 1)
+    many, _ = seed_meeting(engine, 50)
+
+    expected = count_queries(engine, crud.meeting_with_goals_query(single), schemas.MeetingWithGoals)
+    assert count_queries(engine, crud.meeting_with_goals_query(many), schemas.MeetingWithGoals) == expected
+
+
+def test_goal_query_count_does_not_grow_with_dependencies(engine):
+    # A lazy load per neighbour would add statements for every extra dependency or dependent
+    small = seed_star(engine, 2)
+    large = seed_star(engine, 50)
+
+    expected = count_queries(engine, crud.goal_with_dependencies_query(small), schemas.GoalWithDependencies)
+    assert count_queries(engine, crud.goal_with_dependencies_query(large), schemas.GoalWithDependencies) == expected